@@ -6,14 +6,36 @@ Version: 1.0.2 - ProximaDB Auto-Updater Integration
 """
 
 import os
+import posixpath
 import sys
+import asyncio
+import atexit
+import gzip
+import io
 import json
 import logging
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
+import mimetypes
+import queue
+import random
+import shutil
+import signal
+import stat
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, quote, unquote
 import threading
 import time
 from datetime import datetime
+from email.message import Message
+from email.utils import formatdate, parsedate_to_datetime
+
+import proxima_db
+from metrics import registry as metrics
+from proxima_analytics import VIEWS as ANALYTICS_VIEWS, MAX_TRAJECTORY_POINTS, get_analytics
+from proxima_publish import content_hash, variant_path
+from proxima_snapshot import planet_snapshots, PLANET_FIELDS, DEFAULT_LIMIT, MAX_LIMIT
 
 # Import Auto-Updater
 try:
@@ -23,6 +45,19 @@ except ImportError:
     PROXIMA_UPDATER_AVAILABLE = False
     logging.warning("⚠️ Proxima Auto-Updater nicht verfügbar")
 
+# fcntl fehlt unter Windows - dort gibt es aber auch kein prefork/gunicorn
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Brotli ist optional - ohne das Paket wird nur gzip angeboten
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 # Logging konfigurieren
 logging.basicConfig(
     level=logging.INFO,
@@ -30,11 +65,651 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class SpacenationsRequestHandler(SimpleHTTPRequestHandler):
-    """Custom Request Handler für Space Nations Tools"""
+# Server-Konfiguration
+# SERVER_MODE: 'single' (ein Request nach dem anderen), 'threaded' (Worker-Pool),
+# 'prefork' (mehrere Prozesse auf demselben Listening-Socket, je mit Worker-Pool)
+# oder 'asyncio' (HTTP/1.1 Keep-Alive und Pipelining, Routing im Worker-Pool)
+SERVER_MODE = os.getenv('SERVER_MODE', 'threaded').lower()
+SERVER_THREADS = int(os.getenv('SERVER_THREADS', 32))
+SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', os.cpu_count() or 1))
+SERVER_BACKLOG = int(os.getenv('SERVER_BACKLOG', 128))
+# Socket-Timeout je Verbindung (threaded/prefork/single): Verbindungen, die keinen
+# Request senden oder nichts mehr lesen, belegen einen Worker höchstens so lange
+SERVER_SOCKET_TIMEOUT = float(os.getenv('SERVER_SOCKET_TIMEOUT', 10.0))
+# Nur für SERVER_MODE=asyncio (HTTP/1.1 mit persistenten Verbindungen)
+KEEPALIVE_TIMEOUT = float(os.getenv('KEEPALIVE_TIMEOUT', 15.0))
+MAX_REQUEST_HEADER_BYTES = 64 * 1024
+
+# Static-Asset-Cache
+ASSET_CACHE_MAX_BYTES = int(os.getenv('ASSET_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+ASSET_CACHE_REVALIDATE = float(os.getenv('ASSET_CACHE_REVALIDATE', 2.0))  # Sekunden
+
+# Gehashte Vite-Build-Dateien (z.B. assets/index-B5B8HTkB.js) ändern nie ihren Inhalt
+IMMUTABLE_PREFIXES = ('assets/',)
+CACHE_CONTROL_IMMUTABLE = 'public, max-age=31536000, immutable'
+CACHE_CONTROL_REVALIDATE = 'no-cache'
+
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+    '.json': 'application/json',
+}
+
+# Komprimierung (Accept-Encoding)
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'application/xml', 'image/svg+xml')
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+SUPPORTED_ENCODINGS = ('br', 'gzip') if BROTLI_AVAILABLE else ('gzip',)
+
+# Nicht komprimierbare Dateien ab dieser Größe werden nicht im RAM gehalten, sondern per sendfile() gestreamt
+SENDFILE_THRESHOLD = int(os.getenv('SENDFILE_THRESHOLD', 256 * 1024))
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def compress_content(content, encoding):
+    """Komprimiert Bytes mit dem angegebenen Content-Encoding"""
+    if encoding == 'br':
+        return brotli.compress(content, quality=11)
+    # mtime=0 macht die Ausgabe deterministisch
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+def negotiate_encoding(accept_encoding):
+    """Wählt das beste unterstützte Content-Encoding aus dem Accept-Encoding-Header"""
+    if not accept_encoding:
+        return None
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=os.getcwd(), **kwargs)
+    accepted = {}
+    for part in accept_encoding.split(','):
+        token, _, params = part.partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token.strip().lower()] = quality
+    
+    for encoding in SUPPORTED_ENCODINGS:
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+def parse_byte_range(range_header, size):
+    """Wertet einen Range-Header für eine Ressource der Größe `size` aus.
+    
+    Gibt (start, end) inklusive zurück, oder None wenn der Header ignoriert werden
+    soll (fehlerhaft oder mehrere Bereiche). Ein syntaktisch gültiger, aber nicht
+    erfüllbarer Bereich löst ValueError aus (-> 416).
+    """
+    if not range_header or not range_header.startswith('bytes='):
+        return None
+    spec = range_header[6:].strip()
+    if ',' in spec:
+        return None
+    
+    start, sep, end = spec.partition('-')
+    start, end = start.strip(), end.strip()
+    if not sep or not (start.isdigit() or start == '') or not (end.isdigit() or end == ''):
+        return None
+    
+    if start == '':
+        # Suffix-Range: die letzten N Bytes
+        if end == '':
+            return None
+        length = int(end)
+        if length == 0 or size == 0:
+            raise ValueError('range not satisfiable')
+        return max(size - length, 0), size - 1
+    
+    first = int(start)
+    last = int(end) if end else size - 1
+    if end and last < first:
+        return None
+    if first >= size:
+        raise ValueError('range not satisfiable')
+    return first, min(last, size - 1)
+
+def hash_file(path):
+    """Berechnet den Inhalts-Hash einer Datei, ohne sie komplett in den RAM zu laden"""
+    digest = content_hash()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def guess_content_type(filename):
+    """Ermittelt den Content-Type einer Datei anhand der Endung"""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in CONTENT_TYPES:
+        return CONTENT_TYPES[ext]
+    return mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+def cache_control_for(filename):
+    """Liefert den Cache-Control-Header für eine Datei"""
+    if filename.startswith(IMMUTABLE_PREFIXES):
+        return CACHE_CONTROL_IMMUTABLE
+    return CACHE_CONTROL_REVALIDATE
+
+class CachedAsset:
+    """Eine gecachte Datei inklusive vorberechneter Header-Werte.
+    
+    Große Dateien (ab SENDFILE_THRESHOLD) werden nur mit Metadaten gecacht;
+    `content` ist dann None und der Inhalt wird direkt von der Platte gestreamt.
+    """
+    
+    __slots__ = ('path', 'content', 'content_type', 'content_length', 'cache_control', 'compressible',
+                 'encoded', 'etag', 'last_modified', 'modified_at', 'mtime', 'size', 'checked_at')
+    
+    def __init__(self, path, content, stat_result, checked_at, digest=None, content_type=None):
+        self.path = path
+        self.content = content
+        self.content_type = content_type or guess_content_type(path)
+        self.content_length = str(len(content) if content is not None else stat_result.st_size)
+        self.cache_control = cache_control_for(path)
+        self.compressible = (content is not None and len(content) >= COMPRESS_MIN_SIZE
+                             and self.content_type.startswith(COMPRESSIBLE_TYPES))
+        # Komprimierte Varianten werden beim ersten Bedarf erzeugt: encoding -> (bytes, Content-Length)
+        self.encoded = {}
+        # Starker ETag: Hash des Inhalts, einmal pro Dateiversion berechnet
+        if digest is None:
+            digest = content_hash(content).hexdigest()
+        self.etag = '"' + digest + '"'
+        self.modified_at = int(stat_result.st_mtime)
+        self.last_modified = formatdate(self.modified_at, usegmt=True)
+        self.mtime = stat_result.st_mtime_ns
+        self.size = stat_result.st_size
+        self.checked_at = checked_at
+    
+    @property
+    def nbytes(self):
+        """Vom Cache belegter Speicher (Inhalt plus bereits erzeugte komprimierte Varianten)"""
+        if self.content is None:
+            return 0
+        return len(self.content) + sum(len(value[0]) for value in self.encoded.values() if value is not None)
+    
+    @property
+    def total_size(self):
+        return len(self.content) if self.content is not None else self.size
+    
+    def range_applies(self, if_range, etag):
+        """If-Range: Range nur auswerten, wenn der Validator noch passt"""
+        if not if_range:
+            return True
+        if if_range.startswith(('"', 'W/')):
+            return if_range == etag
+        return if_range == self.last_modified
+    
+    def build_variant(self, encoding):
+        """Erzeugt (Inhalt, Content-Length) der komprimierten Variante.
+        
+        None, wenn die Komprimierung nichts bringt - dann wird unkomprimiert ausgeliefert.
+        Gespeichert wird die Variante über StaticAssetCache.variant().
+        """
+        compressed = self.precompressed(encoding)
+        if compressed is None:
+            compressed = compress_content(self.content, encoding)
+        if len(compressed) >= len(self.content):
+            return None
+        return compressed, str(len(compressed))
+    
+    def precompressed(self, encoding):
+        """Liest eine vorkomprimierte Variante (z.B. proxima_data.json.<hash>.gz, siehe proxima_publish).
+        
+        Die Variante trägt den Inhalts-Hash im Namen; gelesen wird nur die zum
+        gecachten Inhalt (= ETag) passende, unabhängig von Zeitstempeln.
+        """
+        try:
+            with open(variant_path(self.path, self.etag[1:-1], encoding), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def etag_for(self, encoding=None):
+        """ETag der jeweiligen Repräsentation (jede Kodierung hat einen eigenen starken ETag)"""
+        if encoding is None:
+            return self.etag
+        return self.etag[:-1] + '-' + encoding + '"'
+    
+    def matches(self, if_none_match=None, if_modified_since=None, etag=None):
+        """Prüft die Conditional-GET-Header; True bedeutet 304 Not Modified"""
+        if if_none_match is not None:
+            etag = etag or self.etag
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags or 'W/' + etag in tags
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            return since is not None and self.modified_at <= since.timestamp()
+        return False
+
+CACHE_HIT = 'result="hit"'
+CACHE_MISS = 'result="miss"'
+
+class StaticAssetCache:
+    """Prozessweiter LRU-Cache für statische Dateien.
+    
+    Einträge werden höchstens alle `revalidate_interval` Sekunden per stat()
+    gegen mtime/Größe geprüft; die Gesamtgröße ist auf `max_bytes` begrenzt.
+    """
+    
+    def __init__(self, max_bytes=ASSET_CACHE_MAX_BYTES, revalidate_interval=ASSET_CACHE_REVALIDATE):
+        self.max_bytes = max_bytes
+        self.revalidate_interval = revalidate_interval
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, path, indexed=None):
+        """Gibt das CachedAsset für `path` zurück oder None, wenn die Datei nicht existiert.
+        
+        Mit `indexed` (IndexedFile aus dem AssetIndex) wird gegen dessen mtime/Größe
+        geprüft statt per stat() - Änderungen werden mit dem nächsten Index-Scan sichtbar.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                self._entries.move_to_end(path)
+                if indexed is not None:
+                    fresh = entry.mtime == indexed.mtime and entry.size == indexed.size
+                else:
+                    fresh = now - entry.checked_at < self.revalidate_interval
+                if fresh:
+                    metrics.inc('asset_cache_requests_total', CACHE_HIT)
+                    return entry
+        
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            self.invalidate(path)
+            return None
+        if not stat.S_ISREG(stat_result.st_mode):
+            return None
+        
+        if entry is not None and entry.mtime == stat_result.st_mtime_ns and entry.size == stat_result.st_size:
+            entry.checked_at = now
+            metrics.inc('asset_cache_requests_total', CACHE_HIT)
+            return entry
+        
+        metrics.inc('asset_cache_requests_total', CACHE_MISS)
+        content_type = indexed.content_type if indexed is not None else guess_content_type(path)
+        if self.should_stream(stat_result.st_size, content_type):
+            entry = CachedAsset(path, None, stat_result, now, digest=hash_file(path), content_type=content_type)
+        else:
+            with open(path, 'rb') as f:
+                content = f.read()
+            entry = CachedAsset(path, content, stat_result, now, content_type=content_type)
+        self._store(entry)
+        return entry
+    
+    def should_stream(self, size, content_type):
+        """Große Dateien streamen; Text-Assets bleiben im RAM, damit sie komprimiert werden können"""
+        if size < SENDFILE_THRESHOLD:
+            return False
+        return size > self.max_bytes or not content_type.startswith(COMPRESSIBLE_TYPES)
+    
+    def variant(self, entry, encoding):
+        """Komprimierte Variante eines Eintrags (siehe CachedAsset.build_variant).
+        
+        Neue Varianten werden unter dem Cache-Lock eingetragen und auf
+        `max_bytes` angerechnet; danach wird bei Bedarf verdrängt.
+        """
+        if encoding is None or not entry.compressible:
+            return None
+        encoded = entry.encoded
+        if encoding in encoded:
+            return encoded[encoding]
+        
+        value = entry.build_variant(encoding)
+        with self._lock:
+            if encoding in encoded:
+                return encoded[encoding]
+            encoded[encoding] = value
+            if value is not None and self._entries.get(entry.path) is entry:
+                self._total_bytes += len(value[0])
+                self._evict()
+        return value
+    
+    def _store(self, entry):
+        size = entry.nbytes
+        with self._lock:
+            old = self._entries.pop(entry.path, None)
+            if old is not None:
+                self._total_bytes -= old.nbytes
+            if size > self.max_bytes:
+                return
+            self._entries[entry.path] = entry
+            self._total_bytes += size
+            self._evict()
+    
+    def _evict(self):
+        """Verdrängt die ältesten Einträge, bis die Obergrenze eingehalten ist (Lock muss gehalten werden)"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.nbytes
+    
+    def invalidate(self, path=None):
+        """Entfernt einen Eintrag (oder alle) aus dem Cache"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._total_bytes -= old.nbytes
+
+asset_cache = StaticAssetCache()
+
+metrics.gauge('asset_cache_bytes', 'Vom Static-Asset-Cache belegte Bytes', lambda: asset_cache._total_bytes)
+metrics.gauge('asset_cache_entries', 'Anzahl Einträge im Static-Asset-Cache', lambda: len(asset_cache._entries))
+
+# Asset-Index: welche Dateien überhaupt ausgeliefert werden dürfen
+ASSET_INDEX_REFRESH = float(os.getenv('ASSET_INDEX_REFRESH', 10.0))  # Sekunden, 0 = aus
+STATIC_DIRS = ('css', 'js', 'assets', 'images')
+INDEX_EXCLUDED_DIRS = {'__pycache__', 'node_modules', 'venv', 'env', 'build', 'dist'}
+INDEX_EXCLUDED_SUFFIXES = ('.py', '.pyc', '.pyo', '.db', '.db-wal', '.db-shm', '.db-journal', '.log', '.tmp')
+
+class IndexedFile:
+    """Eintrag im Asset-Index: Dateipfad (relativ zu root) und die beim Scan erfassten Metadaten"""
+    
+    __slots__ = ('path', 'size', 'mtime', 'content_type')
+    
+    def __init__(self, path, size, mtime, content_type):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.content_type = content_type
+
+class AssetIndex:
+    """Unveränderlicher Index aller auslieferbaren Dateien unter `root`.
+    
+    URL-Pfade werden per Dict-Lookup aufgelöst; was nicht im Index steht
+    (versteckte Dateien, Python-Quellen, Datenbanken, Pfade außerhalb von
+    `root`), existiert für den Server nicht. Ausgeschlossene Dateien und
+    Verzeichnisse werden beim Scan gesammelt, damit sie ohne Dateisystem-Zugriff
+    mit 404 statt mit dem SPA-Fallback beantwortet werden.
+    """
+    
+    def __init__(self, root=None, refresh_interval=ASSET_INDEX_REFRESH):
+        self.root = root or os.getcwd()
+        self.refresh_interval = refresh_interval
+        self._files = None
+        self._excluded = frozenset()
+        self._lock = threading.Lock()
+    
+    def scan(self):
+        """Durchsucht `root`: (Dict URL-Pfad -> IndexedFile, Menge ausgeschlossener URL-Pfade).
+        
+        Ausgeschlossene Verzeichnisse stehen als Ganzes in der Menge, ohne durchlaufen zu werden.
+        """
+        files = {}
+        excluded = set()
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            rel_dir = os.path.relpath(dirpath, self.root)
+            prefix = '' if rel_dir == '.' else rel_dir.replace(os.sep, '/') + '/'
+            kept = []
+            for dirname in dirnames:
+                if dirname.startswith('.') or dirname in INDEX_EXCLUDED_DIRS:
+                    excluded.add(prefix + dirname)
+                else:
+                    kept.append(dirname)
+            dirnames[:] = kept
+            for filename in filenames:
+                url_path = prefix + filename
+                if filename.startswith('.') or filename.endswith(INDEX_EXCLUDED_SUFFIXES):
+                    excluded.add(url_path)
+                    continue
+                rel_path = filename if rel_dir == '.' else os.path.join(rel_dir, filename)
+                try:
+                    stat_result = os.stat(os.path.join(self.root, rel_path))
+                except OSError:
+                    continue
+                if not stat.S_ISREG(stat_result.st_mode):
+                    continue
+                files[url_path] = IndexedFile(rel_path, stat_result.st_size, stat_result.st_mtime_ns,
+                                              guess_content_type(rel_path))
+        return files, frozenset(excluded)
+    
+    def build(self):
+        """Baut den Index neu auf und tauscht ihn atomar aus"""
+        files, excluded = self.scan()
+        with self._lock:
+            old_files, self._files = self._files, files
+            self._excluded = excluded
+        if old_files:
+            for removed in old_files.keys() - files.keys():
+                asset_cache.invalidate(old_files[removed].path)
+        return len(files)
+    
+    def lookup(self, url_path):
+        """Löst einen URL-Pfad (ohne führenden Slash) in ein IndexedFile auf"""
+        files = self._files
+        if files is None:
+            self.build()
+            files = self._files
+        return files.get(url_path)
+    
+    def is_excluded(self, url_path):
+        """True, wenn `url_path` eine beim Scan ausgeschlossene Datei ist oder in einem ausgeschlossenen Verzeichnis liegt"""
+        excluded = self._excluded
+        if not excluded or not url_path:
+            return False
+        rel_path = posixpath.normpath(url_path)
+        if rel_path in excluded:
+            return True
+        slash = rel_path.find('/')
+        while slash != -1:
+            if rel_path[:slash] in excluded:
+                return True
+            slash = rel_path.find('/', slash + 1)
+        return False
+    
+    def start_refresher(self):
+        """Startet das periodische Neu-Einlesen (Polling) in einem Hintergrund-Thread"""
+        if self.refresh_interval <= 0:
+            return None
+        
+        def refresher():
+            while True:
+                time.sleep(self.refresh_interval)
+                try:
+                    self.build()
+                except Exception as e:
+                    logger.error(f"❌ Asset-Index Aktualisierung fehlgeschlagen: {e}")
+        
+        thread = threading.Thread(target=refresher, daemon=True, name='asset-index')
+        thread.start()
+        return thread
+
+asset_index = AssetIndex()
+
+# Access-Log
+# ACCESS_LOG_MODE: 'sync' (eine Logging-Zeile pro Request im Request-Thread) oder
+# 'queue' (Request-Threads legen nur einen Eintrag in eine Queue, ein Hintergrund-Thread schreibt gebündelt)
+ACCESS_LOG_MODE = os.getenv('ACCESS_LOG_MODE', 'sync').lower()
+ACCESS_LOG_FORMAT = os.getenv('ACCESS_LOG_FORMAT', 'text').lower()  # 'text' oder 'json'
+ACCESS_LOG_FILE = os.getenv('ACCESS_LOG_FILE')  # Standard: stderr
+ACCESS_LOG_SAMPLE_STATIC = float(os.getenv('ACCESS_LOG_SAMPLE_STATIC', 1.0))  # Anteil geloggter Static-Hits
+ACCESS_LOG_BATCH_SIZE = int(os.getenv('ACCESS_LOG_BATCH_SIZE', 256))
+
+class AccessLog:
+    """Gepuffertes Access-Log nach dem QueueHandler/QueueListener-Prinzip.
+    
+    Request-Threads legen nur ein Tupel in eine Queue; Formatierung (Text oder
+    JSON-Lines) und Schreiben passieren gebündelt in einem Hintergrund-Thread.
+    Erfolgreiche Static-Hits (2xx/304) werden mit `sample_static` gesampelt.
+    """
+    
+    def __init__(self, path=ACCESS_LOG_FILE, fmt=ACCESS_LOG_FORMAT,
+                 sample_static=ACCESS_LOG_SAMPLE_STATIC, batch_size=ACCESS_LOG_BATCH_SIZE):
+        self.path = path
+        self.json_format = fmt == 'json'
+        self.sample_static = sample_static
+        self.batch_size = batch_size
+        self.queue = queue.SimpleQueue()
+        self._pid = None
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def log(self, client, requestline, route, status, size, duration):
+        if (route == 'static' and self.sample_static < 1.0 and (200 <= status < 300 or status == 304)
+                and random.random() >= self.sample_static):
+            return
+        if self._pid != os.getpid():
+            self.start()
+        self.queue.put((time.time(), client, requestline, route, status, size, duration))
+    
+    def start(self):
+        """Startet den Writer-Thread (nach fork() pro Prozess neu)"""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.SimpleQueue()
+            stream = open(self.path, 'a', encoding='utf-8') if self.path else sys.stderr
+            self._thread = threading.Thread(target=self._run, args=(self.queue, stream), daemon=True, name='access-log')
+            self._thread.start()
+            self._pid = os.getpid()
+    
+    def stop(self, timeout=5.0):
+        """Schreibt alle noch wartenden Zeilen und beendet den Writer-Thread.
+        
+        Wird beim Herunterfahren aufgerufen (atexit, Worker-Ende), sonst gehen
+        die Einträge in der Queue mit dem Daemon-Thread verloren.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            self._pid = None
+            thread, self._thread = self._thread, None
+            self.queue.put(None)
+        thread.join(timeout)
+    
+    def format(self, entry):
+        timestamp, client, requestline, route, status, size, duration = entry
+        if self.json_format:
+            method, _, rest = requestline.partition(' ')
+            return json.dumps({
+                "ts": datetime.fromtimestamp(timestamp).isoformat(timespec='milliseconds'),
+                "client": client,
+                "method": method,
+                "path": rest.rsplit(' ', 1)[0],
+                "route": route,
+                "status": status,
+                "bytes": size,
+                "duration_ms": round(duration * 1000, 3)
+            }) + '\n'
+        asctime = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+        return f'{asctime} - {client} - "{requestline}" {status} {size} {duration * 1000:.1f}ms\n'
+    
+    def _run(self, entries, stream):
+        running = True
+        while running:
+            batch = [entries.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(entries.get_nowait())
+            except queue.Empty:
+                pass
+            if None in batch:
+                # stop(): Rest der Queue noch mitschreiben, dann beenden
+                running = False
+                try:
+                    while True:
+                        batch.append(entries.get_nowait())
+                except queue.Empty:
+                    pass
+                batch = [entry for entry in batch if entry is not None]
+            try:
+                stream.write(''.join(self.format(entry) for entry in batch))
+                stream.flush()
+            except Exception as e:
+                logger.error(f"❌ Access-Log Schreibfehler: {e}")
+        if stream is not sys.stderr:
+            stream.close()
+
+access_log = AccessLog() if ACCESS_LOG_MODE == 'queue' else None
+if access_log is not None:
+    atexit.register(access_log.stop)
+
+def _after_fork():
+    """Im Kindprozess: Locks neu anlegen, die ein anderer Thread (z.B. Asset-Refresher) beim fork() gehalten haben könnte"""
+    asset_cache._lock = threading.Lock()
+    asset_index._lock = threading.Lock()
+    if access_log is not None:
+        access_log._lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer mit begrenztem Worker-Pool statt einem Thread pro Verbindung"""
+    
+    request_queue_size = SERVER_BACKLOG
+    
+    def __init__(self, server_address, handler_class, max_workers=SERVER_THREADS, bind_and_activate=True):
+        super().__init__(server_address, handler_class, bind_and_activate)
+        # Threads werden erst beim ersten Request gestartet, daher ist fork() vorher sicher
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='http-worker')
+    
+    def process_request(self, request, client_address):
+        """Übergibt die Verbindung an den Worker-Pool"""
+        self.executor.submit(self.process_request_thread, request, client_address)
+    
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+
+class SpacenationsRoutes:
+    """Routing der Space Nations Tools (Static Files, API, SPA-Fallback).
+    
+    Transportunabhängig: wird mit dem klassischen http.server-Handler und
+    dem asyncio-Frontend kombiniert und nutzt nur die BaseHTTPRequestHandler-API.
+    """
+    
+    # Für Metriken: Routen-Klasse, Statuscode und Body-Größe des aktuellen Requests
+    route_class = 'other'
+    response_status = 0
+    response_length = 0
+    
+    def handle_one_request(self):
+        """Misst jeden Request und zeichnet Metriken auf"""
+        self.route_class = 'other'
+        self.response_status = 0
+        self.response_length = 0
+        started = time.perf_counter()
+        super().handle_one_request()
+        if self.response_status:
+            self.request_finished(time.perf_counter() - started)
+    
+    def request_finished(self, duration):
+        """Wird nach jedem Request aufgerufen: Metriken und (gepuffertes) Access-Log"""
+        self.record_metrics(duration)
+        if access_log is not None:
+            access_log.log(self.address_string(), self.requestline, self.route_class,
+                           self.response_status, self.response_length, duration)
+    
+    def record_metrics(self, duration):
+        # Label-Schlüssel sind pro (Route, Status) vorberechnet
+        metrics.record_request(self.route_class, self.response_status, self.response_length, duration)
+    
+    def log_request(self, code='-', size='-'):
+        if isinstance(code, int):
+            self.response_status = int(code)
+        # Mit gepuffertem Access-Log wird erst am Ende des Requests geloggt
+        if access_log is None:
+            super().log_request(code, size)
+    
+    def note_header(self, keyword, value):
+        # Bei HEAD wird kein Body gesendet, Content-Length beschreibt nur die GET-Antwort
+        if keyword.lower() == 'content-length' and self.command != 'HEAD':
+            self.response_length = int(value)
+    
+    def send_header(self, keyword, value):
+        self.note_header(keyword, value)
+        super().send_header(keyword, value)
     
     def do_GET(self):
         """GET Request Handler"""
@@ -45,27 +720,38 @@ class SpacenationsRequestHandler(SimpleHTTPRequestHandler):
             
             # Root path -> index.html
             if path == '/' or path == '':
-                self.serve_file('index.html')
+                self.route_class = 'static'
+                self.serve_file('index.html', asset_index.lookup('index.html'))
                 return
             
             # API Endpoints
             if path.startswith('/api/'):
+                self.route_class = 'api'
                 self.handle_api_request(path, parsed_path.query)
                 return
             
             # Static files
+            self.route_class = 'static'
             if self.serve_static_file(path):
                 return
             
             # Fallback zu index.html für SPA-Routing
-            if not path.startswith('/assets/') and not path.startswith('/css/') and not path.startswith('/js/'):
-                self.serve_file('index.html')
-                return
+            self.route_class = 'spa'
+            self.serve_file('index.html', asset_index.lookup('index.html'))
                 
         except Exception as e:
             logger.error(f"Error handling GET request: {e}")
             self.send_error(500, f"Internal Server Error: {str(e)}")
     
+    def do_HEAD(self):
+        """HEAD Request Handler: gleiches Routing (Asset-Index, Validatoren, Content-Length) wie GET, ohne Body"""
+        self.do_GET()
+    
+    def write_body(self, data):
+        """Schreibt den Response-Body - bei HEAD werden nur die Header gesendet"""
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+    
     def do_POST(self):
         """POST Request Handler"""
         try:
@@ -73,6 +759,7 @@ class SpacenationsRequestHandler(SimpleHTTPRequestHandler):
             path = parsed_path.path
             
             if path.startswith('/api/'):
+                self.route_class = 'api'
                 self.handle_api_post(path)
                 return
             
@@ -82,58 +769,128 @@ class SpacenationsRequestHandler(SimpleHTTPRequestHandler):
             logger.error(f"Error handling POST request: {e}")
             self.send_error(500, f"Internal Server Error: {str(e)}")
     
-    def serve_file(self, filename):
-        """Serve a specific file"""
+    def serve_file(self, filename, indexed=None):
+        """Serve a specific file (mit `indexed` aus dem Asset-Index ohne erneutes stat())"""
         try:
-            if os.path.exists(filename):
-                with open(filename, 'rb') as f:
-                    content = f.read()
-                
-                # Set appropriate content type
-                if filename.endswith('.html'):
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'text/html; charset=utf-8')
-                elif filename.endswith('.css'):
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'text/css')
-                elif filename.endswith('.js'):
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/javascript')
-                elif filename.endswith('.json'):
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/json')
+            asset = asset_cache.get(filename, indexed)
+            if asset is None:
+                self.send_error(404, "File not found")
+                return False
+            
+            etag = asset.etag
+            byte_range = None
+            range_header = self.headers.get('Range')
+            if range_header and not asset.range_applies(self.headers.get('If-Range'), etag):
+                range_header = None
+            
+            # Komprimierung nur für vollständige Antworten, Ranges beziehen sich auf die Rohdaten
+            encoding = None
+            body, content_length = asset.content, asset.content_length
+            if asset.compressible and not range_header:
+                encoding = negotiate_encoding(self.headers.get('Accept-Encoding'))
+                variant = asset_cache.variant(asset, encoding)
+                if variant is None:
+                    encoding = None
                 else:
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/octet-stream')
-                
-                self.send_header('Content-Length', str(len(content)))
+                    body, content_length = variant
+                    etag = asset.etag_for(encoding)
+            
+            if asset.matches(self.headers.get('If-None-Match'), self.headers.get('If-Modified-Since'), etag):
+                self.send_response(304)
+                self.send_validator_headers(asset, etag)
                 self.end_headers()
-                self.wfile.write(content)
                 return True
-            else:
-                self.send_error(404, "File not found")
-                return False
+            
+            total_size = asset.total_size
+            if range_header:
+                try:
+                    byte_range = parse_byte_range(range_header, total_size)
+                except ValueError:
+                    self.send_response(416)
+                    self.send_header('Content-Range', f'bytes */{total_size}')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return True
+            
+            # Große Dateien vor dem Senden der Header öffnen, damit Fehler noch als 404/500 gehen
+            stream = open(filename, 'rb') if body is None and self.command != 'HEAD' else None
+            try:
+                if byte_range:
+                    start, end = byte_range
+                    self.send_response(206)
+                    self.send_header('Content-Range', f'bytes {start}-{end}/{total_size}')
+                    content_length = str(end - start + 1)
+                else:
+                    start, end = 0, total_size - 1
+                    self.send_response(200)
+                self.send_header('Content-Type', asset.content_type)
+                self.send_header('Content-Length', content_length)
+                self.send_header('Accept-Ranges', 'bytes')
+                if encoding:
+                    self.send_header('Content-Encoding', encoding)
+                self.send_validator_headers(asset, etag)
+                self.end_headers()
+                
+                if self.command == 'HEAD':
+                    pass
+                elif stream is not None:
+                    self.send_file_range(stream, start, end - start + 1)
+                elif byte_range:
+                    self.wfile.write(body[start:end + 1])
+                else:
+                    self.wfile.write(body)
+            finally:
+                if stream is not None:
+                    stream.close()
+            return True
                 
         except Exception as e:
             logger.error(f"Error serving file {filename}: {e}")
             self.send_error(500, f"Error serving file: {str(e)}")
             return False
     
+    def send_file_range(self, f, offset, count):
+        """Streamt einen Dateibereich zero-copy per sendfile(), sonst in Blöcken"""
+        if count <= 0:
+            return
+        sendfile = getattr(self.connection, 'sendfile', None)
+        if sendfile is not None:
+            # socket.sendfile() nutzt os.sendfile und fällt selbst auf send() zurück
+            self.wfile.flush()
+            sendfile(f, offset, count)
+            return
+        
+        f.seek(offset)
+        remaining = count
+        while remaining > 0:
+            chunk = f.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            self.wfile.write(chunk)
+            remaining -= len(chunk)
+    
+    def send_validator_headers(self, asset, etag):
+        """Sendet ETag, Last-Modified, Cache-Control und Vary für ein Asset"""
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', asset.last_modified)
+        self.send_header('Cache-Control', asset.cache_control)
+        if asset.compressible:
+            self.send_header('Vary', 'Accept-Encoding')
+    
     def serve_static_file(self, path):
-        """Serve static files from various directories"""
+        """Serve static files from the asset index"""
         # Remove leading slash
-        if path.startswith('/'):
-            path = path[1:]
+        path = unquote(path).lstrip('/')
         
-        # Check if file exists
-        if os.path.exists(path):
-            return self.serve_file(path)
+        indexed = asset_index.lookup(path)
+        if indexed is not None:
+            return self.serve_file(indexed.path, indexed)
         
-        # Check common static directories
-        static_dirs = ['css', 'js', 'assets', 'images']
-        for static_dir in static_dirs:
-            if path.startswith(static_dir + '/'):
-                return self.serve_file(path)
+        # Fehlende Dateien in Static-Verzeichnissen sind echte 404s, kein SPA-Routing;
+        # ebenso vorhandene, aber vom Index ausgeschlossene Dateien (app.py, proxima.db, ...)
+        if path.split('/', 1)[0] in STATIC_DIRS or asset_index.is_excluded(path):
+            self.send_error(404, "File not found")
+            return True
         
         return False
     
@@ -146,6 +903,14 @@ class SpacenationsRequestHandler(SimpleHTTPRequestHandler):
                 self.handle_status_check()
             elif path == '/api/firebase-config':
                 self.handle_firebase_config()
+            elif path == '/api/metrics':
+                self.handle_metrics()
+            elif path == '/api/proxima/planets':
+                self.handle_proxima_planets(query_string)
+            elif path == '/api/proxima/changes':
+                self.handle_proxima_changes(query_string)
+            elif path == '/api/proxima/analytics':
+                self.handle_proxima_analytics(query_string)
             else:
                 self.send_error(404, "API endpoint not found")
                 
@@ -177,10 +942,7 @@ class SpacenationsRequestHandler(SimpleHTTPRequestHandler):
             "version": "1.0.0"
         }
         
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(health_data).encode())
+        self.send_json(health_data)
     
     def handle_status_check(self):
         """Status check endpoint"""
@@ -192,10 +954,97 @@ class SpacenationsRequestHandler(SimpleHTTPRequestHandler):
             "port": os.getenv('PORT', '8000')
         }
         
+        self.send_json(status_data)
+    
+    def handle_proxima_planets(self, query_string):
+        """Proxima planets endpoint (gefiltert, paginiert, aus dem In-Memory-Snapshot)"""
+        params = parse_qs(query_string)
+        
+        def int_param(name, default=None):
+            values = params.get(name)
+            return int(values[0]) if values else default
+        
+        try:
+            week = int_param('week')
+            galaxy = int_param('galaxy')
+            min_score = int_param('min_score')
+            max_score = int_param('max_score')
+            offset = max(int_param('offset', 0), 0)
+            limit = min(max(int_param('limit', DEFAULT_LIMIT), 1), MAX_LIMIT)
+        except ValueError:
+            self.send_json({"error": "Ungültiger Zahlenwert in den Parametern"}, status=400)
+            return
+        
+        fields = None
+        if params.get('fields'):
+            fields = [field for field in params['fields'][0].split(',') if field]
+            unknown = [field for field in fields if field not in PLANET_FIELDS]
+            if unknown:
+                self.send_json({"error": f"Unbekannte Felder: {', '.join(unknown)}"}, status=400)
+                return
+        
+        snapshot = planet_snapshots.get()
+        if snapshot is None:
+            self.send_json({"error": "Keine Proxima-Daten verfügbar"}, status=503)
+            return
+        
+        result = snapshot.query(week=week, min_score=min_score, max_score=max_score, galaxy=galaxy,
+                                offset=offset, limit=limit, fields=fields)
+        self.send_json(result)
+    
+    def handle_proxima_changes(self, query_string):
+        """Änderungs-Feed zwischen Proxima-Snapshots (since = Snapshot-ID oder ISO-Zeitstempel)"""
+        params = parse_qs(query_string)
+        since = params.get('since', [None])[0] or None
+        if since is not None and since.isdigit():
+            since = int(since)
+        
+        db_path = planet_snapshots.db_path
+        if not os.path.exists(db_path):
+            self.send_json({"error": "Keine Proxima-Datenbank verfügbar"}, status=503)
+            return
+        
+        pool = proxima_db.get_pool(db_path)
+        pool.ensure_schema()
+        self.send_json(proxima_db.get_changes(pool.reader(), since=since))
+    
+    def handle_proxima_analytics(self, query_string):
+        """Auswertungen über die Snapshot-Historie (view = weekly, lifetimes oder trajectory)"""
+        params = parse_qs(query_string)
+        view = params.get('view', ['weekly'])[0]
+        if view not in ANALYTICS_VIEWS:
+            self.send_json({"error": f"Unbekannte Auswertung: {view}"}, status=400)
+            return
+        
+        db_path = planet_snapshots.db_path
+        if not os.path.exists(db_path):
+            self.send_json({"error": "Keine Proxima-Datenbank verfügbar"}, status=503)
+            return
+        
+        proxima_db.get_pool(db_path).ensure_schema()
+        analytics = get_analytics(db_path)
+        if view == 'weekly':
+            data = analytics.weekly_aggregates()
+        elif view == 'lifetimes':
+            data = analytics.lifetimes()
+        else:
+            try:
+                limit = int(params.get('limit', [MAX_TRAJECTORY_POINTS])[0])
+            except ValueError:
+                self.send_json({"error": "Ungültiger Zahlenwert in den Parametern"}, status=400)
+                return
+            limit = min(max(limit, 1), MAX_TRAJECTORY_POINTS)
+            data = analytics.trajectories(params.get('name', [None])[0], limit=limit)
+        self.send_json({"view": view, "snapshotId": analytics.snapshot_id(), "data": data})
+    
+    def handle_metrics(self):
+        """Prometheus metrics endpoint"""
+        body = metrics.render().encode()
         self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(status_data).encode())
+        self.write_body(body)
     
     def handle_firebase_config(self):
         """Firebase configuration endpoint"""
@@ -209,11 +1058,7 @@ class SpacenationsRequestHandler(SimpleHTTPRequestHandler):
             "measurementId": "G-SKWJWH2ERX"
         }
         
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(firebase_config).encode())
+        self.send_json(firebase_config, headers={'Access-Control-Allow-Origin': '*'})
     
     def handle_proxima_sync(self, post_data):
         """Handle Proxima sync requests"""
@@ -225,10 +1070,7 @@ class SpacenationsRequestHandler(SimpleHTTPRequestHandler):
                 "timestamp": datetime.now().isoformat()
             }
             
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(response_data).encode())
+            self.send_json(response_data)
             
         except Exception as e:
             logger.error(f"Error in Proxima sync: {e}")
@@ -238,41 +1080,383 @@ class SpacenationsRequestHandler(SimpleHTTPRequestHandler):
                 "timestamp": datetime.now().isoformat()
             }
             
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(error_response).encode())
+            self.send_json(error_response, status=500)
+    
+    def send_json(self, data, status=200, headers=None):
+        """Sendet eine JSON-Antwort inklusive Content-Length (nötig für Keep-Alive)"""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.write_body(body)
     
     def log_message(self, format, *args):
         """Custom log message format"""
         logger.info(f"{self.address_string()} - {format % args}")
 
-def start_proxima_scheduler():
-    """Start Proxima data scheduler in background thread"""
-    def scheduler():
-        logger.info("🔄 Proxima Auto-Updater Scheduler gestartet")
-        logger.info("📅 Update-Zeitfenster: Mittwoch 17:00 - 23:00 Uhr")
-        logger.info("⏱️  Prüfintervall: Alle 5 Minuten")
+class SpacenationsRequestHandler(SpacenationsRoutes, SimpleHTTPRequestHandler):
+    """Custom Request Handler für Space Nations Tools"""
+    
+    # StreamRequestHandler setzt den Timeout auf den Socket; handle_one_request
+    # schließt die Verbindung dann statt einen Pool-Worker endlos zu blockieren
+    timeout = SERVER_SOCKET_TIMEOUT
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=os.getcwd(), **kwargs)
+
+class BufferedRequestHandler(SpacenationsRoutes, BaseHTTPRequestHandler):
+    """Führt das Routing für einen vollständig gelesenen Request auf In-Memory-Streams aus.
+    
+    Wird vom asyncio-Frontend genutzt: Request-Bytes rein, Response-Bytes raus.
+    Große Dateien werden nicht gepuffert, sondern als `deferred_file`
+    (Datei, Offset, Länge) zurückgegeben und vom Aufrufer per sendfile gesendet.
+    """
+    
+    protocol_version = 'HTTP/1.1'
+    connection = None
+    
+    def __init__(self, request_bytes, client_address):
+        self.client_address = client_address
+        self.rfile = io.BytesIO(request_bytes)
+        self.wfile = io.BytesIO()
+        self.deferred_file = None
+        self.close_connection = True
+    
+    def run(self):
+        """Verarbeitet den Request und gibt die serialisierte Antwort zurück"""
+        self.handle_one_request()
+        return self.wfile.getvalue()
+    
+    def handle_expect_100(self):
+        # "100 Continue" sendet das Frontend (bzw. gunicorn) vor dem Lesen des Bodys,
+        # hier liegt der Body schon vollständig vor
+        return True
+    
+    def send_file_range(self, f, offset, count):
+        if count > 0:
+            # Eigener Dateideskriptor, da serve_file die Datei nach der Rückkehr schließt
+            self.deferred_file = (os.fdopen(os.dup(f.fileno()), 'rb'), offset, count)
+
+class FileRange:
+    """Dateiähnliches Objekt, das nur `count` Bytes ab `offset` liefert (für wsgi.file_wrapper)"""
+    
+    def __init__(self, f, offset, count):
+        self.f = f
+        self.remaining = count
+        f.seek(offset)
+    
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        chunk = self.f.read(size)
+        self.remaining -= len(chunk)
+        return chunk
+    
+    def fileno(self):
+        # Server mit sendfile-Support starten an der aktuellen Position und begrenzen auf Content-Length
+        return self.f.fileno()
+    
+    def close(self):
+        self.f.close()
+    
+    def __iter__(self):
+        return iter(lambda: self.read(STREAM_CHUNK_SIZE), b'')
+
+class WSGIRequestHandler(BufferedRequestHandler):
+    """Führt das Routing für einen WSGI-Request aus und sammelt Status, Header und Body"""
+    
+    HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+                          'te', 'trailers', 'transfer-encoding', 'upgrade'}
+    
+    def __init__(self, environ):
+        super().__init__(b'', (environ.get('REMOTE_ADDR', ''), int(environ.get('REMOTE_PORT') or 0)))
+        self.rfile = environ['wsgi.input']
+        self.command = environ['REQUEST_METHOD']
+        self.request_version = environ.get('SERVER_PROTOCOL', 'HTTP/1.0')
+        
+        # PATH_INFO ist bereits dekodiert (latin-1) - zurück in die URL-Form wie bei http.server
+        path = quote((environ.get('SCRIPT_NAME', '') + environ.get('PATH_INFO', '')).encode('latin-1'))
+        if environ.get('QUERY_STRING'):
+            path += '?' + environ['QUERY_STRING']
+        self.path = path or '/'
+        self.requestline = f"{self.command} {self.path} {self.request_version}"
         
+        self.headers = Message()
+        for key, value in environ.items():
+            if key.startswith('HTTP_'):
+                self.headers[key[5:].replace('_', '-').title()] = value
+        if environ.get('CONTENT_TYPE'):
+            self.headers['Content-Type'] = environ['CONTENT_TYPE']
+        if environ.get('CONTENT_LENGTH'):
+            self.headers['Content-Length'] = environ['CONTENT_LENGTH']
+        
+        self.status = None
+        self.response_headers = []
+    
+    def send_response(self, code, message=None):
+        self.log_request(code)
+        if message is None:
+            message = self.responses.get(code, ('',))[0]
+        self.status = f"{code} {message}"
+        self.response_headers = []
+    
+    def send_header(self, keyword, value):
+        self.note_header(keyword, value)
+        if keyword.lower() not in self.HOP_BY_HOP_HEADERS:
+            self.response_headers.append((keyword, value))
+    
+    def end_headers(self):
+        pass
+
+def application(environ, start_response):
+    """WSGI-Einstiegspunkt, z.B. `gunicorn -c gunicorn.conf.py app:application`"""
+    started = time.perf_counter()
+    handler = WSGIRequestHandler(environ)
+    method = getattr(handler, 'do_' + handler.command, None)
+    if method is None:
+        handler.send_error(501, "Unsupported method (%r)" % handler.command)
+    else:
+        method()
+    handler.request_finished(time.perf_counter() - started)
+    
+    start_response(handler.status or '500 Internal Server Error', handler.response_headers)
+    if handler.command == 'HEAD':
+        # Nur Header (Content-Length wie bei GET), kein Body und kein file_wrapper
+        if handler.deferred_file is not None:
+            handler.deferred_file[0].close()
+        return []
+    if handler.deferred_file is None:
+        return [handler.wfile.getvalue()]
+    
+    f, offset, count = handler.deferred_file
+    body = FileRange(f, offset, count)
+    file_wrapper = environ.get('wsgi.file_wrapper')
+    if file_wrapper is not None:
+        return file_wrapper(body, STREAM_CHUNK_SIZE)
+    return body
+
+start_time = time.time()
+
+# Mehrere Worker-Prozesse: nur der Worker, der diesen Datei-Lock hält, führt den Scheduler aus
+SCHEDULER_LOCK_FILE = os.getenv('SCHEDULER_LOCK_FILE', '.proxima_scheduler.lock')
+
+def run_proxima_scheduler():
+    """Scheduler-Schleife (läuft im aktuellen Thread, endet nie)"""
+    logger.info("🔄 Proxima Auto-Updater Scheduler gestartet")
+    logger.info("📅 Update-Zeitfenster: Mittwoch 17:00 - 23:00 Uhr")
+    logger.info("⏱️  Prüfintervall: Alle 5 Minuten")
+    
+    while True:
+        try:
+            # Proxima Auto-Updater (jeden Mittwoch 17-23 Uhr, alle 5 Min)
+            if PROXIMA_UPDATER_AVAILABLE:
+                started = time.perf_counter()
+                try:
+                    check_and_update()
+                except Exception as e:
+                    logger.error(f"❌ Proxima Auto-Updater Fehler: {e}")
+                metrics.observe('proxima_scheduler_run_seconds', time.perf_counter() - started)
+            
+            # Warte 5 Minuten
+            time.sleep(300)
+            
+        except Exception as e:
+            logger.error(f"❌ Proxima scheduler error: {e}")
+            time.sleep(60)  # Wait 1 minute on error
+
+def start_proxima_scheduler(elect=False):
+    """Start Proxima data scheduler in background thread
+    
+    Mit `elect=True` (je Worker-Prozess bei prefork/gunicorn aufgerufen) wartet
+    der Thread auf den exklusiven Lock auf SCHEDULER_LOCK_FILE: genau ein Worker
+    führt den Scheduler aus, seine Metriken landen so in einem Prozess, der
+    /api/metrics bedient. Stirbt dieser Worker, gibt der Kernel den Lock frei
+    und ein anderer Worker übernimmt.
+    """
+    def elected_scheduler():
+        with open(SCHEDULER_LOCK_FILE, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            logger.info(f"👑 Worker {os.getpid()} übernimmt den Proxima-Scheduler")
+            run_proxima_scheduler()
+    
+    target = elected_scheduler if elect and fcntl is not None else run_proxima_scheduler
+    thread = threading.Thread(target=target, daemon=True, name='proxima-scheduler')
+    thread.start()
+    logger.info("Proxima scheduler started")
+
+def start_worker_services():
+    """Hintergrund-Threads eines Worker-Prozesses (prefork und gunicorn post_fork)"""
+    asset_index.start_refresher()
+    if os.getenv('METRICS_DIR'):
+        metrics.enable_multiprocess(os.environ['METRICS_DIR'])
+        metrics.start_flusher()
+    start_proxima_scheduler(elect=True)
+
+def enable_worker_metrics():
+    """Im Master vor dem Forken: gemeinsames Metrik-Verzeichnis anlegen (über METRICS_DIR vererbt)"""
+    directory = tempfile.mkdtemp(prefix='spacenations-metrics-')
+    os.environ['METRICS_DIR'] = directory
+    return directory
+
+def request_body_length(head):
+    """Liest Content-Length aus einem rohen Request-Header (ohne Transfer-Encoding-Support)"""
+    for line in head.split(b'\r\n')[1:]:
+        name, sep, value = line.partition(b':')
+        if not sep:
+            continue
+        name = name.strip().lower()
+        if name == b'content-length':
+            length = int(value.strip())
+            if length < 0:
+                raise ValueError('negative Content-Length')
+            return length
+        if name == b'transfer-encoding':
+            raise ValueError('Transfer-Encoding wird nicht unterstützt')
+    return 0
+
+def expects_continue(head):
+    """True bei HTTP/1.1-Requests mit "Expect: 100-continue" (Client wartet vor dem Body auf 100)"""
+    lines = head.split(b'\r\n')
+    if not lines[0].endswith(b'HTTP/1.1'):
+        return False
+    for line in lines[1:]:
+        name, sep, value = line.partition(b':')
+        if sep and name.strip().lower() == b'expect':
+            return value.strip().lower() == b'100-continue'
+    return False
+
+async def handle_async_connection(reader, writer):
+    """Bedient eine persistente HTTP/1.1-Verbindung (Requests werden der Reihe nach abgearbeitet)"""
+    loop = asyncio.get_running_loop()
+    peer = writer.get_extra_info('peername') or ('', 0)
+    
+    try:
         while True:
             try:
-                # Proxima Auto-Updater (jeden Mittwoch 17-23 Uhr, alle 5 Min)
-                if PROXIMA_UPDATER_AVAILABLE:
-                    try:
-                        check_and_update()
-                    except Exception as e:
-                        logger.error(f"❌ Proxima Auto-Updater Fehler: {e}")
-                
-                # Warte 5 Minuten
-                time.sleep(300)
-                
+                head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEPALIVE_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+                break
+            
+            try:
+                length = request_body_length(head)
+            except ValueError:
+                writer.write(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+                break
+            if length and expects_continue(head):
+                writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+                await writer.drain()
+            body = await reader.readexactly(length)
+            
+            handler = BufferedRequestHandler(head + body, peer)
+            response = await loop.run_in_executor(None, handler.run)
+            writer.write(response)
+            
+            if handler.deferred_file is not None:
+                f, offset, count = handler.deferred_file
+                try:
+                    # Eine HEAD-Antwort endet nach den Headern, auch wenn Content-Length gesetzt ist
+                    if handler.command != 'HEAD':
+                        await writer.drain()
+                        await loop.sendfile(writer.transport, f, offset, count)
+                finally:
+                    f.close()
+            
+            await writer.drain()
+            if handler.close_connection:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+def run_asyncio(port):
+    """asyncio-Frontend: tausende Keep-Alive-Verbindungen, Routing läuft im Thread-Pool"""
+    async def serve():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=SERVER_THREADS, thread_name_prefix='http-worker'))
+        server = await asyncio.start_server(
+            handle_async_connection, host=None, port=port,
+            limit=MAX_REQUEST_HEADER_BYTES, backlog=SERVER_BACKLOG, reuse_address=True
+        )
+        async with server:
+            await server.serve_forever()
+    
+    asyncio.run(serve())
+
+def create_server(port, mode=None):
+    """Erstellt den HTTP-Server passend zum Serving-Modus"""
+    mode = mode or SERVER_MODE
+    server_address = ('', port)
+    
+    if mode == 'single':
+        return HTTPServer(server_address, SpacenationsRequestHandler)
+    if mode in ('threaded', 'prefork'):
+        return PooledHTTPServer(server_address, SpacenationsRequestHandler, max_workers=SERVER_THREADS)
+    
+    raise ValueError(f"Unbekannter SERVER_MODE: {mode}")
+
+def run_prefork(httpd, workers):
+    """Pre-Fork-Modus: Worker-Prozesse teilen sich den gebundenen Listening-Socket.
+    
+    Der Master-Prozess bedient selbst keine Requests und startet abgestürzte Worker
+    neu. Den Proxima-Scheduler führt genau ein Worker aus (siehe start_proxima_scheduler),
+    die Metriken aller Worker werden über ein gemeinsames Verzeichnis summiert.
+    """
+    children = set()
+    metrics_dir = None if os.getenv('METRICS_DIR') else enable_worker_metrics()
+    
+    def terminate(signum, frame):
+        raise KeyboardInterrupt
+    
+    def spawn_worker():
+        pid = os.fork()
+        if pid == 0:
+            # SIGTERM beendet serve_forever() regulär, damit Metriken und Access-Log noch geschrieben werden
+            signal.signal(signal.SIGTERM, terminate)
+            start_worker_services()
+            exit_code = 0
+            try:
+                httpd.serve_forever()
+            except KeyboardInterrupt:
+                pass
             except Exception as e:
-                logger.error(f"❌ Proxima scheduler error: {e}")
-                time.sleep(60)  # Wait 1 minute on error
+                logger.error(f"❌ Worker {os.getpid()} Fehler: {e}")
+                exit_code = 1
+            finally:
+                try:
+                    metrics.flush()
+                    if access_log is not None:
+                        access_log.stop()
+                finally:
+                    os._exit(exit_code)
+        children.add(pid)
     
-    thread = threading.Thread(target=scheduler, daemon=True)
-    thread.start()
-    logger.info("Proxima scheduler started")
+    for _ in range(workers):
+        spawn_worker()
+    
+    signal.signal(signal.SIGTERM, terminate)
+    logger.info(f"👷 {workers} Worker-Prozesse gestartet (je {SERVER_THREADS} Threads)")
+    
+    try:
+        while True:
+            pid, status = os.wait()
+            children.discard(pid)
+            logger.warning(f"⚠️ Worker {pid} beendet (Status {status}) - starte neu")
+            spawn_worker()
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        httpd.server_close()
+        if metrics_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
 
 def main():
     """Main application entry point"""
@@ -282,16 +1466,38 @@ def main():
     # Get port from environment (Railway sets this)
     port = int(os.getenv('PORT', 8000))
     
-    # Create server
-    server_address = ('', port)
-    httpd = HTTPServer(server_address, SpacenationsRequestHandler)
+    mode = SERVER_MODE
+    if mode == 'prefork' and not hasattr(os, 'fork'):
+        logger.warning("⚠️ Pre-Fork wird auf dieser Plattform nicht unterstützt - nutze 'threaded'")
+        mode = 'threaded'
     
-    # Start Proxima scheduler
-    start_proxima_scheduler()
+    # Create server
+    httpd = create_server(port, mode) if mode != 'asyncio' else None
+    indexed_files = asset_index.build()
     
     logger.info(f"🚀 Spacenations Tools Server starting on port {port}")
     logger.info(f"🌍 Environment: {os.getenv('RAILWAY_ENVIRONMENT', 'development')}")
     logger.info(f"📁 Working directory: {os.getcwd()}")
+    logger.info(f"⚙️  Serving mode: {mode}")
+    logger.info(f"🗂️  Asset-Index: {indexed_files} Dateien")
+    
+    if mode == 'prefork':
+        try:
+            run_prefork(httpd, SERVER_WORKERS)
+        except KeyboardInterrupt:
+            logger.info("🛑 Server shutting down...")
+        return
+    
+    # Start Proxima scheduler
+    start_proxima_scheduler()
+    asset_index.start_refresher()
+    
+    if mode == 'asyncio':
+        try:
+            run_asyncio(port)
+        except KeyboardInterrupt:
+            logger.info("🛑 Server shutting down...")
+        return
     
     try:
         httpd.serve_forever()
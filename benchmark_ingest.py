@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Speichern eines Proxima-Abrufs in ProximaDB
+Vergleicht das frühere Einfügen (ein execute() pro Planet, Wochennummer in Python)
+mit ProximaFetcher.save_planets (executemany, Wochennummer per SQL, ein Snapshot)
+
+Aufruf: python3 benchmark_ingest.py [--planets 100000] [--snapshots 2]
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+import proxima_db
+from proxima_fetcher import ProximaFetcher
+
+LEGACY_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS planets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        coordinates TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        delete_on TEXT NOT NULL,
+        week_number INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(name, created_at)
+    )
+'''
+
+def synthetic_planets(count, seed=0):
+    """Planeten im Format der Proxima-API ('Proxima <Woche>-<Nr>')"""
+    rng = random.Random(seed)
+    return [{
+        'name': f'Proxima {i // 1000 + 1}-{i % 1000 + 1}',
+        'coordinates': f'{rng.randint(1, 999)}:{rng.randint(1, 999)}:{rng.randint(1, 12)}',
+        'score': rng.randint(10, 500),
+        'deleteOn': '2025-10-22T16:07:33.000000Z'
+    } for i in range(count)]
+
+def extract_week_number(planet_name):
+    try:
+        parts = planet_name.split()
+        if len(parts) >= 2:
+            return int(parts[1].split('-')[0])
+    except (ValueError, IndexError):
+        pass
+    return 0
+
+def legacy_save(db_path, planets):
+    """Früherer save_planets: ein execute() pro Planet, Commit am Ende"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(LEGACY_SCHEMA)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_name ON planets(name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_week ON planets(week_number)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_created ON planets(created_at)')
+    conn.commit()
+
+    current_time = datetime.now().isoformat()
+    for planet in planets:
+        cursor.execute('''
+            INSERT OR REPLACE INTO planets
+            (name, coordinates, score, delete_on, week_number, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (planet['name'], planet['coordinates'], planet['score'], planet['deleteOn'],
+              extract_week_number(planet['name']), current_time))
+    conn.commit()
+    conn.close()
+
+PYTHON_WEEK_INSERT = '''
+    INSERT OR REPLACE INTO planets
+    (name, coordinates, score, delete_on, week_number, created_at, snapshot_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+def insert_only(planets, sql_week):
+    """Nur das executemany in planets (In-Memory-DB mit dem echten Schema):
+    Wochennummer per extract_week_number() in Python oder per SQL (proxima_db.INSERT_PLANET)"""
+    conn = sqlite3.connect(':memory:')
+    proxima_db.init_schema(conn)
+    digest = hashlib.sha256()
+    context = ('2025-10-15T18:45:00', 1)
+    if sql_week:
+        def rows():
+            for row in map(proxima_db.api_row, planets):
+                digest.update(('%s\x1f%s\x1f%s\x1f%s\x1e' % row).encode('utf-8'))
+                yield row + context
+        statement = proxima_db.INSERT_PLANET
+    else:
+        def rows():
+            for planet in planets:
+                name, coordinates, score, delete_on = planet['name'], planet['coordinates'], planet['score'], planet['deleteOn']
+                digest.update(f'{name}\x1f{coordinates}\x1f{score}\x1f{delete_on}\x1e'.encode('utf-8'))
+                yield (name, coordinates, score, delete_on, extract_week_number(name)) + context
+        statement = PYTHON_WEEK_INSERT
+    started = time.perf_counter()
+    conn.executemany(statement, rows())
+    conn.commit()
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return elapsed
+
+def timed(function, *args):
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--planets', type=int, default=100000)
+    parser.add_argument('--snapshots', type=int, default=2, help='Abrufe nacheinander (ab dem zweiten mit Änderungs-Feed)')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"📊 Benchmark: {args.planets} Planeten, {args.snapshots} Abrufe")
+    print("="*60)
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, 'legacy.db')
+        fetcher = ProximaFetcher(os.path.join(tmp, 'proxima.db'))
+
+        for run in range(1, args.snapshots + 1):
+            planets = synthetic_planets(args.planets, seed=run)
+            legacy = timed(legacy_save, legacy_path, planets)
+            # Snapshots werden über den Zeitstempel unterschieden
+            time.sleep(0.001)
+            current = timed(fetcher.save_planets, planets)
+            print(f"Abruf {run}: früher {legacy:6.2f}s ({args.planets / legacy:8.0f}/s) | "
+                  f"save_planets {current:6.2f}s ({args.planets / current:8.0f}/s) | x{legacy / current:.1f}")
+
+        count = fetcher.db.reader().execute('SELECT COUNT(*), SUM(week_number) FROM planets').fetchone()
+        print(f"Zeilen in planets: {count[0]}, Summe Wochennummern: {count[1]}")
+
+    planets = synthetic_planets(args.planets)
+    python_week = min(insert_only(planets, sql_week=False) for _ in range(5))
+    sql_week = min(insert_only(planets, sql_week=True) for _ in range(5))
+    print(f"Nur INSERT in planets (min. aus 5): Woche in Python {python_week:.2f}s | "
+          f"Woche per SQL {sql_week:.2f}s | x{python_week / sql_week:.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: HTML-Report (proxima_report.html) für 10k/100k Planeten
+Vergleicht den früheren Weg (ganzes Dokument als String, dann publish())
+mit ProximaFetcher.generate_html_report (write_report -> publish_stream)
+und misst Laufzeit sowie Spitzen-Speicher (tracemalloc)
+
+Aufruf: python3 benchmark_report.py [--sizes 10000,100000] [--repeat 3]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmark_ingest import synthetic_planets
+from proxima_fetcher import ProximaFetcher
+from proxima_publish import publish
+from proxima_report import iter_report
+
+def legacy_report(fetcher, path):
+    """Früherer Weg: Planeten per fetchall(), Report per join(), dann publish()"""
+    summary = fetcher.get_planets_summary()
+    publish(path, ''.join(iter_report(summary, fetcher.format_delete_date)))
+
+def streamed_report(fetcher, path):
+    fetcher.generate_html_report(path)
+
+def measure(function, fetcher, path, repeat):
+    """Beste Laufzeit aus `repeat` Läufen und Spitzen-Speicher eines eigenen Laufs"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(fetcher, path)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    function(fetcher, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print("📊 Benchmark: HTML-Report")
+    print("="*78)
+    print(f"{'Planeten':>9} {'Weg':<10} {'Zeit s':>8} {'µs/Planet':>10} {'Spitze MB':>10} {'Datei MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in map(int, args.sizes.split(',')):
+            fetcher = ProximaFetcher(os.path.join(tmp, f'proxima-{size}.db'))
+            fetcher.save_planets(synthetic_planets(size))
+            path = os.path.join(tmp, f'report-{size}.html')
+            for label, function in (('früher', legacy_report), ('Stream', streamed_report)):
+                elapsed, peak = measure(function, fetcher, path, args.repeat)
+                print(f"{size:>9} {label:<10} {elapsed:>8.2f} {elapsed / size * 1e6:>10.1f} "
+                      f"{peak / 2**20:>10.1f} {os.path.getsize(path) / 2**20:>9.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark: asyncio-Frontend (HTTP/1.1 Keep-Alive) gegen den Thread-Pool-Server
+Startet app.py je Modus in einem eigenen Prozess (ohne Scheduler) und misst
+Requests/s sowie p50/p99-Latenz mit einem asyncio-Lastgenerator
+
+Aufruf: python3 benchmark_server.py [--connections 50] [--duration 5]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Server ohne main(): kein Proxima-Scheduler, kein Index-Refresh, Access-Log gebündelt nach /dev/null
+SERVER_SCRIPT = '''
+import sys, app
+app.asset_index.build()
+port = int(sys.argv[2])
+if sys.argv[1] == 'asyncio':
+    app.run_asyncio(port)
+else:
+    app.create_server(port, sys.argv[1]).serve_forever()
+'''
+
+SERVER_ENV = {
+    'ASSET_INDEX_REFRESH': '0',
+    'ACCESS_LOG_MODE': 'queue',
+    'ACCESS_LOG_FILE': os.devnull,
+}
+
+TARGETS = ('/api/health', '/index.html')
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(mode, port):
+    env = dict(os.environ, **SERVER_ENV)
+    process = subprocess.Popen([sys.executable, '-c', SERVER_SCRIPT, mode, str(port)], cwd=BASE_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"Server im Modus {mode} startet nicht")
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    length = 0
+    keep_alive = head.startswith(b'HTTP/1.1')
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        name = name.strip().lower()
+        if name == b'content-length':
+            length = int(value)
+        elif name == b'connection' and value.strip().lower() == b'close':
+            keep_alive = False
+    await reader.readexactly(length)
+    return head[9:12], keep_alive
+
+async def client(port, path, deadline, latencies, errors):
+    request = f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode()
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(request)
+            status, keep_alive = await read_response(reader)
+        except (OSError, asyncio.IncompleteReadError):
+            errors.append(1)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            continue
+        latencies.append(time.perf_counter() - started)
+        if status != b'200':
+            errors.append(1)
+        if not keep_alive:
+            # HTTP/1.0-Server (Thread-Pool): jede Anfrage braucht eine neue Verbindung
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+async def run_load(port, path, connections, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(client(port, path, deadline, latencies, errors) for _ in range(connections)))
+    return latencies, errors
+
+def benchmark(mode, path, connections, duration):
+    port = free_port()
+    process = start_server(mode, port)
+    try:
+        # Aufwärmen: Asset-Cache und Komprimierung
+        asyncio.run(run_load(port, path, 4, 0.5))
+        started = time.perf_counter()
+        latencies, errors = asyncio.run(run_load(port, path, connections, duration))
+        elapsed = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait()
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': percentile(latencies, 50) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+        'errors': len(errors),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--modes', default='threaded,asyncio')
+    args = parser.parse_args()
+
+    print(f"📊 Benchmark: {args.connections} Verbindungen, je {args.duration:.0f}s pro Messung")
+    print("="*70)
+    print(f"{'Modus':<10} {'Pfad':<14} {'Req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'Fehler':>8}")
+    for path in TARGETS:
+        for mode in args.modes.split(','):
+            result = benchmark(mode, path, args.connections, args.duration)
+            print(f"{mode:<10} {path:<14} {result['rps']:>9.0f} {result['p50']:>9.2f} "
+                  f"{result['p99']:>9.2f} {result['errors']:>8}")
+
+if __name__ == '__main__':
+    main()
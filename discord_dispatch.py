@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Versand-Warteschlange für Discord-Webhooks
+
+- eine gemeinsame, gepoolte requests.Session für alle Webhooks
+- Pacing anhand der X-RateLimit-*-Header (Remaining / Reset-After) je Webhook
+- 429 wird nach `retry_after` wiederholt, 5xx und Verbindungsfehler mit Backoff
+- jede Nachricht liefert ein eigenes DeliveryOutcome statt eines Abbruchs beim ersten Fehler
+- Datei-Uploads werden als gestreamter multipart/form-data-Body gesendet (MultipartBody),
+  ohne den Inhalt für den Request noch einmal zu kopieren
+
+Nachrichten an denselben Webhook werden in Reihenfolge gesendet (Seiten einer
+Tabelle dürfen sich nicht überholen); verschiedene Webhooks sind unabhängig.
+fan_out() nutzt das, um dieselben Nachrichten parallel an mehrere Webhooks zu
+verteilen - die Gesamtdauer liegt dann nahe am langsamsten Kanal statt an der
+Summe aller Kanäle.
+"""
+
+import io
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5   # Sekunden, verdoppelt sich pro Versuch
+BACKOFF_MAX = 30.0
+REQUEST_TIMEOUT = 15
+POOL_SIZE = 16
+MAX_FANOUT_WORKERS = 8
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Prozessweite Session mit Connection-Pool (Keep-Alive zu discord.com)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+class RateLimitBucket:
+    """Rate-Limit-Zustand eines Webhooks laut Discord-Headern"""
+
+    def __init__(self):
+        self.remaining = None
+        self.reset_at = 0.0
+        self.lock = threading.Lock()
+
+    def delay(self):
+        """Sekunden bis zum nächsten erlaubten Request"""
+        if self.remaining is None or self.remaining > 0:
+            return 0.0
+        return max(self.reset_at - time.monotonic(), 0.0)
+
+    def update(self, headers):
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        try:
+            if remaining is not None:
+                self.remaining = int(remaining)
+            if reset_after is not None:
+                self.reset_at = time.monotonic() + float(reset_after)
+        except ValueError:
+            pass
+
+    def block(self, seconds):
+        """Nach einem 429: bis `seconds` nichts mehr senden"""
+        self.remaining = 0
+        self.reset_at = max(self.reset_at, time.monotonic() + seconds)
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+def get_bucket(webhook_url):
+    """Rate-Limit-Bucket pro Webhook-URL (von allen Dispatchern geteilt)"""
+    with _buckets_lock:
+        bucket = _buckets.get(webhook_url)
+        if bucket is None:
+            bucket = _buckets[webhook_url] = RateLimitBucket()
+    return bucket
+
+class DeliveryOutcome:
+    """Ergebnis einer einzelnen Nachricht"""
+
+    __slots__ = ('label', 'status', 'attempts', 'error', 'elapsed')
+
+    def __init__(self, label, status=None, attempts=0, error=None, elapsed=0.0):
+        self.label = label
+        self.status = status
+        self.attempts = attempts
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.status in (200, 204)
+
+    def as_dict(self):
+        return {
+            'label': self.label,
+            'ok': self.ok,
+            'status': self.status,
+            'attempts': self.attempts,
+            'error': self.error,
+            'elapsed': round(self.elapsed, 3)
+        }
+
+class MultipartBody:
+    """multipart/form-data als lesbarer Stream mit bekannter Länge
+
+    `form` sind einfache Felder, `files` wie bei requests:
+    {feld: (dateiname, inhalt, mime)} mit Bytes oder Datei-Objekt als Inhalt
+    (BytesIO, SpooledTemporaryFile, ...). Bytes werden per memoryview gelesen,
+    Datei-Objekte ab ihrer aktuellen Position. requests sendet den Body
+    blockweise mit Content-Length statt ihn komplett im Speicher aufzubauen.
+    """
+
+    def __init__(self, form=None, files=None):
+        boundary = uuid.uuid4().hex
+        self.content_type = f'multipart/form-data; boundary={boundary}'
+        self._parts = deque()
+        self._length = 0
+
+        for name, value in (form or {}).items():
+            self._add(f'--{boundary}\r\nContent-Disposition: form-data; name="{quote(name)}"\r\n\r\n'.encode('utf-8'))
+            self._add(str(value).encode('utf-8') + b'\r\n')
+        for name, value in (files or {}).items():
+            if not isinstance(value, tuple):
+                value = (name, value)
+            filename, content = value[0], value[1]
+            mime = value[2] if len(value) > 2 and value[2] else 'application/octet-stream'
+            self._add((
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{quote(name)}"; filename="{quote(filename)}"\r\n'
+                f'Content-Type: {mime}\r\n\r\n'
+            ).encode('utf-8'))
+            self._add(content)
+            self._add(b'\r\n')
+        self._add(f'--{boundary}--\r\n'.encode('utf-8'))
+
+    def _add(self, part):
+        if isinstance(part, (bytes, bytearray, memoryview)):
+            part = memoryview(part)
+            self._length += part.nbytes
+        else:
+            position = part.tell()
+            self._length += part.seek(0, os.SEEK_END) - position
+            part.seek(position)
+        self._parts.append(part)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        while True:
+            block = self.read(64 * 1024)
+            if not block:
+                return
+            yield block
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._length
+        out = io.BytesIO()
+        while size > 0 and self._parts:
+            part = self._parts[0]
+            if isinstance(part, memoryview):
+                block = part[:size]
+                if block.nbytes < part.nbytes:
+                    self._parts[0] = part[block.nbytes:]
+                else:
+                    self._parts.popleft()
+            else:
+                block = part.read(size)
+                if not block:
+                    self._parts.popleft()
+                    continue
+            out.write(block)
+            size -= len(block) if isinstance(block, bytes) else block.nbytes
+        return out.getvalue()
+
+def quote(value):
+    """Anführungszeichen und Zeilenumbrüche in Header-Parametern maskieren"""
+    return str(value).replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+def retry_after(response):
+    """Wartezeit aus einer 429-Antwort (JSON-Body `retry_after` oder Retry-After-Header)"""
+    try:
+        return float(response.json()['retry_after'])
+    except (ValueError, KeyError, TypeError):
+        pass
+    try:
+        return float(response.headers.get('Retry-After', 1.0))
+    except ValueError:
+        return 1.0
+
+class WebhookDispatcher:
+    """Warteschlange für einen Webhook: enqueue() sammelt, flush() sendet der Reihe nach"""
+
+    def __init__(self, webhook_url, session=None, max_retries=MAX_RETRIES, timeout=REQUEST_TIMEOUT):
+        self.webhook_url = webhook_url
+        self.session = session or get_session()
+        self.bucket = get_bucket(webhook_url)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._queue = deque()
+
+    def enqueue(self, payload=None, form=None, files=None, label=None):
+        """Reiht eine Nachricht ein: `payload` als JSON oder `form` + `files` als Multipart"""
+        self._queue.append((payload, form, files, label or f"Nachricht {len(self._queue) + 1}"))
+
+    def flush(self):
+        """Sendet alle eingereihten Nachrichten und gibt ihre DeliveryOutcomes zurück"""
+        outcomes = []
+        while self._queue:
+            payload, form, files, label = self._queue.popleft()
+            outcomes.append(self.send(payload, form=form, files=files, label=label))
+        return outcomes
+
+    def send(self, payload=None, form=None, files=None, label='Nachricht'):
+        """Sendet eine Nachricht mit Rate-Limit-Pacing und Wiederholungen"""
+        outcome = DeliveryOutcome(label)
+        started = time.monotonic()
+        bucket = self.bucket
+
+        # Pro Webhook immer nur ein Request gleichzeitig, damit die Header-Werte stimmen
+        with bucket.lock:
+            while outcome.attempts <= self.max_retries:
+                wait = bucket.delay()
+                if wait > 0:
+                    time.sleep(wait)
+
+                outcome.attempts += 1
+                rewind(files)
+                try:
+                    if files is not None:
+                        body = MultipartBody(form, files)
+                        response = self.session.post(self.webhook_url, data=body, headers={'Content-Type': body.content_type}, timeout=self.timeout)
+                    else:
+                        response = self.session.post(self.webhook_url, json=payload, timeout=self.timeout)
+                except requests.exceptions.RequestException as e:
+                    outcome.status, outcome.error = None, str(e)
+                    if outcome.attempts <= self.max_retries:
+                        time.sleep(backoff(outcome.attempts))
+                    continue
+
+                bucket.update(response.headers)
+                outcome.status = response.status_code
+
+                if response.status_code == 429:
+                    delay = retry_after(response)
+                    bucket.block(delay)
+                    outcome.error = f"429 Rate-Limit, erneut in {delay:.2f}s"
+                    logger.warning(f"⏳ {label}: {outcome.error}")
+                    continue
+                if response.status_code >= 500:
+                    outcome.error = f"{response.status_code} Serverfehler"
+                    if outcome.attempts <= self.max_retries:
+                        time.sleep(backoff(outcome.attempts))
+                    continue
+
+                outcome.error = None if outcome.ok else f"{response.status_code} - {response.text[:200]}"
+                break
+
+        outcome.elapsed = time.monotonic() - started
+        if outcome.ok:
+            logger.info(f"✅ {label} gesendet ({outcome.attempts} Versuch(e))")
+        else:
+            logger.error(f"❌ {label} fehlgeschlagen: {outcome.error}")
+        return outcome
+
+def _after_fork():
+    """Im Kindprozess: Session (Sockets des Elternprozesses) verwerfen, Locks neu anlegen"""
+    global _session, _session_lock, _buckets_lock
+    _session = None
+    _session_lock = threading.Lock()
+    _buckets_lock = threading.Lock()
+    for bucket in _buckets.values():
+        bucket.lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+def backoff(attempt):
+    return min(BACKOFF_BASE * (2 ** (attempt - 1)), BACKOFF_MAX)
+
+def rewind(files):
+    """Datei-Objekte für einen erneuten Versuch an den Anfang setzen"""
+    if not files:
+        return
+    for value in files.values():
+        fileobj = value[1] if isinstance(value, tuple) else value
+        if hasattr(fileobj, 'seek'):
+            fileobj.seek(0)
+
+def summarize(outcomes):
+    """Kurzfassung für Logs/Reports: (Anzahl ok, Anzahl gesamt)"""
+    return sum(1 for outcome in outcomes if outcome.ok), len(outcomes)
+
+def webhook_label(webhook_url):
+    """Webhook-URL ohne Token für Logs und Reports (".../webhooks/<id>")"""
+    parts = webhook_url.rstrip('/').split('/')
+    if 'webhooks' in parts:
+        index = parts.index('webhooks')
+        return '.../webhooks/' + '/'.join(parts[index + 1:index + 2])
+    return webhook_url
+
+class FanOutReport:
+    """Gesamtergebnis eines Versands an mehrere Webhooks"""
+
+    def __init__(self, outcomes, elapsed):
+        self.outcomes = outcomes   # {webhook_url: [DeliveryOutcome, ...]}
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return all(outcome.ok for outcomes in self.outcomes.values() for outcome in outcomes)
+
+    def failed_webhooks(self):
+        return [url for url, outcomes in self.outcomes.items()
+                if not all(outcome.ok for outcome in outcomes)]
+
+    def summary(self):
+        """(Anzahl ok, Anzahl gesamt) über alle Webhooks und Nachrichten"""
+        sent = total = 0
+        for outcomes in self.outcomes.values():
+            ok, count = summarize(outcomes)
+            sent += ok
+            total += count
+        return sent, total
+
+    def as_dict(self):
+        sent, total = self.summary()
+        return {
+            'ok': self.ok,
+            'sent': sent,
+            'total': total,
+            'elapsed': round(self.elapsed, 3),
+            'slowest': round(max((sum(o.elapsed for o in outcomes) for outcomes in self.outcomes.values()), default=0.0), 3),
+            'webhooks': [{
+                'webhook': webhook_label(url),
+                'ok': all(outcome.ok for outcome in outcomes),
+                'messages': [outcome.as_dict() for outcome in outcomes]
+            } for url, outcomes in self.outcomes.items()]
+        }
+
+def fan_out(webhook_urls, messages, max_workers=MAX_FANOUT_WORKERS, session=None):
+    """Sendet dieselben Nachrichten parallel an mehrere Webhooks.
+
+    `messages` ist eine Liste von (payload, form, files, label) wie bei
+    WebhookDispatcher.enqueue(). Die Nachrichten werden einmal erzeugt und nur
+    geteilt, deshalb müssen Dateien als Bytes statt als Datei-Objekte übergeben
+    werden. Pro Webhook läuft ein eigener Dispatcher (eigener Rate-Limit-Bucket,
+    Reihenfolge bleibt erhalten), die Webhooks selbst laufen im Thread-Pool.
+    """
+    urls = list(dict.fromkeys(url for url in webhook_urls if url))
+    started = time.monotonic()
+    if not urls:
+        return FanOutReport({}, 0.0)
+
+    def deliver(url):
+        dispatcher = WebhookDispatcher(url, session=session)
+        for payload, form, files, label in messages:
+            dispatcher.enqueue(payload, form=form, files=files, label=f"{label} → {webhook_label(url)}")
+        return dispatcher.flush()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as executor:
+        results = list(executor.map(deliver, urls))
+
+    report = FanOutReport(dict(zip(urls, results)), time.monotonic() - started)
+    sent, total = report.summary()
+    logger.info(f"📡 Fan-out an {len(urls)} Webhooks: {sent}/{total} Nachrichten in {report.elapsed:.2f}s")
+    return report
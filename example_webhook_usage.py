@@ -124,12 +124,18 @@ def beispiel_5_mehrere_webhooks():
         print("Setzen Sie DISCORD_WEBHOOK_URL_1, DISCORD_WEBHOOK_URL_2, etc.")
         return
     
-    for i, url in enumerate(webhooks, 1):
-        print(f"  → Sende an Webhook {i}...")
-        webhook = ProximaDiscordWebhook(url)
-        webhook.send_to_discord(use_embed=True)
+    # Nachricht einmal erzeugen, dann parallel an alle Webhooks verteilen
+    webhook = ProximaDiscordWebhook(webhooks[0])
+    report = webhook.send_to_webhooks(webhooks, use_embed=True)
+    if report is None:
+        print("❌ Keine Daten verfügbar!\n")
+        return
+    
+    for entry in report.as_dict()['webhooks']:
+        print(f"  → {entry['webhook']}: {'✅' if entry['ok'] else '❌'}")
     
-    print(f"✅ An {len(webhooks)} Webhooks gesendet!\n")
+    sent, total = report.summary()
+    print(f"✅ {sent}/{total} Nachrichten an {len(report.outcomes)} Webhooks gesendet ({report.elapsed:.2f}s)\n")
 
 
 def beispiel_6_bedingtes_senden():
@@ -0,0 +1,42 @@
+"""
+Gunicorn-Konfiguration für Spacenations Tools
+Start: gunicorn -c gunicorn.conf.py app:application
+"""
+
+import os
+import multiprocessing
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.getenv('SERVER_THREADS', 8))
+worker_class = 'gthread'
+timeout = 60
+accesslog = None  # app.py loggt Requests selbst
+
+_metrics_dir = None
+
+def on_starting(server):
+    """Im Master vor dem ersten fork: gemeinsames Verzeichnis für die Metriken aller Worker"""
+    global _metrics_dir
+    if not os.getenv('METRICS_DIR'):
+        _metrics_dir = os.environ['METRICS_DIR'] = tempfile.mkdtemp(prefix='spacenations-metrics-')
+
+def post_fork(server, worker):
+    """Jeder Worker: Asset-Index, Metrik-Export und Bewerbung um den Proxima-Scheduler
+    (genau ein Worker führt ihn aus, siehe app.start_proxima_scheduler)"""
+    from app import start_worker_services
+    start_worker_services()
+
+def worker_exit(server, worker):
+    """Letzten Metrik-Stand des Workers sichern und wartende Access-Log-Zeilen schreiben"""
+    from metrics import registry
+    from app import access_log
+    registry.flush()
+    if access_log is not None:
+        access_log.stop()
+
+def on_exit(server):
+    if _metrics_dir:
+        shutil.rmtree(_metrics_dir, ignore_errors=True)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Metriken für Spacenations Tools
+Prometheus-kompatible Counter und Histogramme mit minimalem Overhead
+
+Jeder Thread schreibt in sein eigenes Dict (kein Lock im Hot Path);
+erst beim Abruf von /api/metrics werden die Shards aller Threads summiert.
+Labels werden als fertig formatierter String übergeben ('route="api"'),
+da Strings ihren Hash cachen und der Dict-Zugriff so billig bleibt.
+
+Mehrere Prozesse (prefork/gunicorn): mit enable_multiprocess(verzeichnis)
+schreibt jeder Worker seine Werte regelmäßig nach `<verzeichnis>/<pid>.json`,
+render() summiert die Dateien aller (auch beendeter) Worker. Gauges bleiben
+pro Prozess.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 1.0))  # Sekunden
+
+# Standard-Buckets für Latenzen in Sekunden
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DURATION_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+class MetricsRegistry:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+        self._metrics = {}  # name -> (typ, hilfe, buckets)
+        self._gauges = {}   # name -> Callable, wird beim Abruf ausgewertet
+        self._request_shards = []
+        self._request_keys = {}  # (route, status) -> Schlüssel der drei HTTP-Metriken
+        self._directory = None
+        self._flusher_pid = None
+
+    def after_fork(self):
+        """Im Kindprozess: Locks neu anlegen und die Werte des Elternprozesses verwerfen"""
+        self._local = threading.local()
+        self._shards = []
+        self._request_shards = []
+        self._lock = threading.Lock()
+        self._flusher_pid = None
+
+    def _shard(self):
+        """Das Dict des aktuellen Threads (wird beim ersten Zugriff registriert)"""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def counter(self, name, help_text):
+        self._metrics[name] = ('counter', help_text, None)
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self._metrics[name] = ('histogram', help_text, tuple(buckets))
+
+    def gauge(self, name, help_text, callback):
+        """Registriert einen Gauge, dessen Wert beim Abruf über `callback()` ermittelt wird"""
+        self._metrics[name] = ('gauge', help_text, None)
+        self._gauges[name] = callback
+
+    def inc(self, name, labels='', value=1):
+        """Erhöht einen Counter; `labels` ist bereits formatiert, z.B. 'route="api",status="200"'"""
+        shard = self._shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + value
+
+    def _request_shard(self):
+        """Request-Zähler des aktuellen Threads: (route, status) -> [Anzahl, Bytes, Latenz-Buckets..., Summe, Anzahl]"""
+        cells = {}
+        with self._lock:
+            self._request_shards.append(cells)
+        self._local.requests = cells
+        return cells
+
+    def request_keys(self, route, status):
+        """Schlüssel der drei HTTP-Metriken für (Routen-Klasse, Status), einmal formatiert"""
+        keys = self._request_keys.get((route, status))
+        if keys is None:
+            route_label = f'route="{route}"'
+            keys = self._request_keys[(route, status)] = (
+                ('http_requests_total', f'{route_label},status="{status}"'),
+                ('http_response_bytes_total', route_label),
+                ('http_request_duration_seconds', route_label)
+            )
+        return keys
+
+    def record_request(self, route, status, size, duration):
+        """Hot Path pro HTTP-Request: Counter, Bytes und Latenz in einer Liste pro (Route, Status).
+
+        Labels werden erst in collect() formatiert (request_keys()), hier gibt es nur
+        einen Dict-Zugriff und Additionen auf einer Liste.
+        """
+        try:
+            cells = self._local.requests
+        except AttributeError:
+            cells = self._request_shard()
+        cell = cells.get((route, status))
+        if cell is None:
+            cell = cells[(route, status)] = [0] * (len(LATENCY_BUCKETS) + 5)
+        cell[0] += 1
+        cell[1] += size
+        cell[2 + bisect_left(LATENCY_BUCKETS, duration)] += 1
+        cell[-2] += duration
+        cell[-1] += 1
+
+    def observe(self, name, value, labels=''):
+        """Trägt einen Messwert in ein Histogramm ein"""
+        shard = self._shard()
+        key = (name, labels)
+        buckets = self._metrics[name][2]
+        values = shard.get(key)
+        if values is None:
+            # Bucket-Zähler (+Inf als letzter), danach Summe und Anzahl
+            values = shard[key] = [0] * (len(buckets) + 3)
+        values[bisect_left(buckets, value)] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def collect(self):
+        """Summiert die Shards aller Threads: {(name, labels): Wert oder Liste}"""
+        with self._lock:
+            shards = list(self._shards)
+            request_shards = list(self._request_shards)
+
+        totals = {}
+        for shard in shards:
+            for key, value in list(shard.items()):
+                merge(totals, key, value)
+        for cells in request_shards:
+            for (route, status), cell in list(cells.items()):
+                requests_key, bytes_key, duration_key = self.request_keys(route, status)
+                cell = list(cell)
+                merge(totals, requests_key, cell[0])
+                merge(totals, bytes_key, cell[1])
+                merge(totals, duration_key, cell[2:])
+        return totals
+
+    def enable_multiprocess(self, directory):
+        """Werte über Prozessgrenzen hinweg summieren (siehe Modul-Docstring)"""
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+
+    def start_flusher(self, interval=METRICS_FLUSH_INTERVAL):
+        """Startet im aktuellen Prozess den Thread, der die eigenen Werte regelmäßig schreibt"""
+        if self._directory is None or self._flusher_pid == os.getpid():
+            return
+        self._flusher_pid = os.getpid()
+
+        def flusher():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error(f"❌ Metriken konnten nicht geschrieben werden: {e}")
+
+        threading.Thread(target=flusher, daemon=True, name='metrics-flush').start()
+
+    def flush(self):
+        """Schreibt die Werte dieses Prozesses atomar nach <verzeichnis>/<pid>.json"""
+        if self._directory is None:
+            return
+        path = os.path.join(self._directory, f'{os.getpid()}.json')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump([[name, labels, value] for (name, labels), value in self.collect().items()], f)
+        os.replace(tmp_path, path)
+
+    def collect_all(self):
+        """Eigene Werte plus die zuletzt geschriebenen Werte aller anderen Prozesse"""
+        totals = self.collect()
+        if self._directory is None:
+            return totals
+        own = f'{os.getpid()}.json'
+        try:
+            filenames = os.listdir(self._directory)
+        except OSError:
+            return totals
+        for filename in filenames:
+            if filename == own or not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self._directory, filename)) as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in entries:
+                merge(totals, (name, labels), value)
+        return totals
+
+    def render(self):
+        """Gibt alle Metriken im Prometheus-Textformat zurück"""
+        totals = self.collect_all()
+        by_name = {}
+        for (name, labels), value in totals.items():
+            by_name.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name, (typ, help_text, buckets) in self._metrics.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {typ}")
+
+            if typ == 'gauge':
+                try:
+                    lines.append(f"{name} {self._gauges[name]()}")
+                except Exception:
+                    pass
+                continue
+
+            for labels, value in sorted(by_name.get(name, []), key=lambda item: item[0]):
+                if typ == 'counter':
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+                    continue
+
+                cumulative = 0
+                for bound, count in zip(buckets + ('+Inf',), value):
+                    cumulative += count
+                    bucket_labels = f'{labels},le="{bound}"' if labels else f'le="{bound}"'
+                    lines.append(f"{name}_bucket{format_labels(bucket_labels)} {cumulative}")
+                lines.append(f"{name}_sum{format_labels(labels)} {value[-2]}")
+                lines.append(f"{name}_count{format_labels(labels)} {value[-1]}")
+
+        return '\n'.join(lines) + '\n'
+
+def merge(totals, key, value):
+    """Addiert einen Counter-Wert oder eine Histogramm-Liste in `totals`"""
+    if isinstance(value, list):
+        current = totals.get(key)
+        if current is None:
+            totals[key] = list(value)
+        else:
+            for i, v in enumerate(value):
+                current[i] += v
+    else:
+        totals[key] = totals.get(key, 0) + value
+
+def format_labels(labels):
+    return '{' + labels + '}' if labels else ''
+
+# Prozessweite Registry
+registry = MetricsRegistry()
+if METRICS_DIR:
+    registry.enable_multiprocess(METRICS_DIR)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=registry.after_fork)
+
+registry.counter('http_requests_total', 'HTTP-Requests nach Routen-Klasse und Statuscode')
+registry.counter('http_response_bytes_total', 'Gesendete Body-Bytes nach Routen-Klasse')
+registry.histogram('http_request_duration_seconds', 'Bearbeitungszeit pro Request nach Routen-Klasse')
+registry.counter('asset_cache_requests_total', 'Zugriffe auf den Static-Asset-Cache (hit/miss)')
+registry.histogram('proxima_scheduler_run_seconds', 'Laufzeit eines Proxima-Scheduler-Durchlaufs', DURATION_BUCKETS)
+registry.counter('proxima_fetch_total', 'Abrufe der Proxima-API nach Ergebnis')
+registry.counter('proxima_update_checks_total', 'Update-Prüfungen des Auto-Updaters nach Ergebnis')
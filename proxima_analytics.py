@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Zeitreihen-Auswertungen über die ProximaDB-Historie
+
+- Punkte-Verlauf pro Planet über alle Snapshots (inkl. Differenz zum Vorgänger)
+- Wochen-Statistiken (Anzahl, Summe, Durchschnitt, Min/Max, Median, 90. Perzentil)
+- Lebensdauer pro Planet vom ersten Abruf bis zum Löschdatum (deleteOn)
+
+Gerechnet wird per Window-Function-SQL in SQLite. Die Ergebnisse werden pro
+Snapshot-ID gecacht: erst ein neuer Abruf (neuer Snapshot) verwirft den Cache.
+"""
+
+import os
+import threading
+
+import proxima_db
+
+VIEWS = ('weekly', 'lifetimes', 'trajectory')
+MAX_TRAJECTORY_POINTS = 100  # Punkte (neueste Snapshots) pro Planet im Verlauf
+
+TRAJECTORY_QUERY = '''
+    SELECT p.name, p.snapshot_id, s.fetched_at, p.score,
+           p.score - LAG(p.score) OVER (PARTITION BY p.name ORDER BY p.snapshot_id) AS delta
+    FROM planets p
+    JOIN snapshots s ON s.id = p.snapshot_id
+    {where}
+    ORDER BY p.name, p.snapshot_id
+'''
+
+# Perzentile nach Nearest-Rank: Rang = ceil(p/100 * n)
+WEEKLY_QUERY = '''
+    WITH ranked AS (
+        SELECT week_number, score,
+               ROW_NUMBER() OVER (PARTITION BY week_number ORDER BY score) AS rn,
+               COUNT(*) OVER (PARTITION BY week_number) AS n
+        FROM planets_latest
+    )
+    SELECT week_number,
+           COUNT(*),
+           SUM(score),
+           AVG(score),
+           MIN(score),
+           MAX(score),
+           MAX(CASE WHEN rn = (50 * n + 99) / 100 THEN score END),
+           MAX(CASE WHEN rn = (90 * n + 99) / 100 THEN score END)
+    FROM ranked
+    GROUP BY week_number
+    ORDER BY week_number
+'''
+
+LIFETIME_QUERY = '''
+    SELECT l.name, l.week_number, f.first_seen, l.delete_on,
+           CAST(ROUND((julianday(l.delete_on) - julianday(f.first_seen)) * 86400) AS INTEGER)
+    FROM planets_latest l
+    JOIN (
+        SELECT name, MIN(created_at) AS first_seen
+        FROM planets
+        GROUP BY name
+    ) f ON f.name = l.name
+    ORDER BY l.week_number DESC, l.name
+'''
+
+class ProximaAnalytics:
+    def __init__(self, db_path='proxima.db'):
+        self.db = proxima_db.get_pool(db_path)
+        self._cache = {}
+        self._snapshot_id = None
+        self._lock = threading.Lock()
+
+    def _cached(self, key, compute):
+        """Ergebnis aus dem Cache, solange kein neuer Snapshot gespeichert wurde"""
+        conn = self.db.reader()
+        snapshot_id = conn.execute('SELECT MAX(id) FROM snapshots').fetchone()[0]
+        with self._lock:
+            if snapshot_id != self._snapshot_id:
+                self._cache = {}
+                self._snapshot_id = snapshot_id
+            cache = self._cache
+            if key in cache:
+                return cache[key]
+
+        result = compute(conn)
+        with self._lock:
+            if self._snapshot_id == snapshot_id:
+                cache[key] = result
+        return result
+
+    def snapshot_id(self):
+        """ID des neuesten Snapshots (Grundlage des Caches)"""
+        return self.db.reader().execute('SELECT MAX(id) FROM snapshots').fetchone()[0]
+
+    def trajectories(self, name=None, limit=MAX_TRAJECTORY_POINTS):
+        """Punkte-Verlauf: {name: [{'snapshotId', 'fetchedAt', 'score', 'delta'}, ...]}
+
+        Je Planet nur die neuesten `limit` Punkte. Gecacht wird nur der Verlauf
+        aller Planeten; die Abfrage für einen einzelnen Namen läuft direkt gegen
+        die Datenbank, damit beliebige Namen den Cache nicht wachsen lassen.
+        """
+        def compute(conn):
+            if name is None:
+                rows = conn.execute(TRAJECTORY_QUERY.format(where=''))
+            else:
+                rows = conn.execute(TRAJECTORY_QUERY.format(where='WHERE p.name = ?'), (name,))
+            result = {}
+            for planet, snapshot_id, fetched_at, score, delta in rows:
+                result.setdefault(planet, []).append({
+                    'snapshotId': snapshot_id,
+                    'fetchedAt': fetched_at,
+                    'score': score,
+                    'delta': delta
+                })
+            return result
+        if name is None:
+            result = self._cached(('trajectory',), compute)
+        else:
+            result = compute(self.db.reader())
+        return {planet: points[-limit:] for planet, points in result.items()}
+
+    def weekly_aggregates(self):
+        """Statistiken je Woche über den aktuellen Stand aller Planeten"""
+        def compute(conn):
+            return [{
+                'weekNumber': week,
+                'count': count,
+                'sum': total,
+                'avg': round(avg, 1),
+                'min': low,
+                'max': high,
+                'p50': p50,
+                'p90': p90
+            } for week, count, total, avg, low, high, p50, p90 in conn.execute(WEEKLY_QUERY)]
+        return self._cached(('weekly',), compute)
+
+    def lifetimes(self):
+        """Lebensdauer je Planet in Sekunden vom ersten Abruf bis deleteOn"""
+        def compute(conn):
+            return [{
+                'name': name,
+                'weekNumber': week,
+                'firstSeen': first_seen,
+                'deleteOn': delete_on,
+                'lifetimeSeconds': lifetime
+            } for name, week, first_seen, delete_on, lifetime in conn.execute(LIFETIME_QUERY)]
+        return self._cached(('lifetimes',), compute)
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+def get_analytics(db_path='proxima.db'):
+    """Prozessweite ProximaAnalytics-Instanz (teilt sich den Cache) für die Datenbankdatei"""
+    with _instances_lock:
+        analytics = _instances.get(db_path)
+        if analytics is None:
+            analytics = _instances[db_path] = ProximaAnalytics(db_path)
+    return analytics
+
+def _after_fork():
+    global _instances_lock
+    _instances_lock = threading.Lock()
+    for analytics in _instances.values():
+        analytics._lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
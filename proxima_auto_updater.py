@@ -5,6 +5,7 @@ Proxima Auto-Updater
 und aktualisiert proxima_data.json bei neuen Daten
 """
 
+import hashlib
 import json
 import time
 import logging
@@ -12,6 +13,11 @@ import requests
 from datetime import datetime, time as dt_time
 from pathlib import Path
 
+import proxima_db
+from metrics import registry as metrics
+from proxima_client import API_URL, get_client
+from proxima_publish import atomic_write, publish_json
+
 # Logging konfigurieren
 logging.basicConfig(
     level=logging.INFO,
@@ -24,8 +30,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Konfiguration
-API_URL = 'https://beta2.game.spacenations.eu/api/proxima'
 JSON_FILE = Path(__file__).parent / 'proxima_data.json'
+DIGEST_FILE = JSON_FILE.with_name(JSON_FILE.name + '.digest')
+DB_FILE = Path(__file__).parent / 'proxima.db'
 CHECK_INTERVAL = 300  # 5 Minuten in Sekunden
 START_HOUR = 17  # 17 Uhr
 END_HOUR = 23    # 23 Uhr
@@ -35,13 +42,19 @@ def fetch_api_data():
     """Lädt Daten von der Beta2 API"""
     try:
         logger.info(f"🔍 Rufe API ab: {API_URL}")
-        response = requests.get(API_URL, timeout=15)
-        response.raise_for_status()
-        data = response.json()
-        logger.info(f"✅ API-Daten geladen: {len(data)} Planeten")
+        result = get_client(API_URL).fetch(timeout=15)
+        data = result.data
+        if result.changed:
+            logger.info(f"✅ API-Daten geladen: {len(data)} Planeten")
+            metrics.inc('proxima_fetch_total', 'result="success"')
+        else:
+            # 304 oder identische Bytes: kein erneutes JSON-Parsing
+            logger.info(f"✓ API-Daten unverändert: {len(data)} Planeten")
+            metrics.inc('proxima_fetch_total', 'result="not_modified"')
         return data
     except requests.exceptions.RequestException as e:
         logger.error(f"❌ API-Fehler: {e}")
+        metrics.inc('proxima_fetch_total', 'result="error"')
         return None
 
 def load_current_data():
@@ -60,18 +73,78 @@ def load_current_data():
         return []
 
 def save_data(data):
-    """Speichert Daten in proxima_data.json"""
+    """Speichert Daten atomar in proxima_data.json (kompakt, plus .gz/.br-Varianten)"""
     try:
-        with open(JSON_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        publish_json(JSON_FILE, data)
         logger.info(f"💾 Daten gespeichert: {len(data)} Planeten")
         return True
     except Exception as e:
         logger.error(f"❌ Fehler beim Speichern: {e}")
         return False
 
+def record_changes(data):
+    """Legt die neuen Daten als Snapshot in ProximaDB ab; der Änderungs-Feed wird dabei berechnet"""
+    try:
+        pool = proxima_db.get_pool(str(DB_FILE))
+        pool.ensure_schema()
+        rows = map(proxima_db.api_row, data)
+        with pool.write() as conn:
+            snapshot_id, _, changes = proxima_db.record_snapshot(conn.cursor(), rows, datetime.now().isoformat())
+        counts = {'added': 0, 'removed': 0, 'changed': 0}
+        for _, change, _, _ in changes:
+            counts[change] += 1
+        logger.info(f"🧾 Snapshot {snapshot_id}: +{counts['added']} neu, "
+                    f"-{counts['removed']} entfernt, ~{counts['changed']} geändert")
+        return changes
+    except Exception as e:
+        logger.error(f"❌ Änderungen konnten nicht in ProximaDB gespeichert werden: {e}")
+        return None
+
+def payload_digest(data):
+    """Kanonischer Digest der Planetendaten (eine kompakte Serialisierung, ein Hash)"""
+    payload = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+# Digest der zuletzt übernommenen Daten samt Signatur (mtime, Größe) von proxima_data.json
+_accepted = (None, None)
+
+def json_file_signature():
+    try:
+        st = JSON_FILE.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+def remember_digest(digest):
+    """Merkt sich den Digest der übernommenen Daten (im Speicher und neben der JSON-Datei)"""
+    global _accepted
+    signature = json_file_signature()
+    _accepted = (signature, digest)
+    try:
+        atomic_write(DIGEST_FILE, json.dumps({'digest': digest, 'file': signature}).encode())
+    except OSError as e:
+        logger.warning(f"⚠️ Digest konnte nicht gespeichert werden: {e}")
+
+def accepted_digest():
+    """Digest der aktuellen proxima_data.json, falls bekannt (None nach fremden Änderungen an der Datei)"""
+    global _accepted
+    signature = json_file_signature()
+    if signature is None:
+        return None
+    if _accepted[0] == signature:
+        return _accepted[1]
+    try:
+        with open(DIGEST_FILE, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        if stored.get('file') == signature:
+            _accepted = (signature, stored.get('digest'))
+            return _accepted[1]
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
 def data_has_changed(old_data, new_data):
-    """Prüft ob sich die Daten geändert haben"""
+    """Prüft planetengenau, ob sich die Daten geändert haben (nur nötig, wenn der Digest abweicht)"""
     if len(old_data) != len(new_data):
         return True
     
@@ -98,12 +171,21 @@ def check_and_update():
         now = datetime.now()
         logger.info(f"⏰ Außerhalb des Update-Zeitfensters (Mittwoch 17-23 Uhr)")
         logger.info(f"   Aktuell: {now.strftime('%A %H:%M Uhr')}")
+        metrics.inc('proxima_update_checks_total', 'outcome="skipped"')
         return False
     
     # API-Daten laden
     new_data = fetch_api_data()
     if not new_data:
         logger.warning("⚠️ Keine API-Daten verfügbar")
+        metrics.inc('proxima_update_checks_total', 'outcome="no_data"')
+        return False
+    
+    # Schneller Pfad: gleicher Digest wie die zuletzt übernommenen Daten
+    new_digest = payload_digest(new_data)
+    if new_digest == accepted_digest():
+        logger.info("✓ Keine Änderungen - Daten sind aktuell")
+        metrics.inc('proxima_update_checks_total', 'outcome="unchanged"')
         return False
     
     # Aktuelle Daten laden
@@ -117,13 +199,21 @@ def check_and_update():
         
         # Speichern
         if save_data(new_data):
+            remember_digest(new_digest)
+            record_changes(new_data)
             logger.info("✅ Update erfolgreich!")
+            metrics.inc('proxima_update_checks_total', 'outcome="updated"')
             return True
         else:
             logger.error("❌ Update fehlgeschlagen!")
+            metrics.inc('proxima_update_checks_total', 'outcome="failed"')
             return False
     else:
+        # Inhaltlich gleich (z.B. nur andere Reihenfolge): Digest für die nächsten Prüfungen merken
+        if current_data:
+            remember_digest(new_digest)
         logger.info("✓ Keine Änderungen - Daten sind aktuell")
+        metrics.inc('proxima_update_checks_total', 'outcome="unchanged"')
         return False
 
 def run_continuous():
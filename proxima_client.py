@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Gemeinsamer HTTP-Client für die Proxima-API
+Genutzt von ProximaFetcher und proxima_auto_updater
+
+- eine persistente requests.Session pro API-URL (Keep-Alive, Connection-Pool)
+- Revalidierung über ETag/If-Modified-Since, falls der Server sie liefert (304)
+- sind die Bytes unverändert, wird das JSON nicht erneut geparst
+"""
+
+import hashlib
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+API_URL = 'https://beta2.game.spacenations.eu/api/proxima'
+POOL_SIZE = 4
+
+class FetchResult:
+    """Ergebnis eines Abrufs: `data` sind die Planeten, `changed` ob sich der Inhalt geändert hat"""
+
+    __slots__ = ('data', 'changed', 'status', 'digest')
+
+    def __init__(self, data, changed, status, digest):
+        self.data = data
+        self.changed = changed
+        self.status = status
+        self.digest = digest
+
+class ProximaClient:
+    def __init__(self, url=API_URL):
+        self.url = url
+        self._open_session()
+        self._etag = None
+        self._last_modified = None
+        self._digest = None
+        self._data = None
+
+    def _open_session(self):
+        """Neue Session und neuer Lock (auch nach fork(): Sockets und Locks gehören dem Elternprozess)"""
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Accept': 'application/json'})
+        self._lock = threading.Lock()
+
+    def fetch(self, timeout=15):
+        """Lädt die Planeten; wirft requests.exceptions.RequestException bei Fehlern"""
+        with self._lock:
+            headers = {}
+            if self._data is not None:
+                if self._etag:
+                    headers['If-None-Match'] = self._etag
+                if self._last_modified:
+                    headers['If-Modified-Since'] = self._last_modified
+
+            response = self.session.get(self.url, headers=headers, timeout=timeout)
+            if response.status_code == 304 and self._data is not None:
+                logger.info("✓ API: 304 Not Modified")
+                return FetchResult(self._data, False, 304, self._digest)
+            response.raise_for_status()
+
+            body = response.content
+            digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+            if digest == self._digest:
+                self._remember_validators(response)
+                return FetchResult(self._data, False, response.status_code, digest)
+
+            # Validatoren und Digest erst übernehmen, wenn der Body geparst ist -
+            # sonst würde ein späteres 304 zu einem kaputten Body die alten Daten liefern
+            data = response.json()
+            self._remember_validators(response)
+            self._digest = digest
+            self._data = data
+            return FetchResult(data, True, response.status_code, digest)
+
+    def _remember_validators(self, response):
+        self._etag = response.headers.get('ETag')
+        self._last_modified = response.headers.get('Last-Modified')
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(url=API_URL):
+    """Prozessweiter ProximaClient für die angegebene URL"""
+    client = _clients.get(url)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(url)
+            if client is None:
+                client = _clients[url] = ProximaClient(url)
+    return client
+
+def _after_fork():
+    global _clients_lock
+    _clients_lock = threading.Lock()
+    for client in _clients.values():
+        client._open_session()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
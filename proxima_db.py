@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+ProximaDB Schema und Migrationen
+Gemeinsam genutzt von Fetcher, Discord-Webhook und Web-Server
+
+Schema (Version 2):
+- planets:        Historie, eine Zeile pro Planet und Abruf (wie bisher) + snapshot_id
+- snapshots:      ein Eintrag pro Abruf (fetched_at, Content-Hash, Anzahl)
+- planets_latest: jeweils neuester Stand pro Planet, wird beim Speichern gepflegt,
+                  damit "aktuelle Planeten" ein reiner Index-Lookup ist
+- planet_changes: Änderungen gegenüber dem vorherigen Snapshot (added/removed/changed)
+
+Verbindungen laufen über einen ConnectionPool pro Datenbankdatei (get_pool):
+je Thread eine Lese-Verbindung mit query_only, genau ein serialisierter Schreiber.
+Im WAL-Modus blockieren Leser (z.B. app.py) den wöchentlichen Schreiber nicht.
+
+Migration bestehender Datenbanken: python3 proxima_db.py migrate [proxima.db]
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from operator import itemgetter
+
+SCHEMA_VERSION = 2
+STATEMENT_CACHE_SIZE = 256  # vorbereitete Statements pro Verbindung
+BUSY_TIMEOUT = 30.0         # Sekunden, die auf Sperren gewartet wird
+
+PLANETS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS planets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        coordinates TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        delete_on TEXT NOT NULL,
+        week_number INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        snapshot_id INTEGER REFERENCES snapshots(id),
+        UNIQUE(name, created_at)
+    )
+'''
+
+SNAPSHOTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        fetched_at TEXT NOT NULL UNIQUE,
+        content_hash TEXT,
+        planet_count INTEGER NOT NULL DEFAULT 0
+    )
+'''
+
+PLANETS_LATEST_TABLE = '''
+    CREATE TABLE IF NOT EXISTS planets_latest (
+        name TEXT PRIMARY KEY,
+        coordinates TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        delete_on TEXT NOT NULL,
+        week_number INTEGER NOT NULL,
+        created_at TEXT NOT NULL,
+        snapshot_id INTEGER REFERENCES snapshots(id)
+    )
+'''
+
+PLANET_CHANGES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS planet_changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+        name TEXT NOT NULL,
+        change TEXT NOT NULL,
+        old_coordinates TEXT,
+        old_score INTEGER,
+        old_delete_on TEXT,
+        new_coordinates TEXT,
+        new_score INTEGER,
+        new_delete_on TEXT
+    )
+'''
+
+INDEXES = (
+    'CREATE INDEX IF NOT EXISTS idx_name ON planets(name)',
+    'CREATE INDEX IF NOT EXISTS idx_week ON planets(week_number)',
+    'CREATE INDEX IF NOT EXISTS idx_created ON planets(created_at)',
+    'CREATE INDEX IF NOT EXISTS idx_planets_snapshot ON planets(snapshot_id)',
+    'CREATE INDEX IF NOT EXISTS idx_latest_score ON planets_latest(score DESC)',
+    'CREATE INDEX IF NOT EXISTS idx_latest_week ON planets_latest(week_number)',
+    'CREATE INDEX IF NOT EXISTS idx_changes_snapshot ON planet_changes(snapshot_id)',
+)
+
+# Wochennummer aus dem Namen ('Proxima 10-1' -> 10) rechnet SQLite beim Einfügen,
+# statt extract_week_number() pro Planet in Python aufzurufen
+WEEK_NUMBER_SQL = "CASE WHEN INSTR(?1, ' ') > 0 THEN CAST(SUBSTR(?1, INSTR(?1, ' ') + 1) AS INTEGER) ELSE 0 END"
+
+INSERT_PLANET = f'''
+    INSERT OR REPLACE INTO planets
+    (name, coordinates, score, delete_on, week_number, created_at, snapshot_id)
+    VALUES (?1, ?2, ?3, ?4, {WEEK_NUMBER_SQL}, ?5, ?6)
+'''
+
+# (name, coordinates, score, delete_on) aus einem Planeten der Proxima-API, ohne Python-Schleife
+api_row = itemgetter('name', 'coordinates', 'score', 'deleteOn')
+
+UPSERT_LATEST = '''
+    INSERT INTO planets_latest (name, coordinates, score, delete_on, week_number, created_at, snapshot_id)
+    SELECT name, coordinates, score, delete_on, week_number, created_at, snapshot_id
+    FROM planets
+    WHERE snapshot_id = ?
+    ON CONFLICT(name) DO UPDATE SET
+        coordinates = excluded.coordinates,
+        score = excluded.score,
+        delete_on = excluded.delete_on,
+        week_number = excluded.week_number,
+        created_at = excluded.created_at,
+        snapshot_id = excluded.snapshot_id
+    WHERE excluded.created_at >= planets_latest.created_at
+'''
+
+INSERT_CHANGE = '''
+    INSERT INTO planet_changes
+    (snapshot_id, name, change, old_coordinates, old_score, old_delete_on,
+     new_coordinates, new_score, new_delete_on)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+MAX_CHANGE_SNAPSHOTS = 100  # Snapshots pro Abfrage des Änderungs-Feeds
+
+def column_names(cursor, table):
+    return {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+
+def init_schema(conn):
+    """Legt das Schema an bzw. migriert eine bestehende Datenbank auf SCHEMA_VERSION"""
+    cursor = conn.cursor()
+    version = cursor.execute('PRAGMA user_version').fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return False
+
+    cursor.execute(SNAPSHOTS_TABLE)
+    cursor.execute(PLANETS_TABLE)
+    cursor.execute(PLANETS_LATEST_TABLE)
+    cursor.execute(PLANET_CHANGES_TABLE)
+
+    if version < 1:
+        migrate_v1(cursor)
+    if version < 2:
+        migrate_v2(cursor)
+
+    for statement in INDEXES:
+        cursor.execute(statement)
+
+    cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    conn.commit()
+    return True
+
+def migrate_v1(cursor):
+    """Version 0 -> 1: snapshot_id nachrüsten, Snapshots und planets_latest aus der Historie aufbauen"""
+    if 'snapshot_id' not in column_names(cursor, 'planets'):
+        cursor.execute('ALTER TABLE planets ADD COLUMN snapshot_id INTEGER REFERENCES snapshots(id)')
+
+    # Jeder bisherige created_at-Zeitstempel entspricht einem Abruf
+    cursor.execute('''
+        INSERT OR IGNORE INTO snapshots (fetched_at, planet_count)
+        SELECT created_at, COUNT(*) FROM planets
+        WHERE snapshot_id IS NULL
+        GROUP BY created_at
+        ORDER BY created_at
+    ''')
+    cursor.execute('''
+        UPDATE planets
+        SET snapshot_id = (SELECT id FROM snapshots WHERE snapshots.fetched_at = planets.created_at)
+        WHERE snapshot_id IS NULL
+    ''')
+
+    snapshot_ids = [row[0] for row in cursor.execute('SELECT id FROM snapshots WHERE content_hash IS NULL')]
+    for snapshot_id in snapshot_ids:
+        rows = cursor.execute('''
+            SELECT name, coordinates, score, delete_on FROM planets
+            WHERE snapshot_id = ? ORDER BY id
+        ''', (snapshot_id,))
+        cursor.execute('UPDATE snapshots SET content_hash = ? WHERE id = ?',
+                       (content_hash(rows), snapshot_id))
+
+    cursor.execute('DELETE FROM planets_latest')
+    cursor.execute('''
+        INSERT INTO planets_latest (name, coordinates, score, delete_on, week_number, created_at, snapshot_id)
+        SELECT name, coordinates, score, delete_on, week_number, created_at, snapshot_id
+        FROM planets p1
+        WHERE created_at = (
+            SELECT MAX(created_at)
+            FROM planets p2
+            WHERE p2.name = p1.name
+        )
+    ''')
+
+def migrate_v2(cursor):
+    """Version 1 -> 2: Änderungs-Feed für alle vorhandenen Snapshots nachberechnen"""
+    cursor.execute('DELETE FROM planet_changes')
+    snapshot_ids = [row[0] for row in cursor.execute('SELECT id FROM snapshots ORDER BY id')]
+    for snapshot_id in snapshot_ids:
+        record_changes(cursor, snapshot_id)
+
+def content_hash(rows):
+    """Hash über (name, coordinates, score, delete_on) in Abrufreihenfolge"""
+    digest = hashlib.sha256()
+    for name, coordinates, score, delete_on in rows:
+        digest.update(f'{name}\x1f{coordinates}\x1f{score}\x1f{delete_on}\x1e'.encode('utf-8'))
+    return digest.hexdigest()
+
+def record_snapshot(cursor, rows, fetched_at):
+    """Speichert einen Abruf: Snapshot-Eintrag, Planeten-Historie und planets_latest.
+
+    `rows` ist ein Iterable aus (name, coordinates, score, delete_on), z.B.
+    map(api_row, planets); die Wochennummer ergibt sich per SQL aus dem Namen.
+    Läuft in der Transaktion des Aufrufers; gibt (snapshot_id, Anzahl, Änderungen)
+    zurück, wobei Änderungen die Liste aus record_changes ist.
+    """
+    cursor.execute('INSERT OR IGNORE INTO snapshots (fetched_at) VALUES (?)', (fetched_at,))
+    snapshot_id = cursor.execute('SELECT id FROM snapshots WHERE fetched_at = ?', (fetched_at,)).fetchone()[0]
+
+    digest = hashlib.sha256()
+
+    context = (fetched_at, snapshot_id)
+
+    def planet_rows():
+        # Gleiche Kodierung wie content_hash()
+        for row in rows:
+            digest.update(('%s\x1f%s\x1f%s\x1f%s\x1e' % row).encode('utf-8'))
+            yield row + context
+
+    cursor.executemany(INSERT_PLANET, planet_rows())
+    saved_count = cursor.rowcount
+
+    cursor.execute('UPDATE snapshots SET content_hash = ?, planet_count = ? WHERE id = ?',
+                   (digest.hexdigest(), saved_count, snapshot_id))
+    cursor.execute(UPSERT_LATEST, (snapshot_id,))
+    changes = record_changes(cursor, snapshot_id)
+    return snapshot_id, saved_count, changes
+
+def snapshot_planets(cursor, snapshot_id):
+    """{name: (coordinates, score, delete_on)} eines Snapshots"""
+    if snapshot_id is None:
+        return {}
+    rows = cursor.execute('''
+        SELECT name, coordinates, score, delete_on FROM planets WHERE snapshot_id = ?
+    ''', (snapshot_id,))
+    return {name: (coordinates, score, delete_on) for name, coordinates, score, delete_on in rows}
+
+def diff_planets(old, new):
+    """Vergleicht zwei Stände {name: (coordinates, score, delete_on)} anhand des Planetennamens.
+
+    Gibt eine nach Namen sortierte Liste von (name, change, alt, neu) zurück;
+    change ist 'added', 'removed' oder 'changed', alt/neu ist None bzw. das Tupel.
+    """
+    changes = []
+    for name, after in new.items():
+        before = old.get(name)
+        if before is None:
+            changes.append((name, 'added', None, after))
+        elif before != after:
+            changes.append((name, 'changed', before, after))
+    for name, before in old.items():
+        if name not in new:
+            changes.append((name, 'removed', before, None))
+    changes.sort()
+    return changes
+
+def record_changes(cursor, snapshot_id):
+    """Berechnet und speichert die Änderungen eines Snapshots gegenüber seinem Vorgänger"""
+    previous_id = cursor.execute('SELECT MAX(id) FROM snapshots WHERE id < ?', (snapshot_id,)).fetchone()[0]
+    changes = diff_planets(snapshot_planets(cursor, previous_id), snapshot_planets(cursor, snapshot_id))
+
+    empty = (None, None, None)
+    cursor.execute('DELETE FROM planet_changes WHERE snapshot_id = ?', (snapshot_id,))
+    cursor.executemany(INSERT_CHANGE, (
+        (snapshot_id, name, change) + (before or empty) + (after or empty)
+        for name, change, before, after in changes
+    ))
+    return changes
+
+def planet_state(coordinates, score, delete_on):
+    if coordinates is None:
+        return None
+    return {'coordinates': coordinates, 'score': score, 'deleteOn': delete_on}
+
+def get_changes(conn, since=None, limit=MAX_CHANGE_SNAPSHOTS):
+    """Änderungs-Feed: Snapshots nach `since` (Snapshot-ID oder ISO-Zeitstempel), älteste zuerst.
+
+    Ergebnis: {'since', 'latestSnapshot', 'next', 'hasMore', 'snapshots': [{'id', 'fetchedAt',
+    'added', 'removed', 'changed'}]}. 'latestSnapshot' ist immer die aktuelle MAX(id), egal
+    in welcher Form `since` übergeben wurde; 'next' ist das `since` für die nächste Abfrage
+    (bei mehr als `limit` neuen Snapshots die ID des letzten gelieferten).
+    """
+    if since is None:
+        condition, value = 'id > ?', 0
+    elif isinstance(since, int):
+        condition, value = 'id > ?', since
+    else:
+        condition, value = 'fetched_at > ?', since
+
+    snapshots = conn.execute(f'''
+        SELECT id, fetched_at FROM snapshots
+        WHERE {condition}
+        ORDER BY id
+        LIMIT ?
+    ''', (value, limit)).fetchall()
+
+    result = []
+    by_id = {}
+    for snapshot_id, fetched_at in snapshots:
+        entry = {'id': snapshot_id, 'fetchedAt': fetched_at, 'added': [], 'removed': [], 'changed': []}
+        by_id[snapshot_id] = entry
+        result.append(entry)
+
+    if snapshots:
+        rows = conn.execute('''
+            SELECT snapshot_id, name, change, old_coordinates, old_score, old_delete_on,
+                   new_coordinates, new_score, new_delete_on
+            FROM planet_changes
+            WHERE snapshot_id BETWEEN ? AND ?
+            ORDER BY snapshot_id, name
+        ''', (snapshots[0][0], snapshots[-1][0]))
+        for snapshot_id, name, change, *values in rows:
+            by_id[snapshot_id][change].append({
+                'name': name,
+                'before': planet_state(*values[:3]),
+                'after': planet_state(*values[3:])
+            })
+
+    # Nach der Seite gelesen, damit ein inzwischen gespeicherter Snapshot nicht fehlt
+    latest = conn.execute('SELECT MAX(id) FROM snapshots').fetchone()[0]
+    next_since = snapshots[-1][0] if snapshots else latest
+    return {'since': since, 'latestSnapshot': latest, 'next': next_since,
+            'hasMore': next_since is not None and next_since < latest, 'snapshots': result}
+
+class ConnectionPool:
+    """Langlebige Verbindungen zu einer Datenbankdatei.
+
+    reader() liefert die Lese-Verbindung des aktuellen Threads (query_only),
+    write() die einzige Schreib-Verbindung unter einem Lock und committet am
+    Ende des with-Blocks (bzw. rollt bei einer Exception zurück).
+    """
+    
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._reset()
+    
+    def _reset(self):
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._readers = []
+        self._writer = None
+        self._write_lock = threading.Lock()
+        self._schema_ready = False
+    
+    def _check_fork(self):
+        # Verbindungen dürfen nicht über fork() hinweg genutzt werden (prefork/gunicorn)
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+    
+    def _connect(self, **kwargs):
+        return sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            check_same_thread=False,
+            **kwargs
+        )
+    
+    def _writer_connection(self):
+        if self._writer is None:
+            conn = self._connect()
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._writer = conn
+        return self._writer
+    
+    def ensure_schema(self):
+        """Legt das Schema an bzw. migriert es (einmal pro Prozess)"""
+        self._check_fork()
+        if self._schema_ready:
+            return
+        with self._write_lock:
+            if not self._schema_ready:
+                init_schema(self._writer_connection())
+                self._schema_ready = True
+    
+    def reader(self):
+        """Lese-Verbindung des aktuellen Threads"""
+        self._check_fork()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit: ein Leser hält nie eine offene Transaktion (und damit einen alten Stand)
+            conn = self._connect(isolation_level=None)
+            conn.execute('PRAGMA query_only=ON')
+            self._local.conn = conn
+            with self._lock:
+                self._readers.append(conn)
+        return conn
+    
+    @contextmanager
+    def write(self):
+        """Serialisierte Schreib-Transaktion"""
+        self._check_fork()
+        with self._write_lock:
+            conn = self._writer_connection()
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+    
+    def close(self):
+        with self._lock:
+            readers, self._readers = self._readers, []
+            self._local = threading.local()
+        for conn in readers:
+            conn.close()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_path='proxima.db'):
+    """Prozessweiter ConnectionPool für die angegebene Datenbankdatei"""
+    key = os.path.abspath(db_path)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(db_path)
+    return pool
+
+def _after_fork():
+    """Im Kindprozess: Locks und Verbindungen neu anlegen (ein anderer Thread könnte sie beim fork() gehalten haben)"""
+    global _pools_lock
+    _pools_lock = threading.Lock()
+    for pool in _pools.values():
+        pool._lock = threading.Lock()
+        pool._reset()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] != 'migrate':
+        print("Verwendung: python3 proxima_db.py migrate [pfad/zur/proxima.db]")
+        return 1
+
+    db_path = sys.argv[2] if len(sys.argv) > 2 else 'proxima.db'
+    conn = sqlite3.connect(db_path)
+    try:
+        before = conn.execute('PRAGMA user_version').fetchone()[0]
+        if init_schema(conn):
+            snapshots = conn.execute('SELECT COUNT(*) FROM snapshots').fetchone()[0]
+            latest = conn.execute('SELECT COUNT(*) FROM planets_latest').fetchone()[0]
+            print(f"✅ {db_path} migriert: Version {before} -> {SCHEMA_VERSION}")
+            print(f"   {snapshots} Snapshots, {latest} Planeten in planets_latest")
+        else:
+            print(f"✓ {db_path} ist bereits auf Version {before}")
+    finally:
+        conn.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,12 +4,18 @@ Discord Webhook Integration für ProximaDB
 Sendet ProximaDB-Daten formatiert an einen Discord-Kanal
 """
 
+import gzip
+import io
 import json
-import requests
-import sqlite3
+import proxima_db
+from proxima_xlsx import write_xlsx
+from discord_dispatch import WebhookDispatcher, fan_out, summarize
 from datetime import datetime
 import logging
 import os
+import shutil
+import tempfile
+import threading
 from typing import List, Dict, Optional
 
 logging.basicConfig(
@@ -17,6 +23,84 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+EXCEL_HEADERS = ('Name', 'Punkte', 'Koordinaten', 'Zerstörung', 'Woche')
+EXCEL_WIDTHS = (25, 12, 15, 20, 10)
+
+# Upload-Limit für Anhänge (Server ohne Boost); größere JSON-Exporte werden gzip-komprimiert
+DISCORD_ATTACHMENT_LIMIT = 8 * 1024 * 1024
+
+class RenderCache:
+    """Fertig gerenderte Nachrichten und Exporte pro Snapshot
+
+    Schlüssel sind die Formate ('data', Embed, 'website'/'minimal'/'simple',
+    Seiten, JSON, xlsx). Befüllt wird erst bei Bedarf; sobald ein neuer Snapshot
+    gespeichert wurde, wird der Cache beim nächsten Zugriff verworfen.
+    """
+
+    def __init__(self, db_path='proxima.db'):
+        self.db = proxima_db.get_pool(db_path)
+        self._cache = {}
+        self._snapshot_id = None
+        self._lock = threading.Lock()
+
+    def snapshot_id(self):
+        """ID des neuesten Snapshots (Grundlage des Caches)"""
+        # Migriert ältere Datenbanken bei Bedarf auf das Snapshot-Schema
+        self.db.ensure_schema()
+        return self.db.reader().execute('SELECT MAX(id) FROM snapshots').fetchone()[0]
+
+    def get(self, key, compute):
+        """Ergebnis aus dem Cache oder per compute() neu erzeugt (None wird nicht gecacht)"""
+        snapshot_id = self.snapshot_id()
+        with self._lock:
+            if snapshot_id != self._snapshot_id:
+                self._cache = {}
+                self._snapshot_id = snapshot_id
+            cache = self._cache
+            if key in cache:
+                return cache[key]
+
+        result = compute()
+        if result is not None:
+            with self._lock:
+                if self._snapshot_id == snapshot_id:
+                    cache[key] = result
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._cache = {}
+            self._snapshot_id = None
+
+_render_caches = {}
+_render_caches_lock = threading.Lock()
+
+def get_render_cache(db_path='proxima.db'):
+    """Prozessweiter RenderCache für die Datenbankdatei (von allen Webhooks geteilt)"""
+    key = os.path.abspath(db_path)
+    with _render_caches_lock:
+        cache = _render_caches.get(key)
+        if cache is None:
+            cache = _render_caches[key] = RenderCache(db_path)
+    return cache
+
+def _after_fork():
+    global _render_caches_lock
+    _render_caches_lock = threading.Lock()
+    for cache in _render_caches.values():
+        cache._lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+def stamp_payload(payload):
+    """Kopie der Nachricht mit aktuellem Zeitstempel in jedem Embed (der Cache bleibt unverändert)"""
+    if not payload.get('embeds'):
+        return payload
+    timestamp = datetime.now(datetime.now().astimezone().tzinfo).isoformat()
+    return {**payload, 'embeds': [{**embed, 'timestamp': timestamp} for embed in payload['embeds']]}
+
 class ProximaDiscordWebhook:
     def __init__(self, webhook_url: str, db_path: str = 'proxima.db'):
         """
@@ -28,22 +112,27 @@ class ProximaDiscordWebhook:
         """
         self.webhook_url = webhook_url
         self.db_path = db_path
+        self.db = proxima_db.get_pool(db_path)
+        self.dispatcher = WebhookDispatcher(webhook_url)
+        self.render_cache = get_render_cache(db_path)
+        self.last_outcomes = []
     
     def get_proxima_data(self) -> Optional[Dict]:
-        """Lädt die aktuellen Proxima-Daten aus der Datenbank"""
+        """Lädt die aktuellen Proxima-Daten (einmal pro Snapshot aus der Datenbank)"""
+        try:
+            return self.render_cache.get(('data',), self._load_proxima_data)
+        except Exception as e:
+            logging.error(f"Fehler beim Laden der Daten: {e}")
+            return None
+    
+    def _load_proxima_data(self) -> Optional[Dict]:
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self.db.reader().cursor()
             
             # Hole die neuesten Planeten
             cursor.execute('''
                 SELECT name, coordinates, score, delete_on, week_number
-                FROM planets p1
-                WHERE created_at = (
-                    SELECT MAX(created_at) 
-                    FROM planets p2 
-                    WHERE p2.name = p1.name
-                )
+                FROM planets_latest
                 ORDER BY score DESC
                 LIMIT 25
             ''')
@@ -51,17 +140,12 @@ class ProximaDiscordWebhook:
             planets = cursor.fetchall()
             
             # Statistiken
-            cursor.execute('SELECT COUNT(DISTINCT name) FROM planets')
-            total_planets = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT MAX(week_number) FROM planets')
-            latest_week = cursor.fetchone()[0]
+            cursor.execute('SELECT COUNT(*), MAX(week_number) FROM planets_latest')
+            total_planets, latest_week = cursor.fetchone()
             
-            cursor.execute('SELECT MAX(created_at) FROM planets')
+            cursor.execute('SELECT MAX(fetched_at) FROM snapshots')
             last_update = cursor.fetchone()[0]
             
-            conn.close()
-            
             return {
                 'planets': planets,
                 'total_planets': total_planets,
@@ -111,9 +195,9 @@ class ProximaDiscordWebhook:
             "fields": fields,
             "footer": {
                 "text": "Spacenations Tools • ProximaDB"
-            },
-            "timestamp": datetime.now(datetime.now().astimezone().tzinfo).isoformat()
+            }
         }
+        # Kein "timestamp": das Embed wird pro Snapshot gecacht, stamp_payload() setzt ihn beim Senden
         
         return embed
     
@@ -186,102 +270,134 @@ Name                : Punkte   : Koordinaten
         
         return message
     
+    def iter_excel_rows(self):
+        """Alle Planeten (nach Punkten sortiert) als Excel-Zeilen, direkt vom DB-Cursor"""
+        self.db.ensure_schema()
+        cursor = self.db.reader().execute('''
+            SELECT name, score, coordinates, delete_on, week_number
+            FROM planets_latest
+            ORDER BY score DESC
+        ''')
+        
+        # Viele Planeten teilen sich ein Löschdatum - nur einmal formatieren
+        dates = {}
+        for name, score, coordinates, delete_on, week_number in cursor:
+            formatted_date = dates.get(delete_on)
+            if formatted_date is None:
+                formatted_date = dates[delete_on] = self.format_delete_date(delete_on)
+            yield name, score, coordinates, formatted_date, week_number
+    
+    def write_excel(self, stream) -> int:
+        """Schreibt den Excel-Export nach `stream` und gibt die Anzahl der Planeten zurück"""
+        return write_xlsx(stream, EXCEL_HEADERS, self.iter_excel_rows(), widths=EXCEL_WIDTHS, sheet_name='ProximaDB')
+    
     def create_excel_file(self, filename: str = None) -> str:
         """Erstellt eine Excel-Datei mit den Proxima-Daten"""
         try:
-            import pandas as pd
-            from datetime import datetime
-            
             if filename is None:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 filename = f'proxima_data_{timestamp}.xlsx'
             
-            data = self.get_proxima_data()
-            if not data:
-                return None
-            
-            # Konvertiere Daten für DataFrame
-            planets_list = []
-            for planet in data['planets']:
-                name, coordinates, score, delete_on, week_number = planet
-                planets_list.append({
-                    'Name': name,
-                    'Punkte': score,
-                    'Koordinaten': coordinates,
-                    'Zerstörung': self.format_delete_date(delete_on),
-                    'Woche': week_number
-                })
-            
-            df = pd.DataFrame(planets_list)
-            
-            # Excel mit Formatierung erstellen
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='ProximaDB', index=False)
-                
-                # Formatierung
-                worksheet = writer.sheets['ProximaDB']
-                
-                # Spaltenbreiten anpassen
-                worksheet.column_dimensions['A'].width = 25  # Name
-                worksheet.column_dimensions['B'].width = 12  # Punkte
-                worksheet.column_dimensions['C'].width = 15  # Koordinaten
-                worksheet.column_dimensions['D'].width = 20  # Zerstörung
-                worksheet.column_dimensions['E'].width = 10  # Woche
-                
-                # Header formatieren
-                from openpyxl.styles import Font, PatternFill, Alignment
-                header_fill = PatternFill(start_color='00FF88', end_color='00FF88', fill_type='solid')
-                header_font = Font(bold=True, color='000000')
-                
-                for cell in worksheet[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = Alignment(horizontal='center')
+            with open(filename, 'wb') as f:
+                self.write_excel(f)
             
             logging.info(f"✅ Excel-Datei erstellt: {filename}")
             return filename
             
-        except ImportError:
-            logging.error("❌ pandas oder openpyxl nicht installiert! Installieren Sie: pip install pandas openpyxl")
-            return None
         except Exception as e:
             logging.error(f"❌ Fehler beim Erstellen der Excel-Datei: {e}")
             return None
     
+    def render_excel(self):
+        """Excel-Export als (Dateiname, Bytes, MIME-Typ), einmal pro Snapshot erzeugt
+        
+        Der Dateiname enthält noch keinen Zeitstempel (den setzt send_export()).
+        """
+        def build(data):
+            filename = 'proxima_data.xlsx'
+            buffer = io.BytesIO()
+            count = self.write_excel(buffer)
+            logging.info(f"✅ Excel-Export erstellt: {count} Planeten")
+            return filename, buffer.getvalue(), XLSX_MIME
+        return self._render(('xlsx',), build)
+    
+    def send_export(self, export, caption: str, label: str):
+        """Lädt einen Export (Dateiname, Bytes, MIME-Typ) direkt aus dem Speicher hoch
+        
+        Der Zeitstempel im Dateinamen wird erst hier gesetzt, da der Export pro Snapshot gecacht ist.
+        """
+        filename, content, mime = export
+        stem, dot, extension = filename.partition('.')
+        filename = f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{dot}{extension}"
+        if len(content) > DISCORD_ATTACHMENT_LIMIT:
+            logging.warning(f"⚠️ {filename} ist {len(content) / 1024 / 1024:.1f} MB groß - Discord lehnt Anhänge über {DISCORD_ATTACHMENT_LIMIT // 1024 // 1024} MB evtl. ab")
+        
+        # Der Multipart-Body wird beim Senden gestreamt, der Inhalt nicht kopiert
+        return self.dispatcher.send(
+            form={"content": caption},
+            files={'file': (filename, content, mime)},
+            label=label
+        )
+    
     def send_excel_to_discord(self) -> bool:
         """Erstellt und sendet Excel-Datei an Discord"""
         try:
-            filename = self.create_excel_file()
-            if not filename:
+            excel = self.render_excel()
+            if not excel:
                 return False
             
             data = self.get_proxima_data()
+            outcome = self.send_export(
+                excel,
+                f"📊 **ProximaDB Excel-Export**\n\n• {data['total_planets']} Planeten\n• Woche {data['latest_week']}\n• Sortiert nach Punkten (höchste zuerst)",
+                label="Excel-Export"
+            )
             
-            # Sende als Datei
-            with open(filename, 'rb') as f:
-                response = requests.post(
-                    self.webhook_url,
-                    data={
-                        "content": f"📊 **ProximaDB Excel-Export**\n\n• {data['total_planets']} Planeten\n• Woche {data['latest_week']}\n• Sortiert nach Punkten (höchste zuerst)"
-                    },
-                    files={'file': (filename, f, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')}
-                )
-            
-            # Lösche temporäre Datei
-            import os
-            os.remove(filename)
-            
-            if response.status_code == 204 or response.status_code == 200:
-                logging.info(f"✅ Excel-Datei erfolgreich gesendet und gelöscht!")
-                return True
-            else:
-                logging.error(f"❌ Fehler beim Senden: {response.status_code}")
-                return False
+            self.last_outcomes = [outcome]
+            return outcome.ok
                 
         except Exception as e:
             logging.error(f"❌ Fehler beim Excel-Versand: {e}")
             return False
     
+    def _render(self, key, build):
+        """Rendert ein Format einmal pro Snapshot; build(data) erhält die Proxima-Daten"""
+        def compute():
+            data = self.get_proxima_data()
+            return build(data) if data else None
+        return self.render_cache.get(key, compute)
+    
+    def render_payload(self, use_embed: bool = True, table_style: str = 'website') -> Optional[Dict]:
+        """Webhook-Nachricht im gewünschten Format, einmal pro Snapshot erzeugt"""
+        key = ('embed',) if use_embed else (table_style,)
+        return self._render(key, lambda data: self.create_payload(data, use_embed, table_style))
+    
+    def render_pages(self, planets_per_page: int = 15) -> Optional[List[Dict]]:
+        """Tabellen-Seiten für send_multi_table(), einmal pro Snapshot erzeugt"""
+        return self._render(('pages', planets_per_page), lambda data: self.create_table_pages(data, planets_per_page))
+    
+    def create_payload(self, data: Dict, use_embed: bool = True, table_style: str = 'website') -> Dict:
+        """Erstellt die Webhook-Nachricht im gewünschten Format"""
+        if use_embed:
+            embed = self.create_discord_embed(data)
+            return {
+                "username": "ProximaDB Bot",
+                "avatar_url": "https://cdn.discordapp.com/attachments/1234567890/planet.png",
+                "embeds": [embed]
+            }
+        
+        if table_style == 'website':
+            message = self.create_website_style_table(data)
+        elif table_style == 'minimal':
+            message = self.create_minimal_list(data)
+        else:
+            message = self.create_simple_table_message(data)
+            
+        return {
+            "username": "ProximaDB Bot",
+            "content": message
+        }
+    
     def send_to_discord(self, use_embed: bool = True, table_style: str = 'website') -> bool:
         """
         Sendet die Proxima-Daten an Discord
@@ -291,169 +407,199 @@ Name                : Punkte   : Koordinaten
             table_style: 'simple', 'website' oder 'compact' - nur relevant wenn use_embed=False
         """
         try:
-            data = self.get_proxima_data()
-            if not data:
+            payload = self.render_payload(use_embed, table_style)
+            if not payload:
                 logging.error("Keine Daten verfügbar")
                 return False
             
-            if use_embed:
-                embed = self.create_discord_embed(data)
-                payload = {
-                    "username": "ProximaDB Bot",
-                    "avatar_url": "https://cdn.discordapp.com/attachments/1234567890/planet.png",
-                    "embeds": [embed]
-                }
-            else:
-                if table_style == 'website':
-                    message = self.create_website_style_table(data)
-                elif table_style == 'minimal':
-                    message = self.create_minimal_list(data)
-                else:
-                    message = self.create_simple_table_message(data)
-                    
-                payload = {
-                    "username": "ProximaDB Bot",
-                    "content": message
-                }
-            
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            if response.status_code == 204:
-                logging.info("✅ Erfolgreich an Discord gesendet!")
-                return True
-            else:
-                logging.error(f"❌ Discord Webhook Fehler: {response.status_code} - {response.text}")
-                return False
+            outcome = self.dispatcher.send(stamp_payload(payload), label="ProximaDB-Übersicht")
+            self.last_outcomes = [outcome]
+            return outcome.ok
                 
         except Exception as e:
             logging.error(f"❌ Fehler beim Senden an Discord: {e}")
             return False
     
-    def send_multi_table(self, planets_per_page: int = 15) -> bool:
-        """Sendet die Daten als mehrere Tabellen-Nachrichten (alle Planeten)"""
-        try:
-            data = self.get_proxima_data()
-            if not data:
-                return False
-            
-            all_planets = data['planets']
-            total_pages = (len(all_planets) + planets_per_page - 1) // planets_per_page
-            
-            for page in range(total_pages):
-                start_idx = page * planets_per_page
-                end_idx = min(start_idx + planets_per_page, len(all_planets))
-                page_planets = all_planets[start_idx:end_idx]
-                
-                # Header für erste Seite, kompakter für weitere
-                if page == 0:
-                    message = f"""🌌 **ProximaDB - Spacenations Tools**
+    def send_to_webhooks(self, webhook_urls: List[str], use_embed: bool = True, table_style: str = 'website',
+                         multi_table: bool = False, planets_per_page: int = 15):
+        """
+        Sendet denselben Bericht parallel an mehrere Discord-Webhooks
+        
+        Die Nachricht(en) werden nur einmal aus der Datenbank erzeugt; jeder Webhook
+        hat sein eigenes Rate-Limit. Gibt einen FanOutReport zurück (None ohne Daten).
+        
+        Args:
+            webhook_urls: Liste der Webhook-URLs (Duplikate werden ignoriert)
+            use_embed / table_style: wie bei send_to_discord()
+            multi_table: True sendet alle Seiten wie send_multi_table()
+        """
+        if multi_table:
+            pages = self.render_pages(planets_per_page)
+            messages = pages and [(payload, None, None, f"Seite {page}/{len(pages)}") for page, payload in enumerate(pages, 1)]
+        else:
+            payload = self.render_payload(use_embed, table_style)
+            messages = payload and [(stamp_payload(payload), None, None, "ProximaDB-Übersicht")]
+        if not messages:
+            logging.error("Keine Daten verfügbar")
+            return None
+        
+        report = fan_out(webhook_urls, messages)
+        sent, total = report.summary()
+        if report.ok:
+            logging.info(f"✅ An {len(report.outcomes)} Webhooks gesendet ({report.elapsed:.2f}s)")
+        else:
+            logging.error(f"❌ Nur {sent} von {total} Nachrichten zugestellt ({len(report.failed_webhooks())} Webhooks mit Fehlern)")
+        return report
+    
+    def create_table_pages(self, data: Dict, planets_per_page: int = 15) -> List[Dict]:
+        """Erstellt die Tabellen-Seiten für send_multi_table() als Webhook-Nachrichten"""
+        all_planets = data['planets']
+        total_pages = (len(all_planets) + planets_per_page - 1) // planets_per_page
+        pages = []
+        
+        for page in range(total_pages):
+            start_idx = page * planets_per_page
+            end_idx = min(start_idx + planets_per_page, len(all_planets))
+            page_planets = all_planets[start_idx:end_idx]
+            
+            # Header für erste Seite, kompakter für weitere
+            if page == 0:
+                message = f"""🌌 **ProximaDB - Spacenations Tools**
 📊 **{data['total_planets']} Planeten** | 📅 **Woche {data['latest_week']}** | 📄 Seite 1/{total_pages}
 
 ```
 ┌────┬──────────────────┬──────────────┬─────────┬────────────────────┬──────┐
 │ #  │ Name             │ Koordinaten  │ Punkte  │ Zerstörung         │ Wo.  │
 ├────┼──────────────────┼──────────────┼─────────┼────────────────────┼──────┤"""
-                else:
-                    message = f"""📄 **Seite {page+1}/{total_pages}**
+            else:
+                message = f"""📄 **Seite {page+1}/{total_pages}**
 
 ```
 ┌────┬──────────────────┬──────────────┬─────────┬────────────────────┬──────┐"""
-                
-                for i, planet in enumerate(page_planets, start_idx + 1):
-                    name, coordinates, score, delete_on, week_number = planet
-                    formatted_date = self.format_delete_date(delete_on)
-                    rank = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i:2}"
-                    message += f"\n│ {rank:<2} │ {name[:16]:<16} │ {coordinates:<12} │ {score:7,} │ {formatted_date:<18} │ W{week_number:<3} │"
-                
-                message += "\n└────┴──────────────────┴──────────────┴─────────┴────────────────────┴──────┘\n```"
-                
-                if page == total_pages - 1:
-                    message += f"\n⏰ Letzte Aktualisierung: {data['last_update']}"
-                
-                # Sende Nachricht
-                payload = {"username": "ProximaDB Bot", "content": message}
-                response = requests.post(
-                    self.webhook_url,
-                    json=payload,
-                    headers={'Content-Type': 'application/json'}
-                )
-                
-                if response.status_code != 204:
-                    logging.error(f"❌ Fehler bei Seite {page+1}: {response.status_code}")
-                    return False
-                
-                # Kurze Pause zwischen Nachrichten
-                if page < total_pages - 1:
-                    import time
-                    time.sleep(0.5)
             
-            logging.info(f"✅ {total_pages} Seiten erfolgreich gesendet!")
-            return True
+            for i, planet in enumerate(page_planets, start_idx + 1):
+                name, coordinates, score, delete_on, week_number = planet
+                formatted_date = self.format_delete_date(delete_on)
+                rank = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i:2}"
+                message += f"\n│ {rank:<2} │ {name[:16]:<16} │ {coordinates:<12} │ {score:7,} │ {formatted_date:<18} │ W{week_number:<3} │"
             
-        except Exception as e:
-            logging.error(f"❌ Fehler beim Multi-Tabellen-Versand: {e}")
-            return False
+            message += "\n└────┴──────────────────┴──────────────┴─────────┴────────────────────┴──────┘\n```"
+            
+            if page == total_pages - 1:
+                message += f"\n⏰ Letzte Aktualisierung: {data['last_update']}"
+            
+            pages.append({"username": "ProximaDB Bot", "content": message})
+        
+        return pages
     
-    def send_full_data_as_file(self) -> bool:
-        """Sendet die kompletten Daten als JSON-Datei an Discord"""
+    def send_multi_table(self, planets_per_page: int = 15) -> bool:
+        """Sendet die Daten als mehrere Tabellen-Nachrichten (alle Planeten)"""
         try:
-            data = self.get_proxima_data()
-            if not data:
+            pages = self.render_pages(planets_per_page)
+            if not pages:
                 return False
             
-            # Konvertiere Daten für JSON
-            planets_list = []
-            for planet in data['planets']:
-                name, coordinates, score, delete_on, week_number = planet
-                planets_list.append({
-                    "name": name,
-                    "coordinates": coordinates,
-                    "score": score,
-                    "deleteOn": delete_on,
-                    "weekNumber": week_number
-                })
-            
-            json_data = {
-                "totalPlanets": data['total_planets'],
-                "latestWeek": data['latest_week'],
-                "lastUpdate": data['last_update'],
-                "planets": planets_list
-            }
+            total_pages = len(pages)
             
-            # Speichere temporär als Datei
-            filename = f"proxima_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, ensure_ascii=False, indent=2)
+            # Einreihen; das Tempo bestimmen Discords Rate-Limit-Header
+            for page, payload in enumerate(pages, 1):
+                self.dispatcher.enqueue(payload, label=f"Seite {page}/{total_pages}")
             
-            # Sende als Datei
-            with open(filename, 'rb') as f:
-                response = requests.post(
-                    self.webhook_url,
-                    data={
-                        "content": f"📁 **Komplette ProximaDB Export**\n📊 {data['total_planets']} Planeten • Woche {data['latest_week']}"
-                    },
-                    files={'file': (filename, f, 'application/json')}
-                )
+            self.last_outcomes = self.dispatcher.flush()
+            sent, total = summarize(self.last_outcomes)
+            if sent == total:
+                logging.info(f"✅ {total_pages} Seiten erfolgreich gesendet!")
+                return True
+            logging.error(f"❌ Nur {sent} von {total} Seiten gesendet")
+            return False
             
-            # Lösche temporäre Datei
-            os.remove(filename)
+        except Exception as e:
+            logging.error(f"❌ Fehler beim Multi-Tabellen-Versand: {e}")
+            return False
+    
+    def write_json(self, stream, data: Dict) -> int:
+        """Schreibt den JSON-Export aller Planeten blockweise nach `stream` (wie json.dump mit indent=2)"""
+        self.db.ensure_schema()
+        cursor = self.db.reader().execute('''
+            SELECT name, coordinates, score, delete_on, week_number
+            FROM planets_latest
+            ORDER BY score DESC
+        ''')
+        
+        dumps = json.dumps
+        stream.write(dumps({
+            "totalPlanets": data['total_planets'],
+            "latestWeek": data['latest_week'],
+            "lastUpdate": data['last_update']
+        }, ensure_ascii=False, indent=2)[:-2].encode('utf-8'))
+        stream.write(b',\n  "planets": [')
+        
+        count = 0
+        chunk = []
+        for count, (name, coordinates, score, delete_on, week_number) in enumerate(cursor, 1):
+            planet = dumps({
+                "name": name,
+                "coordinates": coordinates,
+                "score": score,
+                "deleteOn": delete_on,
+                "weekNumber": week_number
+            }, ensure_ascii=False, indent=2).replace('\n', '\n    ')
+            chunk.append(('\n    ' if count == 1 else ',\n    ') + planet)
+            if len(chunk) >= 1000:
+                stream.write(''.join(chunk).encode('utf-8'))
+                chunk = []
+        chunk.append('\n  ]\n}' if count else ']\n}')
+        stream.write(''.join(chunk).encode('utf-8'))
+        return count
+    
+    def render_json(self, compress: bool = True):
+        """JSON-Export als (Dateiname, Bytes, MIME-Typ), einmal pro Snapshot erzeugt
+        
+        Mit `compress` wird der Export gzip-komprimiert (.json.gz), sobald er
+        größer als Discords Upload-Limit ist. Den Zeitstempel im Dateinamen setzt send_export().
+        """
+        def build(data):
+            filename = 'proxima_data.json'
+            
+            # Bis zum Upload-Limit im Speicher, darüber lagert der Spool auf die Platte aus
+            with tempfile.SpooledTemporaryFile(max_size=DISCORD_ATTACHMENT_LIMIT) as spool:
+                count = self.write_json(spool, data)
+                size = spool.tell()
+                spool.seek(0)
+                
+                if not compress or size <= DISCORD_ATTACHMENT_LIMIT:
+                    logging.info(f"✅ JSON-Export erstellt: {count} Planeten")
+                    return filename, spool.read(), 'application/json'
+                
+                buffer = io.BytesIO()
+                with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=6, mtime=0) as archive:
+                    shutil.copyfileobj(spool, archive, 1024 * 1024)
             
-            if response.status_code == 204:
-                logging.info(f"✅ Datei {filename} erfolgreich gesendet!")
-                return True
-            else:
-                logging.error(f"❌ Fehler beim Senden der Datei: {response.status_code}")
+            logging.info(f"🗜️ JSON-Export komprimiert: {size / 1024 / 1024:.1f} MB -> {buffer.tell() / 1024 / 1024:.1f} MB")
+            return filename + '.gz', buffer.getvalue(), 'application/gzip'
+        return self._render(('json', compress), build)
+    
+    def send_full_data_as_file(self, compress: bool = True) -> bool:
+        """Sendet die kompletten Daten als JSON-Datei an Discord (zu große Exporte als .json.gz)"""
+        try:
+            export = self.render_json(compress)
+            if not export:
                 return False
+            
+            data = self.get_proxima_data()
+            outcome = self.send_export(
+                export,
+                f"📁 **Komplette ProximaDB Export**\n📊 {data['total_planets']} Planeten • Woche {data['latest_week']}",
+                label=f"Datei {export[0]}"
+            )
+            
+            self.last_outcomes = [outcome]
+            return outcome.ok
                 
         except Exception as e:
             logging.error(f"❌ Fehler beim Datei-Versand: {e}")
             return False
 
-
 def main():
     """Beispiel-Verwendung"""
     
@@ -6,7 +6,10 @@ Lädt jeden Mittwoch um 18:45 die Proxima-Planetendaten und speichert sie in der
 
 import json
 import requests
-import sqlite3
+import proxima_client
+import proxima_db
+from proxima_report import write_report
+from proxima_publish import publish_stream
 import schedule
 import time
 from datetime import datetime, timezone
@@ -23,46 +26,31 @@ logging.basicConfig(
     ]
 )
 
+REPORT_FILE = 'proxima_report.html'
+
 class ProximaFetcher:
     def __init__(self, db_path='proxima.db'):
-        self.api_url = "https://beta2.game.spacenations.eu/api/proxima"
+        self.api_url = proxima_client.API_URL
+        self.client = proxima_client.get_client(self.api_url)
         self.db_path = db_path
         self.init_database()
     
     def init_database(self):
-        """Initialisiert die ProximaDB SQLite Datenbank"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS planets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                coordinates TEXT NOT NULL,
-                score INTEGER NOT NULL,
-                delete_on TEXT NOT NULL,
-                week_number INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(name, created_at)
-            )
-        ''')
-        
-        # Index für bessere Performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_name ON planets(name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_week ON planets(week_number)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_created ON planets(created_at)')
-        
-        conn.commit()
-        conn.close()
+        """Initialisiert die ProximaDB SQLite Datenbank (inkl. Migration älterer Datenbanken)"""
+        self.db = proxima_db.get_pool(self.db_path)
+        self.db.ensure_schema()
         logging.info("ProximaDB initialisiert")
     
     def fetch_planets(self):
         """Lädt die aktuellen Planetendaten von der API"""
         try:
-            response = requests.get(self.api_url, timeout=30)
-            response.raise_for_status()
-            planets = response.json()
-            logging.info(f"Erfolgreich {len(planets)} Planeten von der API geladen")
+            # Persistente Session; unveränderte Antworten werden nicht erneut geparst
+            result = self.client.fetch(timeout=30)
+            planets = result.data
+            if result.changed:
+                logging.info(f"Erfolgreich {len(planets)} Planeten von der API geladen")
+            else:
+                logging.info(f"API-Daten unverändert ({len(planets)} Planeten)")
             return planets
         except requests.exceptions.RequestException as e:
             logging.error(f"Fehler beim Laden der API: {e}")
@@ -97,66 +85,47 @@ class ProximaFetcher:
         if not planets:
             return False
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            current_time = datetime.now().isoformat()
-            saved_count = 0
-            
-            for planet in planets:
-                week_number = self.extract_week_number(planet['name'])
+            # Einziger Schreiber; WAL/synchronous setzt der ConnectionPool
+            with self.db.write() as conn:
+                cursor = conn.cursor()
+                current_time = datetime.now().isoformat()
                 
-                cursor.execute('''
-                    INSERT OR REPLACE INTO planets 
-                    (name, coordinates, score, delete_on, week_number, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    planet['name'],
-                    planet['coordinates'],
-                    planet['score'],
-                    planet['deleteOn'],
-                    week_number,
-                    current_time
-                ))
-                saved_count += 1
+                # Snapshot, Historie und planets_latest in einer Transaktion;
+                # die Wochennummer berechnet SQLite beim Einfügen
+                rows = map(proxima_db.api_row, planets)
+                snapshot_id, saved_count, changes = proxima_db.record_snapshot(cursor, rows, current_time)
             
-            conn.commit()
-            logging.info(f"Erfolgreich {saved_count} Planeten in der Datenbank gespeichert")
+            logging.info(f"Erfolgreich {saved_count} Planeten in der Datenbank gespeichert (Snapshot {snapshot_id}, {len(changes)} Änderungen)")
             return True
             
         except Exception as e:
             logging.error(f"Fehler beim Speichern der Daten: {e}")
-            conn.rollback()
             return False
-        finally:
-            conn.close()
     
-    def get_planets_summary(self):
-        """Gibt eine Zusammenfassung der gespeicherten Planeten zurück"""
-        conn = sqlite3.connect(self.db_path)
+    def get_planets_summary(self, lazy=False):
+        """Gibt eine Zusammenfassung der gespeicherten Planeten zurück
+        
+        Mit lazy=True ist 'planets' ein Cursor statt einer Liste (für den Report-Stream).
+        """
+        conn = self.db.reader()
         cursor = conn.cursor()
         
         try:
-            # Aktuelle Planeten (neueste Einträge)
-            cursor.execute('''
+            # Aktuelle Planeten (neuester Stand pro Planet, beim Speichern gepflegt)
+            planets = conn.execute('''
                 SELECT name, coordinates, score, delete_on, week_number
-                FROM planets p1
-                WHERE created_at = (
-                    SELECT MAX(created_at) 
-                    FROM planets p2 
-                    WHERE p2.name = p1.name
-                )
+                FROM planets_latest
                 ORDER BY week_number DESC, CAST(SUBSTR(name, INSTR(name, ' ') + 1) AS INTEGER)
             ''')
-            
-            planets = cursor.fetchall()
+            if not lazy:
+                planets = planets.fetchall()
             
             # Statistiken
-            cursor.execute('SELECT COUNT(DISTINCT name) FROM planets')
+            cursor.execute('SELECT COUNT(*) FROM planets_latest')
             total_planets = cursor.fetchone()[0]
             
-            cursor.execute('SELECT MAX(week_number) FROM planets')
+            cursor.execute('SELECT MAX(week_number) FROM planets_latest')
             latest_week = cursor.fetchone()[0]
             
             return {
@@ -169,8 +138,6 @@ class ProximaFetcher:
         except Exception as e:
             logging.error(f"Fehler beim Abrufen der Zusammenfassung: {e}")
             return None
-        finally:
-            conn.close()
     
     def update_planets(self):
         """Hauptfunktion: Lädt und speichert die aktuellen Planetendaten"""
@@ -190,10 +157,7 @@ class ProximaFetcher:
         """Kompatibilitätsmethode für Scheduler: führt Update und Report aus"""
         try:
             self.update_planets()
-            html = self.generate_html_report()
-            if html:
-                with open('proxima_report.html', 'w', encoding='utf-8') as f:
-                    f.write(html)
+            if self.generate_html_report():
                 logging.info("HTML-Report generiert: proxima_report.html")
             
             # Discord Webhook Integration
@@ -205,18 +169,26 @@ class ProximaFetcher:
             return False
     
     def send_to_discord(self):
-        """Sendet die Proxima-Daten an Discord (falls Webhook konfiguriert)"""
+        """Sendet die Proxima-Daten an Discord (falls Webhook(s) konfiguriert)
+
+        DISCORD_WEBHOOK_URL darf mehrere, durch Komma getrennte URLs enthalten;
+        der Bericht wird dann einmal erzeugt und parallel an alle verteilt.
+        """
         try:
-            webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
-            if not webhook_url:
+            webhook_urls = [url.strip() for url in os.getenv('DISCORD_WEBHOOK_URL', '').split(',') if url.strip()]
+            if not webhook_urls:
                 logging.info("Kein Discord Webhook konfiguriert (DISCORD_WEBHOOK_URL nicht gesetzt)")
                 return False
             
             from proxima_discord_webhook import ProximaDiscordWebhook
-            webhook = ProximaDiscordWebhook(webhook_url, self.db_path)
+            webhook = ProximaDiscordWebhook(webhook_urls[0], self.db_path)
             
             # Sende Tabellen-Format (Website-Stil)
-            success = webhook.send_to_discord(use_embed=False, table_style='website')
+            if len(webhook_urls) == 1:
+                success = webhook.send_to_discord(use_embed=False, table_style='website')
+            else:
+                report = webhook.send_to_webhooks(webhook_urls, use_embed=False, table_style='website')
+                success = report is not None and report.ok
             
             if success:
                 logging.info("✅ ProximaDB-Daten erfolgreich an Discord gesendet")
@@ -228,188 +200,14 @@ class ProximaFetcher:
             logging.error(f"Discord Integration Fehler: {e}")
             return False
     
-    def generate_html_report(self):
-        """Generiert einen HTML-Bericht der aktuellen Planeten"""
-        summary = self.get_planets_summary()
+    def generate_html_report(self, path=REPORT_FILE):
+        """Schreibt den HTML-Bericht der aktuellen Planeten stückweise nach `path` (atomar, mit .gz/.br)"""
+        summary = self.get_planets_summary(lazy=True)
         if not summary:
-            return None
-        
-        html = f"""
-<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Proxima Sabocounter - Spacenations Tools</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 2.5em;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
-        .stats {{
-            display: flex;
-            justify-content: space-around;
-            padding: 20px;
-            background: #f8f9fa;
-            border-bottom: 1px solid #dee2e6;
-        }}
-        .stat {{
-            text-align: center;
-        }}
-        .stat-number {{
-            font-size: 2em;
-            font-weight: bold;
-            color: #2a5298;
-        }}
-        .stat-label {{
-            color: #6c757d;
-            font-size: 0.9em;
-        }}
-        .table-container {{
-            padding: 20px;
-            overflow-x: auto;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 20px;
-        }}
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #dee2e6;
-        }}
-        th {{
-            background: #f8f9fa;
-            font-weight: 600;
-            color: #495057;
-        }}
-        tr:hover {{
-            background: #f8f9fa;
-        }}
-        .week-badge {{
-            background: #007bff;
-            color: white;
-            padding: 4px 8px;
-            border-radius: 12px;
-            font-size: 0.8em;
-            font-weight: bold;
-        }}
-        .score-high {{
-            color: #28a745;
-            font-weight: bold;
-        }}
-        .score-medium {{
-            color: #ffc107;
-            font-weight: bold;
-        }}
-        .score-low {{
-            color: #dc3545;
-            font-weight: bold;
-        }}
-        .footer {{
-            text-align: center;
-            padding: 20px;
-            color: #6c757d;
-            background: #f8f9fa;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🌌 Proxima Sabocounter</h1>
-            <p>Spacenations Tools - Planetenverfolgung</p>
-        </div>
-        
-        <div class="stats">
-            <div class="stat">
-                <div class="stat-number">{summary['total_planets']}</div>
-                <div class="stat-label">Planeten</div>
-            </div>
-            <div class="stat">
-                <div class="stat-number">{summary['latest_week']}</div>
-                <div class="stat-label">Aktuelle Woche</div>
-            </div>
-            <div class="stat">
-                <div class="stat-number">{summary['last_update']}</div>
-                <div class="stat-label">Letzte Aktualisierung</div>
-            </div>
-        </div>
-        
-        <div class="table-container">
-            <table>
-                <thead>
-                    <tr>
-                        <th>Name</th>
-                        <th>Koordinaten</th>
-                        <th>Punkte</th>
-                        <th>Tag der Zerstörung</th>
-                        <th>Woche</th>
-                    </tr>
-                </thead>
-                <tbody>
-"""
-        
-        for planet in summary['planets']:
-            name, coordinates, score, delete_on, week_number = planet
-            formatted_date = self.format_delete_date(delete_on)
-            
-            # Score-Kategorisierung
-            if score >= 500:
-                score_class = "score-high"
-            elif score >= 200:
-                score_class = "score-medium"
-            else:
-                score_class = "score-low"
-            
-            html += f"""
-                    <tr>
-                        <td><strong>{name}</strong></td>
-                        <td><code>{coordinates}</code></td>
-                        <td class="{score_class}">{score:,}</td>
-                        <td>{formatted_date}</td>
-                        <td><span class="week-badge">Woche {week_number}</span></td>
-                    </tr>
-"""
-        
-        html += """
-                </tbody>
-            </table>
-        </div>
-        
-        <div class="footer">
-            <p>Automatisch aktualisiert jeden Mittwoch um 18:45 Uhr</p>
-            <p>Datenquelle: <a href="https://beta2.game.spacenations.eu/api/proxima" target="_blank">Spacenations API</a></p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+            return False
         
-        return html
+        publish_stream(path, lambda stream: write_report(stream, summary, self.format_delete_date))
+        return True
 
 def main():
     """Hauptfunktion - startet den Scheduler"""
@@ -420,10 +218,7 @@ def main():
     fetcher.update_planets()
     
     # HTML-Report generieren
-    html_report = fetcher.generate_html_report()
-    if html_report:
-        with open('proxima_report.html', 'w', encoding='utf-8') as f:
-            f.write(html_report)
+    if fetcher.generate_html_report():
         logging.info("HTML-Report generiert: proxima_report.html")
     
     # Scheduler für wöchentliche Updates (Mittwoch 18:45)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Atomares Veröffentlichen von proxima_data.json und proxima_report.html
+
+Jede Datei wird in eine temporäre Datei im selben Verzeichnis geschrieben,
+per fsync gesichert und dann per os.replace() an ihren Platz verschoben.
+Leser (z.B. app.py) sehen so immer entweder die alte oder die neue, aber nie
+eine halb geschriebene Datei. Im selben Schritt werden vorkomprimierte
+Varianten (.gz, .br falls verfügbar) erzeugt, die app.py direkt ausliefert.
+
+Die Varianten tragen den Inhalts-Hash der Datei im Namen
+(proxima_data.json.<hash>.gz, siehe variant_path). app.py öffnet nur die
+Variante zum Hash des Inhalts, den es ausliefert - ohne Vergleich von
+Zeitstempeln, die auf manchen Dateisystemen nur sekundengenau sind.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+
+# Brotli ist optional - ohne das Paket wird nur .gz erzeugt
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Content-Encoding -> Dateiendung der vorkomprimierten Variante
+PRECOMPRESSED_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+def content_hash(data=b''):
+    """Hash-Objekt für den Inhalts-Hash (auch Grundlage des ETags in app.py)"""
+    return hashlib.blake2b(data, digest_size=16)
+
+def variant_path(path, digest, encoding):
+    """Pfad der vorkomprimierten Variante des Inhalts mit dem Hash `digest` (hex)"""
+    return f'{path}.{digest}{PRECOMPRESSED_SUFFIXES[encoding]}'
+
+class AtomicFile:
+    """Temporäre Datei im Zielverzeichnis; commit() sichert sie per fsync und verschiebt sie atomar"""
+
+    def __init__(self, path):
+        self.directory, name = os.path.split(os.path.abspath(path))
+        fd, self.tmp_path = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=self.directory)
+        self.file = os.fdopen(fd, 'wb')
+
+    def commit(self, path):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.chmod(self.tmp_path, 0o644)
+        os.replace(self.tmp_path, path)
+
+    def discard(self):
+        self.file.close()
+        try:
+            os.unlink(self.tmp_path)
+        except OSError:
+            pass
+
+@contextmanager
+def atomic_file(path):
+    """Binäre Datei, die beim Verlassen des Blocks atomar nach `path` verschoben wird.
+
+    Bei einer Exception bleibt die alte Datei unverändert.
+    """
+    path = os.fspath(path)
+    pending = AtomicFile(path)
+    try:
+        yield pending.file
+        pending.commit(path)
+    except BaseException:
+        pending.discard()
+        raise
+    sync_directory(pending.directory)
+
+def atomic_write(path, content):
+    """Schreibt Bytes atomar nach `path` (temporäre Datei, fsync, rename)"""
+    with atomic_file(path) as f:
+        f.write(content)
+
+def sync_directory(directory):
+    """Verzeichniseintrag sichern, damit das rename einen Absturz übersteht"""
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+def publish(path, content, precompress=True):
+    """Veröffentlicht `content` (bytes oder str) atomar, optional mit .gz/.br-Varianten"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    publish_stream(path, lambda stream: stream.write(content), precompress=precompress)
+
+class TeeWriter:
+    """Binärer Stream, der jeden Block in die Datei, den Inhalts-Hash und die Kompressoren schreibt"""
+
+    def __init__(self, target, gz=None, br_file=None):
+        self.target = target
+        self.digest = content_hash()
+        self.gz = gz
+        self.br_file = br_file
+        self.br = brotli.Compressor(quality=11) if br_file is not None else None
+
+    def write(self, data):
+        self.target.write(data)
+        self.digest.update(data)
+        if self.gz is not None:
+            self.gz.write(data)
+        if self.br is not None:
+            self.br_file.write(self.br.process(data))
+        return len(data)
+
+    def close(self):
+        if self.gz is not None:
+            self.gz.close()
+        if self.br is not None:
+            self.br_file.write(self.br.finish())
+
+def publish_stream(path, write, precompress=True):
+    """Veröffentlicht eine Datei, deren Inhalt `write(stream)` stückweise schreibt.
+
+    Datei und .gz/.br-Varianten entstehen in einem Durchgang, ohne den
+    Inhalt im Speicher zu halten. Die Varianten werden unter dem Inhalts-Hash
+    vor der Datei umbenannt, Varianten früherer Inhalte danach gelöscht.
+    Gibt den Rückgabewert von `write` zurück.
+    """
+    path = os.fspath(path)
+    pending = {None: AtomicFile(path)}
+    try:
+        gz = None
+        if precompress:
+            pending['gzip'] = AtomicFile(path)
+            # mtime=0 macht die Ausgabe deterministisch
+            gz = gzip.GzipFile(filename='', mode='wb', compresslevel=9, fileobj=pending['gzip'].file, mtime=0)
+            if BROTLI_AVAILABLE:
+                pending['br'] = AtomicFile(path)
+        tee = TeeWriter(pending[None].file, gz, pending['br'].file if 'br' in pending else None)
+        result = write(tee)
+        tee.close()
+
+        digest = tee.digest.hexdigest()
+        for encoding, variant in pending.items():
+            if encoding is not None:
+                variant.commit(variant_path(path, digest, encoding))
+        pending[None].commit(path)
+    except BaseException:
+        for variant in pending.values():
+            variant.discard()
+        raise
+    sync_directory(os.path.dirname(os.path.abspath(path)))
+    remove_stale_variants(path, digest)
+    return result
+
+def remove_stale_variants(path, digest):
+    """Löscht vorkomprimierte Varianten früherer Inhalte (auch die alten ohne Hash im Namen)"""
+    directory, name = os.path.split(os.path.abspath(path))
+    suffixes = '|'.join(re.escape(suffix) for suffix in PRECOMPRESSED_SUFFIXES.values())
+    pattern = re.compile(re.escape(name) + r'(\.[0-9a-f]{32})?(' + suffixes + ')')
+    current = f'.{digest}'
+    for entry in os.listdir(directory):
+        match = pattern.fullmatch(entry)
+        if match and match.group(1) != current:
+            try:
+                os.unlink(os.path.join(directory, entry))
+            except OSError:
+                pass
+
+def publish_json(path, data, precompress=True):
+    """Veröffentlicht `data` als kompaktes JSON (ohne Einrückung)"""
+    content = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    publish(path, content, precompress=precompress)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+HTML-Report der Proxima-Planeten (proxima_report.html)
+Gemeinsamer Renderer für ProximaFetcher und proxima_simple
+
+Die statische Hülle (CSS, Tabellenkopf, Footer) liegt fertig als String vor;
+pro Planet wird nur eine Zeile formatiert und per join() zusammengefügt. iter_report() liefert den
+Report in Stücken (je Wochen-Abschnitt), sodass er direkt in eine Datei oder
+einen Socket geschrieben werden kann, ohne das ganze Dokument aufzubauen
+(write_report, zusammen mit proxima_publish.publish_stream).
+"""
+
+from datetime import datetime, timezone
+from html import escape
+from itertools import groupby, islice
+
+# Maximale Anzahl Zeilen pro ausgegebenem Stück (begrenzt den Speicherbedarf)
+CHUNK_ROWS = 1000
+
+SHELL_HEAD = """<!DOCTYPE html>
+<html lang="de">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Proxima Sabocounter - Spacenations Tools</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            margin: 0;
+            padding: 20px;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            min-height: 100vh;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background: white;
+            border-radius: 15px;
+            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
+            overflow: hidden;
+        }
+        .header {
+            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+            color: white;
+            padding: 30px;
+            text-align: center;
+        }
+        .header h1 {
+            margin: 0;
+            font-size: 2.5em;
+            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
+        }
+        .stats {
+            display: flex;
+            justify-content: space-around;
+            padding: 20px;
+            background: #f8f9fa;
+            border-bottom: 1px solid #dee2e6;
+        }
+        .stat {
+            text-align: center;
+        }
+        .stat-number {
+            font-size: 2em;
+            font-weight: bold;
+            color: #2a5298;
+        }
+        .stat-label {
+            color: #6c757d;
+            font-size: 0.9em;
+        }
+        .table-container {
+            padding: 20px;
+            overflow-x: auto;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 20px;
+        }
+        th, td {
+            padding: 12px;
+            text-align: left;
+            border-bottom: 1px solid #dee2e6;
+        }
+        th {
+            background: #f8f9fa;
+            font-weight: 600;
+            color: #495057;
+        }
+        tr:hover {
+            background: #f8f9fa;
+        }
+        .week-badge {
+            background: #007bff;
+            color: white;
+            padding: 4px 8px;
+            border-radius: 12px;
+            font-size: 0.8em;
+            font-weight: bold;
+        }
+        .score-high {
+            color: #28a745;
+            font-weight: bold;
+        }
+        .score-medium {
+            color: #ffc107;
+            font-weight: bold;
+        }
+        .score-low {
+            color: #dc3545;
+            font-weight: bold;
+        }
+        .footer {
+            text-align: center;
+            padding: 20px;
+            color: #6c757d;
+            background: #f8f9fa;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🌌 Proxima Sabocounter</h1>
+            <p>Spacenations Tools - Planetenverfolgung</p>
+        </div>
+        
+"""
+
+STATS_TEMPLATE = """        <div class="stats">
+            <div class="stat">
+                <div class="stat-number">{total_planets}</div>
+                <div class="stat-label">Planeten</div>
+            </div>
+            <div class="stat">
+                <div class="stat-number">{latest_week}</div>
+                <div class="stat-label">Aktuelle Woche</div>
+            </div>
+            <div class="stat">
+                <div class="stat-number">{last_update}</div>
+                <div class="stat-label">Letzte Aktualisierung</div>
+            </div>
+        </div>
+        
+"""
+
+TABLE_HEAD = """        <div class="table-container">
+            <table>
+                <thead>
+                    <tr>
+                        <th>Name</th>
+                        <th>Koordinaten</th>
+                        <th>Punkte</th>
+                        <th>Tag der Zerstörung</th>
+                        <th>Woche</th>
+                    </tr>
+                </thead>
+                <tbody>"""
+
+SHELL_FOOT = """
+                </tbody>
+            </table>
+        </div>
+        
+        <div class="footer">
+            <p>Automatisch aktualisiert jeden Mittwoch um 18:45 Uhr</p>
+            <p>Datenquelle: <a href="https://beta2.game.spacenations.eu/api/proxima" target="_blank">Spacenations API</a></p>
+        </div>
+    </div>
+</body>
+</html>"""
+
+def format_delete_date(delete_on_str):
+    """Formatiert das deleteOn Datum (z.B. "2025-09-17T16:06:58.000000Z" -> "17.09.2025 16:06")"""
+    try:
+        dt = datetime.fromisoformat(delete_on_str.replace('Z', '+00:00'))
+        return dt.astimezone(timezone.utc).strftime("%d.%m.%Y %H:%M")
+    except Exception:
+        return delete_on_str
+
+def render_rows(planets, format_date=format_delete_date, dates=None):
+    """HTML der Tabellenzeilen für (name, coordinates, score, delete_on, week_number)-Tupel.
+    
+    `dates` cached formatierte Löschdaten über mehrere Aufrufe hinweg.
+    """
+    # Viele Planeten teilen sich ein Löschdatum - jedes nur einmal formatieren
+    if dates is None:
+        dates = {}
+    rows = []
+    append = rows.append
+    for name, coordinates, score, delete_on, week_number in planets:
+        date = dates.get(delete_on)
+        if date is None:
+            date = dates[delete_on] = escape(format_date(delete_on))
+        
+        # Score-Kategorisierung
+        if score >= 500:
+            score_class = "score-high"
+        elif score >= 200:
+            score_class = "score-medium"
+        else:
+            score_class = "score-low"
+        
+        append(f"""
+                    <tr>
+                        <td><strong>{escape(name)}</strong></td>
+                        <td><code>{escape(coordinates)}</code></td>
+                        <td class="{score_class}">{score:,}</td>
+                        <td>{date}</td>
+                        <td><span class="week-badge">Woche {week_number}</span></td>
+                    </tr>""")
+    return ''.join(rows)
+
+def iter_report(summary, format_date=format_delete_date):
+    """Erzeugt den Report stückweise: Kopf, je Wochen-Abschnitt die Zeilen, Footer"""
+    yield SHELL_HEAD
+    yield STATS_TEMPLATE.format(
+        total_planets=summary['total_planets'],
+        latest_week=summary['latest_week'],
+        last_update=summary['last_update']
+    )
+    yield TABLE_HEAD
+
+    # Aufeinanderfolgende Planeten derselben Woche bilden einen Abschnitt
+    dates = {}
+    for _, section in groupby(summary['planets'], key=lambda planet: planet[4]):
+        while True:
+            rows = list(islice(section, CHUNK_ROWS))
+            if not rows:
+                break
+            yield render_rows(rows, format_date, dates)
+
+    yield SHELL_FOOT
+
+def write_report(stream, summary, format_date=format_delete_date):
+    """Schreibt den Report stückweise in eine Text- oder Binär-Datei (z.B. Socket-wfile).
+
+    Gibt die Anzahl geschriebener Zeichen bzw. Bytes zurück.
+    """
+    binary = not hasattr(stream, 'encoding')
+    written = 0
+    for chunk in iter_report(summary, format_date):
+        data = chunk.encode('utf-8') if binary else chunk
+        stream.write(data)
+        written += len(data)
+    return written
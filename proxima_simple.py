@@ -5,12 +5,16 @@ Verwendet nur Standard-Bibliotheken
 """
 
 import json
-import sqlite3
+import proxima_db
+from proxima_report import write_report
+from proxima_publish import publish_json, publish_stream
 import urllib.request
 import urllib.error
 from datetime import datetime, timezone
 import os
 
+REPORT_FILE = 'proxima_report.html'
+
 class ProximaFetcher:
     def __init__(self, db_path='proxima.db'):
         self.api_url = "https://beta2.game.spacenations.eu/api/proxima"
@@ -18,30 +22,9 @@ class ProximaFetcher:
         self.init_database()
     
     def init_database(self):
-        """Initialisiert die ProximaDB SQLite Datenbank"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS planets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                coordinates TEXT NOT NULL,
-                score INTEGER NOT NULL,
-                delete_on TEXT NOT NULL,
-                week_number INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(name, created_at)
-            )
-        ''')
-        
-        # Index für bessere Performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_name ON planets(name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_week ON planets(week_number)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_created ON planets(created_at)')
-        
-        conn.commit()
-        conn.close()
+        """Initialisiert die ProximaDB SQLite Datenbank (inkl. Migration älterer Datenbanken)"""
+        self.db = proxima_db.get_pool(self.db_path)
+        self.db.ensure_schema()
         print("✅ ProximaDB initialisiert")
     
     def fetch_planets(self):
@@ -88,66 +71,47 @@ class ProximaFetcher:
         if not planets:
             return False
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            current_time = datetime.now().isoformat()
-            saved_count = 0
-            
-            for planet in planets:
-                week_number = self.extract_week_number(planet['name'])
+            # Einziger Schreiber; WAL/synchronous setzt der ConnectionPool
+            with self.db.write() as conn:
+                cursor = conn.cursor()
+                current_time = datetime.now().isoformat()
                 
-                cursor.execute('''
-                    INSERT OR REPLACE INTO planets 
-                    (name, coordinates, score, delete_on, week_number, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    planet['name'],
-                    planet['coordinates'],
-                    planet['score'],
-                    planet['deleteOn'],
-                    week_number,
-                    current_time
-                ))
-                saved_count += 1
+                # Snapshot, Historie und planets_latest in einer Transaktion;
+                # die Wochennummer berechnet SQLite beim Einfügen
+                rows = map(proxima_db.api_row, planets)
+                snapshot_id, saved_count, changes = proxima_db.record_snapshot(cursor, rows, current_time)
             
-            conn.commit()
-            print(f"✅ Erfolgreich {saved_count} Planeten in der Datenbank gespeichert")
+            print(f"✅ Erfolgreich {saved_count} Planeten in der Datenbank gespeichert (Snapshot {snapshot_id}, {len(changes)} Änderungen)")
             return True
             
         except Exception as e:
             print(f"❌ Fehler beim Speichern der Daten: {e}")
-            conn.rollback()
             return False
-        finally:
-            conn.close()
     
-    def get_planets_summary(self):
-        """Gibt eine Zusammenfassung der gespeicherten Planeten zurück"""
-        conn = sqlite3.connect(self.db_path)
+    def get_planets_summary(self, lazy=False):
+        """Gibt eine Zusammenfassung der gespeicherten Planeten zurück
+        
+        Mit lazy=True ist 'planets' ein Cursor statt einer Liste (für den Report-Stream).
+        """
+        conn = self.db.reader()
         cursor = conn.cursor()
         
         try:
-            # Aktuelle Planeten (neueste Einträge) nach Punktzahl sortiert
-            cursor.execute('''
+            # Aktuelle Planeten (neuester Stand pro Planet) nach Punktzahl sortiert
+            planets = conn.execute('''
                 SELECT name, coordinates, score, delete_on, week_number
-                FROM planets p1
-                WHERE created_at = (
-                    SELECT MAX(created_at) 
-                    FROM planets p2 
-                    WHERE p2.name = p1.name
-                )
+                FROM planets_latest
                 ORDER BY score DESC
             ''')
-            
-            planets = cursor.fetchall()
+            if not lazy:
+                planets = planets.fetchall()
             
             # Statistiken
-            cursor.execute('SELECT COUNT(DISTINCT name) FROM planets')
+            cursor.execute('SELECT COUNT(*) FROM planets_latest')
             total_planets = cursor.fetchone()[0]
             
-            cursor.execute('SELECT MAX(week_number) FROM planets')
+            cursor.execute('SELECT MAX(week_number) FROM planets_latest')
             latest_week = cursor.fetchone()[0]
             
             return {
@@ -160,8 +124,6 @@ class ProximaFetcher:
         except Exception as e:
             print(f"❌ Fehler beim Abrufen der Zusammenfassung: {e}")
             return None
-        finally:
-            conn.close()
     
     def update_planets(self):
         """Hauptfunktion: Lädt und speichert die aktuellen Planetendaten"""
@@ -180,187 +142,14 @@ class ProximaFetcher:
             print("❌ Keine Daten von der API erhalten")
             return False
     
-    def generate_html_report(self):
-        """Generiert einen HTML-Bericht der aktuellen Planeten"""
-        summary = self.get_planets_summary()
+    def generate_html_report(self, path=REPORT_FILE):
+        """Schreibt den HTML-Bericht der aktuellen Planeten stückweise nach `path` (atomar, mit .gz/.br)"""
+        summary = self.get_planets_summary(lazy=True)
         if not summary:
-            return None
-        
-        html = f"""<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Proxima Sabocounter - Spacenations Tools</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 2.5em;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
-        .stats {{
-            display: flex;
-            justify-content: space-around;
-            padding: 20px;
-            background: #f8f9fa;
-            border-bottom: 1px solid #dee2e6;
-        }}
-        .stat {{
-            text-align: center;
-        }}
-        .stat-number {{
-            font-size: 2em;
-            font-weight: bold;
-            color: #2a5298;
-        }}
-        .stat-label {{
-            color: #6c757d;
-            font-size: 0.9em;
-        }}
-        .table-container {{
-            padding: 20px;
-            overflow-x: auto;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 20px;
-        }}
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #dee2e6;
-        }}
-        th {{
-            background: #f8f9fa;
-            font-weight: 600;
-            color: #495057;
-        }}
-        tr:hover {{
-            background: #f8f9fa;
-        }}
-        .week-badge {{
-            background: #007bff;
-            color: white;
-            padding: 4px 8px;
-            border-radius: 12px;
-            font-size: 0.8em;
-            font-weight: bold;
-        }}
-        .score-high {{
-            color: #28a745;
-            font-weight: bold;
-        }}
-        .score-medium {{
-            color: #ffc107;
-            font-weight: bold;
-        }}
-        .score-low {{
-            color: #dc3545;
-            font-weight: bold;
-        }}
-        .footer {{
-            text-align: center;
-            padding: 20px;
-            color: #6c757d;
-            background: #f8f9fa;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🌌 Proxima Sabocounter</h1>
-            <p>Spacenations Tools - Planetenverfolgung</p>
-        </div>
-        
-        <div class="stats">
-            <div class="stat">
-                <div class="stat-number">{summary['total_planets']}</div>
-                <div class="stat-label">Planeten</div>
-            </div>
-            <div class="stat">
-                <div class="stat-number">{summary['latest_week']}</div>
-                <div class="stat-label">Aktuelle Woche</div>
-            </div>
-            <div class="stat">
-                <div class="stat-number">{summary['last_update']}</div>
-                <div class="stat-label">Letzte Aktualisierung</div>
-            </div>
-        </div>
-        
-        <div class="table-container">
-            <table>
-                <thead>
-                    <tr>
-                        <th>Name</th>
-                        <th>Koordinaten</th>
-                        <th>Punkte</th>
-                        <th>Tag der Zerstörung</th>
-                        <th>Woche</th>
-                    </tr>
-                </thead>
-                <tbody>"""
-        
-        # Sortiere Planeten nach Punktzahl (höchste zuerst)
-        sorted_planets = sorted(summary['planets'], key=lambda x: x[2], reverse=True)
-        
-        for planet in sorted_planets:
-            name, coordinates, score, delete_on, week_number = planet
-            formatted_date = self.format_delete_date(delete_on)
-            
-            # Score-Kategorisierung
-            if score >= 500:
-                score_class = "score-high"
-            elif score >= 200:
-                score_class = "score-medium"
-            else:
-                score_class = "score-low"
-            
-            html += f"""
-                    <tr>
-                        <td><strong>{name}</strong></td>
-                        <td><code>{coordinates}</code></td>
-                        <td class="{score_class}">{score:,}</td>
-                        <td>{formatted_date}</td>
-                        <td><span class="week-badge">Woche {week_number}</span></td>
-                    </tr>"""
-        
-        html += """
-                </tbody>
-            </table>
-        </div>
-        
-        <div class="footer">
-            <p>Automatisch aktualisiert jeden Mittwoch um 18:45 Uhr</p>
-            <p>Datenquelle: <a href="https://beta2.game.spacenations.eu/api/proxima" target="_blank">Spacenations API</a></p>
-        </div>
-    </div>
-</body>
-</html>"""
+            return False
         
-        return html
+        publish_stream(path, lambda stream: write_report(stream, summary, self.format_delete_date))
+        return True
 
 def main():
     """Hauptfunktion - führt eine einmalige Aktualisierung durch"""
@@ -376,18 +165,14 @@ def main():
     if success:
         # HTML-Report generieren
         print("Generiere HTML-Report...")
-        html_report = fetcher.generate_html_report()
-        if html_report:
-            with open('proxima_report.html', 'w', encoding='utf-8') as f:
-                f.write(html_report)
+        if fetcher.generate_html_report():
             print("✅ HTML-Report erstellt: proxima_report.html")
         
         # JSON-Daten für Web-Interface
         print("Generiere JSON-Daten...")
         summary = fetcher.get_planets_summary()
         if summary:
-            with open('proxima_data.json', 'w', encoding='utf-8') as f:
-                json.dump(summary['planets'], f, ensure_ascii=False, indent=2)
+            publish_json('proxima_data.json', summary['planets'])
             print("✅ JSON-Daten erstellt: proxima_data.json")
         
         print("\n🎉 Aktualisierung abgeschlossen!")
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+In-Memory-Snapshot der aktuellen Proxima-Planeten für die Web-API
+Wird nur neu aufgebaut, wenn sich proxima_data.json oder proxima.db ändert
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+
+import proxima_db
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent
+JSON_FILE = BASE_DIR / 'proxima_data.json'
+DB_FILE = BASE_DIR / 'proxima.db'
+
+PLANET_FIELDS = ('name', 'coordinates', 'score', 'deleteOn', 'weekNumber')
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+REVALIDATE_INTERVAL = 2.0  # Sekunden zwischen zwei stat()-Prüfungen
+
+def extract_week_number(planet_name):
+    """Extrahiert die Wochennummer aus dem Planetennamen (z.B. 'Proxima 10-1' -> 10)"""
+    try:
+        parts = planet_name.split()
+        if len(parts) >= 2:
+            return int(parts[1].split('-')[0])
+    except (ValueError, IndexError):
+        pass
+    return 0
+
+def extract_galaxy(coordinates):
+    """Galaxie aus den Koordinaten (z.B. '555:161:2' -> 555)"""
+    try:
+        return int(str(coordinates).split(':', 1)[0])
+    except ValueError:
+        return None
+
+def planet_from_row(row):
+    """Normalisiert einen Planeten aus proxima_data.json.
+    
+    Der Auto-Updater schreibt die API-Objekte ({'name': ..., 'deleteOn': ...}),
+    run_fetcher.py und proxima_simple.py die DB-Zeilen als Listen
+    [name, coordinates, score, delete_on, week_number].
+    """
+    if isinstance(row, dict):
+        name = row['name']
+        return {
+            'name': name,
+            'coordinates': row['coordinates'],
+            'score': row['score'],
+            'deleteOn': row.get('deleteOn', row.get('delete_on')),
+            'weekNumber': row.get('weekNumber') or extract_week_number(name)
+        }
+    if isinstance(row, (list, tuple)) and len(row) >= 4:
+        name, coordinates, score, delete_on = row[:4]
+        week_number = row[4] if len(row) > 4 else None
+        return {
+            'name': name,
+            'coordinates': coordinates,
+            'score': score,
+            'deleteOn': delete_on,
+            'weekNumber': week_number or extract_week_number(name)
+        }
+    raise ValueError(f"Unbekanntes Planeten-Format: {type(row).__name__}")
+
+def load_planets_from_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and isinstance(data.get('planets'), list):
+        data = data['planets']
+    if not isinstance(data, list):
+        raise ValueError(f"Unbekanntes Format von {path}: {type(data).__name__}")
+    return [planet_from_row(planet) for planet in data]
+
+def load_planets_from_db(path):
+    # Lese-Verbindung des aktuellen Threads aus dem gemeinsamen Pool (query_only)
+    conn = proxima_db.get_pool(path).reader()
+    try:
+        rows = conn.execute('''
+            SELECT name, coordinates, score, delete_on, week_number
+            FROM planets_latest
+        ''').fetchall()
+    except sqlite3.OperationalError:
+        # Noch nicht migrierte Datenbank (Leser migrieren nicht selbst)
+        rows = conn.execute('''
+            SELECT name, coordinates, score, delete_on, week_number
+            FROM planets p1
+            WHERE created_at = (
+                SELECT MAX(created_at)
+                FROM planets p2
+                WHERE p2.name = p1.name
+            )
+        ''').fetchall()
+    return [{
+        'name': name,
+        'coordinates': coordinates,
+        'score': score,
+        'deleteOn': delete_on,
+        'weekNumber': week_number
+    } for name, coordinates, score, delete_on, week_number in rows]
+
+class PlanetSnapshot:
+    """Unveränderlicher, nach Punkten sortierter Snapshot mit Indizes für Woche und Galaxie"""
+    
+    def __init__(self, planets, source, version):
+        self.planets = sorted(planets, key=lambda p: (-p['score'], p['name']))
+        self.source = source
+        self.version = version
+        self.by_week = {}
+        self.by_galaxy = {}
+        for planet in self.planets:
+            self.by_week.setdefault(planet['weekNumber'], []).append(planet)
+            self.by_galaxy.setdefault(extract_galaxy(planet['coordinates']), []).append(planet)
+        weeks = [week for week in self.by_week if week > 0]
+        self.latest_week = max(weeks) if weeks else None
+    
+    def query(self, week=None, min_score=None, max_score=None, galaxy=None,
+              offset=0, limit=DEFAULT_LIMIT, fields=None):
+        """Filtert, paginiert und projiziert die Planeten (Reihenfolge bleibt nach Punkten absteigend)"""
+        if week is not None:
+            rows = self.by_week.get(week, [])
+            if galaxy is not None:
+                rows = [p for p in rows if extract_galaxy(p['coordinates']) == galaxy]
+        elif galaxy is not None:
+            rows = self.by_galaxy.get(galaxy, [])
+        else:
+            rows = self.planets
+        
+        if min_score is not None or max_score is not None:
+            low = min_score if min_score is not None else float('-inf')
+            high = max_score if max_score is not None else float('inf')
+            rows = [p for p in rows if low <= p['score'] <= high]
+        
+        page = rows[offset:offset + limit]
+        if fields:
+            page = [{field: planet[field] for field in fields} for planet in page]
+        
+        return {
+            'total': len(rows),
+            'offset': offset,
+            'limit': limit,
+            'latestWeek': self.latest_week,
+            'version': self.version,
+            'planets': page
+        }
+
+class PlanetSnapshotStore:
+    """Hält den aktuellen Snapshot und baut ihn nur bei geänderten Quelldateien neu auf.
+    
+    Quelle ist proxima_data.json (vom Auto-Updater gepflegt); fehlt die Datei,
+    werden die neuesten Planeten aus proxima.db gelesen.
+    """
+    
+    def __init__(self, json_path=JSON_FILE, db_path=DB_FILE, revalidate_interval=REVALIDATE_INTERVAL):
+        self.json_path = str(json_path)
+        self.db_path = str(db_path)
+        self.revalidate_interval = revalidate_interval
+        self._snapshot = None
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    def _source_signature(self):
+        signature = []
+        # proxima.db-wal gehört dazu: im WAL-Modus ändert sich proxima.db erst beim Checkpoint
+        for path in (self.json_path, self.db_path, self.db_path + '-wal'):
+            try:
+                st = os.stat(path)
+                signature.append((path, st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+    
+    def get(self):
+        """Gibt den aktuellen PlanetSnapshot zurück (oder None, wenn keine Quelle verfügbar ist)"""
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and now - self._checked_at < self.revalidate_interval:
+            return snapshot
+        
+        with self._lock:
+            if self._snapshot is not None and now - self._checked_at < self.revalidate_interval:
+                return self._snapshot
+            signature = self._source_signature()
+            self._checked_at = now
+            if self._snapshot is not None and signature == self._signature:
+                return self._snapshot
+            
+            try:
+                planets = None
+                if signature[0][1] is not None:
+                    try:
+                        planets, source = load_planets_from_json(self.json_path), 'json'
+                    except (ValueError, KeyError, TypeError) as e:
+                        # Unbekanntes Format: auf proxima.db ausweichen, sofern vorhanden
+                        if signature[1][1] is None:
+                            raise
+                        logger.warning(f"⚠️ proxima_data.json nicht lesbar ({e}) - nutze proxima.db")
+                if planets is None:
+                    if signature[1][1] is None:
+                        return None
+                    planets, source = load_planets_from_db(self.db_path), 'db'
+            except Exception as e:
+                logger.error(f"❌ Proxima-Snapshot konnte nicht geladen werden: {e}")
+                return self._snapshot
+            
+            version = hashlib.blake2b(repr(signature).encode(), digest_size=8).hexdigest()
+            self._snapshot = PlanetSnapshot(planets, source, version)
+            self._signature = signature
+            logger.info(f"📦 Proxima-Snapshot neu aufgebaut: {len(planets)} Planeten aus {source}")
+            return self._snapshot
+
+planet_snapshots = PlanetSnapshotStore()
+
+def _after_fork():
+    planet_snapshots._lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Schlanker XLSX-Writer ohne pandas/openpyxl
+
+Erzeugt eine Excel-Datei mit einem Tabellenblatt direkt per zipfile und
+XML-Vorlagen. Die Zeilen werden als Iterator (z.B. ein DB-Cursor) gelesen und
+blockweise in den Zip-Stream geschrieben - der Speicherbedarf hängt nicht von
+der Zeilenzahl ab. Texte werden als Inline-Strings abgelegt, damit keine
+Shared-String-Tabelle im Speicher aufgebaut werden muss.
+"""
+
+import io
+import zipfile
+from xml.sax.saxutils import escape
+
+CHUNK_ROWS = 1000
+
+# Kopfzeile: Razer-Grün (#00FF88), fett, schwarz, zentriert
+HEADER_FILL = '00FF88'
+HEADER_FONT_COLOR = '000000'
+
+CONTENT_TYPES = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>
+</Types>'''
+
+ROOT_RELS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>'''
+
+WORKBOOK = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets>
+</workbook>'''
+
+WORKBOOK_RELS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>'''
+
+# Stil 0 = Standard, Stil 1 = Kopfzeile
+STYLES = f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<fonts count="2">
+<font><sz val="11"/><name val="Calibri"/></font>
+<font><b/><sz val="11"/><color rgb="FF{HEADER_FONT_COLOR}"/><name val="Calibri"/></font>
+</fonts>
+<fills count="3">
+<fill><patternFill patternType="none"/></fill>
+<fill><patternFill patternType="gray125"/></fill>
+<fill><patternFill patternType="solid"><fgColor rgb="FF{HEADER_FILL}"/><bgColor rgb="FF{HEADER_FILL}"/></patternFill></fill>
+</fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="2">
+<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>
+<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1" applyAlignment="1"><alignment horizontal="center"/></xf>
+</cellXfs>
+<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>
+</styleSheet>'''
+
+SHEET_HEAD = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<cols>{cols}</cols>
+<sheetData>'''
+
+SHEET_FOOT = '</sheetData>\n</worksheet>'
+
+def column_letter(index):
+    """0 -> A, 25 -> Z, 26 -> AA"""
+    letters = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(65 + rest) + letters
+    return letters
+
+def render_row(row_number, values, letters, style=0):
+    """Eine <row> mit Zahlen als Wert und allem anderen als Inline-String"""
+    style_attr = f' s="{style}"' if style else ''
+    cells = []
+    for letter, value in zip(letters, values):
+        if value is None:
+            continue
+        ref = f'{letter}{row_number}'
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f'<c r="{ref}"{style_attr}><v>{value}</v></c>')
+        else:
+            cells.append(f'<c r="{ref}"{style_attr} t="inlineStr"><is><t>{escape(str(value))}</t></is></c>')
+    return f'<row r="{row_number}">{"".join(cells)}</row>'
+
+def write_xlsx(stream, headers, rows, widths=None, sheet_name='Tabelle1'):
+    """Schreibt `headers` (formatiert) und `rows` als XLSX nach `stream`.
+
+    `stream` ist ein beschreibbares Binärobjekt (Datei, BytesIO,
+    SpooledTemporaryFile). Gibt die Anzahl der Datenzeilen zurück.
+    """
+    letters = [column_letter(i) for i in range(len(headers))]
+    cols = ''.join(
+        f'<col min="{i}" max="{i}" width="{width}" customWidth="1"/>'
+        for i, width in enumerate(widths or (), 1)
+    )
+    count = 0
+
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', ROOT_RELS)
+        archive.writestr('xl/workbook.xml', WORKBOOK.format(sheet_name=escape(sheet_name, {'"': '&quot;'})))
+        archive.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS)
+        archive.writestr('xl/styles.xml', STYLES)
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            head = SHEET_HEAD.format(cols=cols) + render_row(1, headers, letters, style=1)
+            sheet.write(head.encode('utf-8'))
+
+            chunk = []
+            for count, values in enumerate(rows, 1):
+                chunk.append(render_row(count + 1, values, letters))
+                if len(chunk) >= CHUNK_ROWS:
+                    sheet.write(''.join(chunk).encode('utf-8'))
+                    chunk = []
+            chunk.append(SHEET_FOOT)
+            sheet.write(''.join(chunk).encode('utf-8'))
+
+    return count
+
+def xlsx_bytes(headers, rows, widths=None, sheet_name='Tabelle1'):
+    """Wie write_xlsx(), aber als Bytes im Speicher"""
+    buffer = io.BytesIO()
+    write_xlsx(buffer, headers, rows, widths=widths, sheet_name=sheet_name)
+    return buffer.getvalue()
@@ -7,6 +7,7 @@ Kann als Cron-Job oder manuell ausgeführt werden
 import sys
 import os
 from proxima_fetcher import ProximaFetcher
+from proxima_publish import publish_json
 
 def main():
     """Führt eine einmalige Aktualisierung der Proxima-Daten durch"""
@@ -21,19 +22,14 @@ def main():
     
     # HTML-Report generieren
     print("Generiere HTML-Report...")
-    html_report = fetcher.generate_html_report()
-    if html_report:
-        with open('proxima_report.html', 'w', encoding='utf-8') as f:
-            f.write(html_report)
+    if fetcher.generate_html_report():
         print("✅ HTML-Report erstellt: proxima_report.html")
     
     # JSON-Daten für Web-Interface
     print("Generiere JSON-Daten...")
     summary = fetcher.get_planets_summary()
     if summary:
-        import json
-        with open('proxima_data.json', 'w', encoding='utf-8') as f:
-            json.dump(summary['planets'], f, ensure_ascii=False, indent=2)
+        publish_json('proxima_data.json', summary['planets'])
         print("✅ JSON-Daten erstellt: proxima_data.json")
     
     print("\n🎉 Aktualisierung abgeschlossen!")
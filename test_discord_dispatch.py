@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Discord-Versand-Warteschlange (discord_dispatch.py)
+Startet einen lokalen Stub-Webhook mit Discord-ähnlichem Rate-Limit und prüft
+Pacing, 429/retry_after, Backoff bei 5xx und die Ergebnisse pro Nachricht
+"""
+
+import json
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import discord_dispatch
+from discord_dispatch import WebhookDispatcher
+
+class StubWebhook:
+    """Webhook-Stub: `limit` Nachrichten pro `window` Sekunden, danach 429 mit retry_after.
+
+    - rate_headers: X-RateLimit-Remaining/Reset-After mitsenden (wie Discord)
+    - fail_first: die ersten n Requests mit 502 beantworten
+    - reject: Nachrichten mit diesem Inhalt mit 400 ablehnen
+    """
+
+    def __init__(self, limit=5, window=1.0, rate_headers=True, fail_first=0, reject=None):
+        self.limit = limit
+        self.window = window
+        self.rate_headers = rate_headers
+        self.fail_first = fail_first
+        self.reject = reject
+        self.lock = threading.Lock()
+        self.sent = []
+        self.hits = 0
+        self.throttled = 0
+        self.count = 0
+        self.reset = time.monotonic() + window
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                with stub.lock:
+                    stub.hits += 1
+                    now = time.monotonic()
+                    if now >= stub.reset:
+                        stub.reset, stub.count = now + stub.window, 0
+                    if stub.hits <= stub.fail_first:
+                        return self.reply(502, b'bad gateway')
+                    if stub.count >= stub.limit:
+                        stub.throttled += 1
+                        payload = json.dumps({'message': 'You are being rate limited.', 'retry_after': stub.reset - now, 'global': False})
+                        return self.reply(429, payload.encode(), {'Content-Type': 'application/json'})
+                    content = json.loads(body or b'{}').get('content')
+                    if stub.reject is not None and content == stub.reject:
+                        return self.reply(400, b'{"message": "Cannot send an empty message"}', {'Content-Type': 'application/json'})
+                    stub.count += 1
+                    stub.sent.append(content)
+                    headers = {}
+                    if stub.rate_headers:
+                        headers = {
+                            'X-RateLimit-Limit': str(stub.limit),
+                            'X-RateLimit-Remaining': str(stub.limit - stub.count),
+                            'X-RateLimit-Reset-After': f'{stub.reset - now:.3f}'
+                        }
+                return self.reply(204, b'', headers)
+
+            def reply(self, status, body, headers=None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/api/webhooks/1/stub-token'
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def check(condition, message):
+    print(f"   {'✓' if condition else '✗'} {message}")
+    if not condition:
+        raise AssertionError(message)
+
+def send_all(url, contents, **kwargs):
+    dispatcher = WebhookDispatcher(url, **kwargs)
+    for content in contents:
+        dispatcher.enqueue({'content': content}, label=content)
+    started = time.monotonic()
+    outcomes = dispatcher.flush()
+    return outcomes, time.monotonic() - started
+
+def check_pacing():
+    print("🔄 1. Pacing über die X-RateLimit-Header")
+    stub = StubWebhook(limit=3, window=0.5)
+    try:
+        contents = [f'Seite {i}' for i in range(1, 8)]
+        outcomes, elapsed = send_all(stub.url, contents)
+        check(all(outcome.ok for outcome in outcomes), "alle 7 Nachrichten zugestellt")
+        check(stub.throttled == 0, "kein 429 - gewartet wird vorher")
+        check(all(outcome.attempts == 1 for outcome in outcomes), "je ein Versuch")
+        check(elapsed >= 0.9, f"7 Nachrichten bei 3 pro 0.5s brauchen >= 2 Fenster ({elapsed:.2f}s)")
+        check(stub.sent == contents, "Reihenfolge bleibt erhalten")
+    finally:
+        stub.close()
+    print()
+
+def check_retry_after():
+    print("🔄 2. 429 ohne Rate-Limit-Header: Wiederholung nach retry_after")
+    stub = StubWebhook(limit=2, window=0.4, rate_headers=False)
+    try:
+        contents = ['A', 'B', 'C', 'D']
+        outcomes, elapsed = send_all(stub.url, contents)
+        check(all(outcome.ok for outcome in outcomes), "alle Nachrichten nach 429 zugestellt")
+        check(stub.throttled >= 1, f"Stub hat gedrosselt ({stub.throttled}x 429)")
+        check(outcomes[2].attempts == 2 and outcomes[2].status == 204, "dritte Nachricht: 429, dann 204")
+        check(elapsed >= 0.3, f"Wartezeit laut retry_after eingehalten ({elapsed:.2f}s)")
+        check(stub.sent == contents, "Reihenfolge bleibt erhalten")
+    finally:
+        stub.close()
+    print()
+
+def check_server_errors():
+    print("🔄 3. Backoff bei 5xx")
+    stub = StubWebhook(fail_first=2)
+    try:
+        outcomes, elapsed = send_all(stub.url, ['Report'])
+        outcome = outcomes[0]
+        check(outcome.ok and outcome.attempts == 3, "zwei 502, dann zugestellt (3 Versuche)")
+        expected = discord_dispatch.backoff(1) + discord_dispatch.backoff(2)
+        check(elapsed >= expected, f"Backoff {expected:.2f}s eingehalten ({elapsed:.2f}s)")
+    finally:
+        stub.close()
+
+    stub = StubWebhook(fail_first=100)
+    try:
+        outcomes, _ = send_all(stub.url, ['Report'], max_retries=2)
+        outcome = outcomes[0]
+        check(not outcome.ok and outcome.status == 502, "dauerhafter 502 endet als Fehlschlag")
+        check(outcome.attempts == 3 and '502' in outcome.error, "nach max_retries aufgegeben, Fehler im Outcome")
+    finally:
+        stub.close()
+    print()
+
+def check_outcomes():
+    print("🔄 4. Ergebnis pro Nachricht statt Abbruch")
+    stub = StubWebhook(reject='kaputt')
+    try:
+        outcomes, _ = send_all(stub.url, ['Seite 1', 'kaputt', 'Seite 3'])
+        check([outcome.ok for outcome in outcomes] == [True, False, True], "nur die abgelehnte Nachricht schlägt fehl")
+        check(outcomes[1].status == 400 and outcomes[1].attempts == 1, "400 wird nicht wiederholt")
+        check(stub.sent == ['Seite 1', 'Seite 3'], "folgende Nachrichten werden trotzdem gesendet")
+        check(discord_dispatch.summarize(outcomes) == (2, 3), "summarize: 2 von 3")
+    finally:
+        stub.close()
+
+    # Geschlossener Port: Verbindungsfehler landen im Outcome (status None)
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    outcomes, _ = send_all(f'http://127.0.0.1:{port}/api/webhooks/2/x', ['Report'], max_retries=1)
+    check(outcomes[0].status is None and outcomes[0].error and outcomes[0].attempts == 2,
+          "Verbindungsfehler: kein Status, Fehlertext, 2 Versuche")
+    print()
+
+def test_discord_dispatch():
+    print("🧪 Test: Discord-Versand-Warteschlange")
+    print("="*50)
+    print()
+
+    # Kurze Wartezeiten, damit der Test schnell bleibt
+    discord_dispatch.BACKOFF_BASE = 0.05
+
+    try:
+        check_pacing()
+        check_retry_after()
+        check_server_errors()
+        check_outcomes()
+    except AssertionError:
+        print("❌ Dispatch-Test fehlgeschlagen!")
+        return False
+
+    print("✅ Dispatch-Test erfolgreich!")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if test_discord_dispatch() else 1)
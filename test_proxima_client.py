@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den Proxima-API-Client (proxima_client.py)
+Startet einen lokalen Stub-Server und prüft Revalidierung (ETag/304),
+unveränderte Bytes und das Verhalten nach einem kaputten Body
+"""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from proxima_client import ProximaClient
+
+PLANETS_V1 = [{'name': 'Proxima 10-1', 'coordinates': '555:161:2', 'score': 420, 'deleteOn': '2025-10-22T16:07:33.000000Z'}]
+PLANETS_V2 = PLANETS_V1 + [{'name': 'Proxima 10-2', 'coordinates': '555:162:4', 'score': 380, 'deleteOn': '2025-10-22T16:07:33.000000Z'}]
+
+class StubAPI(BaseHTTPRequestHandler):
+    """Liefert `server.body` mit `server.etag`; beantwortet den aktuellen ETag
+    und alle ETags in `server.not_modified` mit 304 (wie ein Cache davor)"""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        validator = self.headers.get('If-None-Match')
+        if validator and (validator == server.etag or validator in server.not_modified):
+            self.send_response(304)
+            self.send_header('ETag', server.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(server.body)))
+        if server.etag:
+            self.send_header('ETag', server.etag)
+        if server.last_modified:
+            self.send_header('Last-Modified', server.last_modified)
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubAPI)
+    server.requests = []
+    server.not_modified = set()
+    server.etag = None
+    server.last_modified = None
+    server.body = b''
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def publish(server, data, etag=None, last_modified=None, raw=None):
+    server.body = raw if raw is not None else json.dumps(data).encode()
+    server.etag = etag
+    server.last_modified = last_modified
+
+def check(condition, message):
+    print(f"   {'✓' if condition else '✗'} {message}")
+    if not condition:
+        raise AssertionError(message)
+
+def check_revalidation(server, client):
+    print("🔄 1. Erster Abruf und Revalidierung per ETag")
+    publish(server, PLANETS_V1, etag='"v1"')
+    result = client.fetch()
+    check(result.status == 200 and result.changed, "erster Abruf: 200, geändert")
+    check(result.data == PLANETS_V1, "Daten aus dem Body")
+
+    result = client.fetch()
+    check(server.requests[-1].get('If-None-Match') == '"v1"', "If-None-Match wird gesendet")
+    check(result.status == 304 and not result.changed, "zweiter Abruf: 304, unverändert")
+    check(result.data == PLANETS_V1, "304 liefert die gespeicherten Daten")
+    print()
+
+def check_same_bytes(server, client):
+    print("🔄 2. Gleiche Bytes ohne passenden Validator")
+    publish(server, PLANETS_V1, etag='"v1-neu"')
+    result = client.fetch()
+    check(result.status == 200 and not result.changed, "200 mit gleichem Inhalt gilt als unverändert")
+    result = client.fetch()
+    check(server.requests[-1].get('If-None-Match') == '"v1-neu"', "neuer ETag wird übernommen")
+    check(result.status == 304, "danach 304")
+    print()
+
+def check_broken_body(server, client):
+    print("🔄 3. Kaputter Body darf keine Validatoren übernehmen")
+    publish(server, None, etag='"kaputt"', raw=b'[{"name": "Proxima')
+    try:
+        client.fetch()
+    except ValueError:
+        check(True, "kaputter Body wirft ValueError")
+    else:
+        check(False, "kaputter Body wirft ValueError")
+
+    # Server ist repariert, beantwortet den ETag des kaputten Bodys aber weiter mit 304
+    server.not_modified.add('"kaputt"')
+    publish(server, PLANETS_V2, etag='"v2"')
+    result = client.fetch()
+    check(server.requests[-1].get('If-None-Match') == '"v1-neu"', "ETag des kaputten Bodys wird nicht gesendet")
+    check(result.status == 200 and result.changed, "neue Daten statt 304 auf alte Daten")
+    check(result.data == PLANETS_V2, "Daten entsprechen Version 2")
+    print()
+
+def check_last_modified(server):
+    print("🔄 4. Revalidierung per Last-Modified")
+    client = ProximaClient(server.url)
+    publish(server, PLANETS_V1, last_modified='Wed, 15 Oct 2025 16:45:00 GMT')
+    client.fetch()
+    client.fetch()
+    check(server.requests[-1].get('If-Modified-Since') == 'Wed, 15 Oct 2025 16:45:00 GMT',
+          "If-Modified-Since wird gesendet")
+    print()
+
+def test_proxima_client():
+    print("🧪 Test: Proxima-API-Client")
+    print("="*50)
+    print()
+
+    server = start_stub()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}/api/proxima'
+    client = ProximaClient(server.url)
+
+    try:
+        check_revalidation(server, client)
+        check_same_bytes(server, client)
+        check_broken_body(server, client)
+        check_last_modified(server)
+    except AssertionError:
+        print("❌ Client-Test fehlgeschlagen!")
+        return False
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✅ Client-Test erfolgreich!")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if test_proxima_client() else 1)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Last-Test für den Worker-Pool von app.py (SERVER_MODE=threaded)
+Misst die Latenz von /api/health, während 200 langsame Downloads von
+alliance-dashboard.html laufen und während Verbindungen offen gehalten
+werden, die nie einen Request senden
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+
+# Kurzer Socket-Timeout, damit der Leerlauf-Test nicht 10 s wartet (vor dem Import setzen)
+os.environ.setdefault('SERVER_SOCKET_TIMEOUT', '2')
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+import app
+
+SLOW_DOWNLOADS = 200
+DOWNLOAD_PATH = '/alliance-dashboard.html'
+READ_CHUNK = 4096
+READ_PAUSE = 0.02        # Sekunden zwischen zwei Lese-Blöcken eines langsamen Clients
+IDLE_CONNECTIONS = app.SERVER_THREADS + 8
+MAX_HEALTH_P99 = 0.5     # Sekunden
+
+def start_server():
+    app.asset_index.build()
+    httpd = app.create_server(0, 'threaded')
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, httpd.server_address[1]
+
+def request(port, path, timeout=15):
+    """Einfacher HTTP/1.0-Request; gibt (Latenz, Statuszeile, Body-Länge) zurück"""
+    started = time.perf_counter()
+    with socket.create_connection(('127.0.0.1', port), timeout=timeout) as sock:
+        sock.sendall(f'GET {path} HTTP/1.0\r\nHost: localhost\r\n\r\n'.encode())
+        response = b''
+        while True:
+            block = sock.recv(65536)
+            if not block:
+                break
+            response += block
+    head, _, body = response.partition(b'\r\n\r\n')
+    return time.perf_counter() - started, head.split(b'\r\n', 1)[0].decode(), len(body)
+
+def slow_download(port, results):
+    """Liest die Antwort mit kleinem Empfangspuffer blockweise und mit Pausen"""
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, READ_CHUNK)
+    sock.settimeout(60)
+    try:
+        sock.connect(('127.0.0.1', port))
+        sock.sendall(f'GET {DOWNLOAD_PATH} HTTP/1.0\r\nHost: localhost\r\n\r\n'.encode())
+        received = 0
+        while True:
+            block = sock.recv(READ_CHUNK)
+            if not block:
+                break
+            received += len(block)
+            time.sleep(READ_PAUSE)
+        results.append(received)
+    except OSError as e:
+        results.append(e)
+    finally:
+        sock.close()
+
+def probe_health(port, stop, latencies):
+    while not stop.is_set():
+        latency, status, _ = request(port, '/api/health')
+        latencies.append(latency if status.endswith('200 OK') else float('inf'))
+        time.sleep(0.05)
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+def check(condition, message):
+    print(f"   {'✓' if condition else '✗'} {message}")
+    if not condition:
+        raise AssertionError(message)
+
+def check_slow_downloads(port):
+    print(f"🔄 1. /api/health während {SLOW_DOWNLOADS} langsamer Downloads von {DOWNLOAD_PATH}")
+    baseline = [request(port, '/api/health')[0] for _ in range(20)]
+    expected_size = os.path.getsize(DOWNLOAD_PATH.lstrip('/'))
+
+    results, latencies, stop = [], [], threading.Event()
+    downloads = [threading.Thread(target=slow_download, args=(port, results)) for _ in range(SLOW_DOWNLOADS)]
+    prober = threading.Thread(target=probe_health, args=(port, stop, latencies))
+    started = time.perf_counter()
+    for thread in downloads:
+        thread.start()
+    prober.start()
+    for thread in downloads:
+        thread.join()
+    stop.set()
+    prober.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"   Leerlauf:   p50 {percentile(baseline, 50) * 1000:.1f} ms, p99 {percentile(baseline, 99) * 1000:.1f} ms")
+    print(f"   unter Last: p50 {percentile(latencies, 50) * 1000:.1f} ms, p99 {percentile(latencies, 99) * 1000:.1f} ms "
+          f"({len(latencies)} Proben in {elapsed:.1f}s)")
+    complete = [r for r in results if isinstance(r, int) and r > expected_size]
+    check(len(complete) == SLOW_DOWNLOADS, f"alle {SLOW_DOWNLOADS} Downloads vollständig ({len(complete)})")
+    check(percentile(latencies, 99) < MAX_HEALTH_P99, f"p99 der Health-Checks unter {MAX_HEALTH_P99 * 1000:.0f} ms")
+    print()
+
+def check_idle_connections(port):
+    timeout = app.SpacenationsRequestHandler.timeout
+    print(f"🔄 2. {IDLE_CONNECTIONS} Verbindungen ohne Request bei {app.SERVER_THREADS} Workern (Timeout {timeout:.0f}s)")
+    idle = [socket.create_connection(('127.0.0.1', port)) for _ in range(IDLE_CONNECTIONS)]
+    try:
+        time.sleep(0.2)
+        latency, status, _ = request(port, '/api/health', timeout=timeout * 3)
+        print(f"   Health-Check nach {latency:.2f}s")
+        check(status.endswith('200 OK'), "Health-Check wird beantwortet")
+        check(latency < timeout + 1.0, "spätestens nach dem Socket-Timeout")
+
+        for sock in idle:
+            sock.settimeout(timeout * 3)
+        closed = sum(1 for sock in idle if sock.recv(1) == b'')
+        check(closed == IDLE_CONNECTIONS, "Server schließt alle Leerlauf-Verbindungen")
+
+        latency, status, _ = request(port, '/api/health')
+        check(status.endswith('200 OK') and latency < MAX_HEALTH_P99, f"danach wieder sofort ({latency * 1000:.1f} ms)")
+    finally:
+        for sock in idle:
+            sock.close()
+    print()
+
+def test_server_load():
+    print("🧪 Test: Worker-Pool unter Last")
+    print("="*50)
+    print()
+
+    # Pro Request eine Log-Zeile wäre hier nur Rauschen
+    logging.getLogger().setLevel(logging.WARNING)
+    httpd, port = start_server()
+
+    try:
+        check_slow_downloads(port)
+        check_idle_connections(port)
+    except AssertionError:
+        print("❌ Last-Test fehlgeschlagen!")
+        return False
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    print("✅ Last-Test erfolgreich!")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if test_server_load() else 1)